@@ -17,6 +17,8 @@ from dataclasses import dataclass
 
 from poly_market_maker.app import App
 from poly_market_maker.constants import MAX_DECIMALS
+from poly_market_maker.price_service import PriceService
+from poly_market_maker.transport_registry import transport_registry
 
 # Setup logging
 logging.basicConfig(
@@ -51,11 +53,15 @@ class UniversalMarketManager:
     
     def __init__(self, config_file: str = "market_config.yaml"):
         self.config_file = config_file
+        # the market discovery requests go through the same transport as the keepers
+        transport_registry.install()
         self.load_config()
         self.load_market_filters()
         self.active_markets: Dict[str, MarketInfo] = {}
         self.market_makers: Dict[str, App] = {}
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        # one batched price request per interval for all the markets
+        self.price_service = PriceService(self.price_interval)
         
     def load_config(self):
         """Load configuration from environment and config file"""
@@ -67,6 +73,7 @@ class UniversalMarketManager:
         self.refresh_interval = int(os.getenv('REFRESH_INTERVAL', '300'))  # 5 min
         self.max_markets = int(os.getenv('MAX_MARKETS', '10'))
         self.max_workers = int(os.getenv('MAX_WORKERS', '10'))
+        self.price_interval = float(os.getenv('PRICE_INTERVAL', '5'))
         
         if not all([self.private_key, self.rpc_url]):
             raise ValueError("PRIVATE_KEY and RPC_URL must be set")
@@ -283,7 +290,7 @@ class UniversalMarketManager:
             logger.info(f"Creating market maker for: {market.question}")
             logger.info(f"  Tags: {', '.join(market.tags or [])}")
             
-            market_maker = App(args)
+            market_maker = App(args, price_service=self.price_service)
             return market_maker
             
         except Exception as e:
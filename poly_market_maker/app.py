@@ -2,60 +2,18 @@ import logging
 from prometheus_client import start_http_server
 import time
 
-# Apply Cloudflare bypass fix BEFORE importing any py_clob_client modules
-import os
-
-# Try residential proxies first (best for Cloudflare bypass)
-smartproxy_username = os.getenv('SMARTPROXY_USERNAME')
-smartproxy_password = os.getenv('SMARTPROXY_PASSWORD')
-oxylabs_username = os.getenv('OXYLABS_USERNAME')
-oxylabs_password = os.getenv('OXYLABS_PASSWORD')
-
-proxy_activated = False
-
-# 1. Try SmartProxy first (3-day FREE trial)
-if smartproxy_username and smartproxy_password and not proxy_activated:
-    try:
-        from smartproxy_integration import setup_smartproxy
-        if setup_smartproxy(smartproxy_username, smartproxy_password):
-            print("✅ SmartProxy residential proxy activated - 3-day FREE trial!")
-            proxy_activated = True
-        else:
-            print("❌ SmartProxy setup failed")
-    except ImportError:
-        print("❌ SmartProxy integration not found")
-
-# 2. Try Oxylabs if SmartProxy failed
-if oxylabs_username and oxylabs_password and not proxy_activated:
-    try:
-        from oxylabs_proxy import setup_oxylabs_proxy
-        if setup_oxylabs_proxy(oxylabs_username, oxylabs_password):
-            print("✅ Oxylabs residential proxy activated!")
-            proxy_activated = True
-        else:
-            print("❌ Oxylabs setup failed")
-    except ImportError:
-        print("❌ Oxylabs integration not found")
-
-# 3. Fallback to other bypass methods if no proxy worked
-if not proxy_activated:
-    print("⚠️ No residential proxy available, trying fallback methods...")
-    try:
-        from cloudflare_fix import apply_cloudflare_fix
-        apply_cloudflare_fix()
-        print("✅ Basic Cloudflare fix applied")
-    except ImportError:
-        try:
-            from flaresolverr_integration import setup_flaresolverr_bypass
-            if setup_flaresolverr_bypass():
-                print("✅ FlareSolverr Cloudflare bypass activated")
-            else:
-                print("❌ FlareSolverr setup failed")
-        except ImportError:
-            print("❌ No Cloudflare bypass available - POST requests will likely fail!")
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from py_clob_client.config import get_contract_config
 
 from poly_market_maker.args import get_args
-from poly_market_maker.price_feed import PriceFeedClob
+from poly_market_maker.price_feed import (
+    CachedPriceFeed,
+    PriceFeedClob,
+    PriceFeedSource,
+    PriceFeedWebsocket,
+)
 from poly_market_maker.gas import GasStation, GasStrategy
 from poly_market_maker.utils import setup_logging, setup_web3
 from poly_market_maker.order import Order, Side
@@ -65,19 +23,30 @@ from poly_market_maker.clob_api import ClobApi
 from poly_market_maker.lifecycle import Lifecycle
 from poly_market_maker.orderbook import OrderBookManager
 from poly_market_maker.contracts import Contracts
-from poly_market_maker.metrics import keeper_balance_amount
+from poly_market_maker.creds_cache import CredsCache
+from poly_market_maker.metrics import keeper_balance_amount, startup_phase_duration
+from poly_market_maker.price_service import PriceFeedService, PriceService
 from poly_market_maker.strategy import StrategyManager
+from poly_market_maker.transport import transport
+from poly_market_maker.transport_registry import transport_registry
+from poly_market_maker.user_stream import UserStream
 
 
 class App:
     """Market maker keeper on Polymarket CLOB"""
 
-    def __init__(self, args: list):
+    def __init__(self, args: list, price_service: PriceService = None):
         setup_logging()
         self.logger = logging.getLogger(__name__)
+        self._bootstrap_started_at = time.monotonic()
 
         args = get_args(args)
+        # labels the startup metrics, before the market itself is bootstrapped
+        self.condition_id = args.condition_id
         self.sync_interval = args.sync_interval
+        self.startup_timeout = args.startup_timeout
+        self._next_price_check = 0.0
+        self._price_check_delay = 0.5
 
         # self.min_tick = args.min_tick
         # self.min_size = args.min_size
@@ -86,52 +55,134 @@ class App:
         self.metrics_server_port = args.metrics_server_port
         start_http_server(self.metrics_server_port)
 
+        transport.timeout = args.request_timeout
+        # picks the proxy or transport to reach the CLOB with, before the first request
+        transport_registry.install()
+
         self.web3 = setup_web3(args.rpc_url, args.private_key)
         self.address = self.web3.eth.account.from_key(args.private_key).address
         self.funder_address = getattr(args, 'funder_address', None)
 
-        self.clob_api = ClobApi(
-            host=args.clob_api_url,
-            chain_id=self.web3.eth.chain_id,
-            private_key=args.private_key,
-            funder_address=self.funder_address,
-            signature_type=getattr(args, 'signature_type', 0),
-        )
-
-        self.gas_station = GasStation(
-            strat=GasStrategy(args.gas_strategy),
-            w3=self.web3,
-            url=args.gas_station_url,
-            fixed=args.fixed_gas_price,
-        )
-        self.contracts = Contracts(self.web3, self.gas_station)
+        # the rpc and the clob are only tied by the chain id, once it is known the
+        # remaining bootstrap steps run concurrently
+        with ThreadPoolExecutor(thread_name_prefix="bootstrap") as bootstrap:
+            chain_id_future = bootstrap.submit(
+                self._bootstrap_step, "chain_id", lambda: self.web3.eth.chain_id
+            )
+            chain_id = (
+                args.chain_id if args.chain_id is not None else chain_id_future.result()
+            )
 
-        self.market = Market(
-            args.condition_id,
-            self.clob_api.get_collateral_address(),
-        )
+            clob_api_future = bootstrap.submit(
+                self._bootstrap_step,
+                "clob_api",
+                lambda: ClobApi(
+                    host=args.clob_api_url,
+                    chain_id=chain_id,
+                    private_key=args.private_key,
+                    funder_address=self.funder_address,
+                    signature_type=getattr(args, 'signature_type', 0),
+                    signing_processes=args.signing_processes,
+                    creds_cache=CredsCache(args.api_creds_cache)
+                    if args.api_creds_cache
+                    else None,
+                ),
+            )
+            market_future = bootstrap.submit(
+                self._bootstrap_step,
+                "market",
+                # same collateral as `ClobApi.get_collateral_address`, without waiting for the client
+                lambda: Market(
+                    args.condition_id, get_contract_config(chain_id).collateral
+                ),
+            )
 
-        self.price_feed = PriceFeedClob(self.market, self.clob_api)
+            self.gas_station = GasStation(
+                strat=GasStrategy(args.gas_strategy),
+                w3=self.web3,
+                url=args.gas_station_url,
+                fixed=args.fixed_gas_price,
+            )
+            self.contracts = Contracts(self.web3, self.gas_station)
+
+            self.market = market_future.result()
+            self.clob_api = clob_api_future.result()
+            if chain_id_future.result() != chain_id:
+                raise Exception(
+                    f"RPC is on chain {chain_id_future.result()}, not on chain {chain_id}"
+                )
+
+        self.price_feed_websocket = None
+        self.price_feed_service = None
+        if price_service is not None:
+            # the prices of all the markets sharing the service come in one request
+            price_service.get_prices_with(self.clob_api.get_prices)
+            price_service.start()
+            self.price_feed_service = PriceFeedService(self.market, price_service)
+            self.price_feed = self.price_feed_service
+        elif args.price_feed_source == PriceFeedSource.WEBSOCKET:
+            self.price_feed_websocket = PriceFeedWebsocket(
+                self.market,
+                self.clob_api,
+                url=f"{args.clob_ws_url.rstrip('/')}/market",
+                max_age=args.price_feed_max_age,
+            )
+            self.price_feed_websocket.start()
+            self.price_feed = self.price_feed_websocket
+        else:
+            self.price_feed = PriceFeedClob(self.market, self.clob_api)
+        if args.price_cache_ttl > 0:
+            self.price_feed = CachedPriceFeed(self.price_feed, args.price_cache_ttl)
 
         self.order_book_manager = OrderBookManager(
-            args.refresh_frequency, max_workers=1
+            args.refresh_frequency,
+            max_workers=args.max_inflight_requests,
+            min_refresh_frequency=args.min_refresh_frequency,
+            max_refresh_frequency=args.max_refresh_frequency,
+            reconciliation_frequency=args.reconciliation_frequency,
+            market=self.market.condition_id,
         )
         self.order_book_manager.get_orders_with(self.get_orders)
         self.order_book_manager.get_balances_with(self.get_balances)
         self.order_book_manager.cancel_orders_with(
             lambda order: self.clob_api.cancel_order(order.id)
         )
+        self.order_book_manager.cancel_orders_batch_with(
+            lambda orders: self.clob_api.cancel_orders([order.id for order in orders])
+        )
         self.order_book_manager.place_orders_with(self.place_order)
+        self.order_book_manager.place_orders_batch_with(self.place_orders)
+        if self.clob_api.order_signer.can_presign:
+            self.order_book_manager.presign_orders_with(self.presign_orders)
         self.order_book_manager.cancel_all_orders_with(
             lambda _: self.clob_api.cancel_all_orders()
         )
         self.order_book_manager.start()
 
+        self.user_stream = None
+        if args.user_stream:
+            self.user_stream = UserStream(
+                self.market,
+                self.clob_api.get_api_creds,
+                self.order_book_manager,
+                url=f"{args.clob_ws_url.rstrip('/')}/user",
+            )
+            self.user_stream.start()
+
         self.strategy_manager = StrategyManager(
             args.strategy,
             args.strategy_config,
             self.price_feed,
             self.order_book_manager,
+            max_price_age=args.max_price_age,
+            sync_deadline=args.sync_deadline or args.sync_interval,
+        )
+
+        self._initialized_at = time.monotonic()
+        startup_phase_duration.labels(
+            phase="init", market=self.condition_id
+        ).set(
+            self._initialized_at - self._bootstrap_started_at
         )
 
     """
@@ -141,6 +192,7 @@ class App:
     def main(self):
         self.logger.debug(self.sync_interval)
         with Lifecycle() as lifecycle:
+            lifecycle.wait_for(self.is_ready, self.startup_timeout)
             lifecycle.on_startup(self.startup)
             lifecycle.every(self.sync_interval, self.synchronize)  # Sync every 5s
             lifecycle.on_shutdown(self.shutdown)
@@ -153,8 +205,34 @@ class App:
         self.logger.info("Running startup callback...")
         # Temporarily disable approval check due to Unicode/web3.py issues
         # self.approve()
-        time.sleep(5)  # 5 second initial delay so that bg threads fetch the orderbook
-        self.logger.info("Startup complete!")
+        now = time.monotonic()
+        startup_phase_duration.labels(phase="ready", market=self.condition_id).set(
+            now - self._initialized_at
+        )
+        startup_phase_duration.labels(phase="total", market=self.condition_id).set(
+            now - self._bootstrap_started_at
+        )
+        self.logger.info(
+            f"Startup complete in {now - self._bootstrap_started_at:.2f}s!"
+        )
+
+    def is_ready(self) -> bool:
+        """
+        Whether the first synchronization can quote: the order book was fetched and there is a price
+        """
+        if not self.order_book_manager.wait_for_order_book(timeout=0.5):
+            return False
+
+        now = time.monotonic()
+        if now < self._next_price_check:
+            return False
+        if self.price_feed.get_price(Token.A) is not None:
+            return True
+
+        # without a price cache every check is a request, back off between them
+        self._next_price_check = now + self._price_check_delay
+        self._price_check_delay = min(2 * self._price_check_delay, 5.0)
+        return False
 
     def synchronize(self):
         """
@@ -170,12 +248,29 @@ class App:
         """
         self.logger.info("Keeper shutting down...")
         self.order_book_manager.cancel_all_orders()
+        if self.user_stream is not None:
+            self.user_stream.stop()
+        if self.price_feed_websocket is not None:
+            self.price_feed_websocket.stop()
+        if self.price_feed_service is not None:
+            self.price_feed_service.close()
         self.logger.info("Keeper is shut down!")
 
     """
     handlers
     """
 
+    def _bootstrap_step(self, phase: str, func: Callable):
+        start_time = time.monotonic()
+        try:
+            return func()
+        finally:
+            duration = time.monotonic() - start_time
+            startup_phase_duration.labels(phase=phase, market=self.condition_id).set(
+                duration
+            )
+            self.logger.debug(f"Bootstrap step {phase} took {duration:.3f}s")
+
     def get_balances(self) -> dict:
         """
         Fetch the onchain balances of collateral and conditional tokens for the keeper
@@ -199,8 +294,11 @@ class App:
             Token.B: token_B_balance,
         }
 
-    def get_orders(self) -> list[Order]:
+    def get_orders(self) -> list[Order] | None:
         orders = self.clob_api.get_orders(self.market.condition_id)
+        if orders is None:
+            # keep the last known orders rather than forgetting all of them
+            return None
         return [
             Order(
                 size=order_dict["size"],
@@ -219,6 +317,8 @@ class App:
             side=new_order.side.value,
             token_id=self.market.token_id(new_order.token),
         )
+        if order_id is None:
+            return None
         return Order(
             price=new_order.price,
             size=new_order.size,
@@ -227,6 +327,44 @@ class App:
             token=new_order.token,
         )
 
+    def place_orders(self, new_orders: list[Order]) -> list[Order]:
+        order_ids = self.clob_api.place_orders(
+            [
+                {
+                    "price": new_order.price,
+                    "size": new_order.size,
+                    "side": new_order.side.value,
+                    "token_id": self.market.token_id(new_order.token),
+                }
+                for new_order in new_orders
+            ]
+        )
+        return [
+            Order(
+                price=new_order.price,
+                size=new_order.size,
+                side=new_order.side,
+                id=order_id,
+                token=new_order.token,
+            )
+            if order_id is not None
+            else None
+            for (new_order, order_id) in zip(new_orders, order_ids)
+        ]
+
+    def presign_orders(self, orders: list[Order]):
+        self.clob_api.presign_orders(
+            [
+                {
+                    "price": order.price,
+                    "size": order.size,
+                    "side": order.side.value,
+                    "token_id": self.market.token_id(order.token),
+                }
+                for order in orders
+            ]
+        )
+
     def approve(self):
         """
         Approve the keeper on the collateral and conditional tokens
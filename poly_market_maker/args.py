@@ -1,5 +1,7 @@
 import argparse
 
+from poly_market_maker.creds_cache import DEFAULT_CREDS_CACHE_PATH
+from poly_market_maker.price_feed import PriceFeedSource
 from poly_market_maker.strategy import Strategy
 
 
@@ -43,6 +45,117 @@ def get_args(args) -> dict:
         help="Order book refresh frequency (in seconds, default: 5)",
     )
 
+    parser.add_argument(
+        "--min-refresh-frequency",
+        type=float,
+        default=1.0,
+        help="Order book refresh frequency right after orders are placed or cancelled (in seconds, default: 1)",
+    )
+
+    parser.add_argument(
+        "--max-refresh-frequency",
+        type=float,
+        default=20.0,
+        help="Order book refresh frequency the refresh backs off to while the order book is quiet (in seconds, default: 20)",
+    )
+
+    parser.add_argument(
+        "--user-stream",
+        action="store_true",
+        help="Apply order updates and fills from the CLOB user channel websocket, polling only to reconcile",
+    )
+
+    parser.add_argument(
+        "--reconciliation-frequency",
+        type=float,
+        default=60.0,
+        help="Order book refresh frequency while the user channel is connected (in seconds, default: 60)",
+    )
+
+    parser.add_argument(
+        "--clob-ws-url",
+        type=str,
+        default="wss://ws-subscriptions-clob.polymarket.com/ws",
+        help="CLOB websocket url, without the channel",
+    )
+
+    parser.add_argument(
+        "--max-inflight-requests",
+        type=int,
+        default=8,
+        help="Maximum number of order placements and cancellations in flight at the same time (default: 8)",
+    )
+
+    parser.add_argument(
+        "--signing-processes",
+        type=int,
+        default=0,
+        help="Number of processes signing orders, 0 signs them inline and disables presigning (default: 0)",
+    )
+
+    parser.add_argument(
+        "--price-feed-source",
+        type=PriceFeedSource,
+        default=PriceFeedSource.CLOB,
+        help="Where target prices come from: clob (midpoint endpoint) or websocket (market channel, default: clob)",
+    )
+
+    parser.add_argument(
+        "--price-feed-max-age",
+        type=float,
+        default=15.0,
+        help="Time (in seconds) without market channel messages after which the websocket price feed falls back to the clob (default: 15)",
+    )
+
+    parser.add_argument(
+        "--price-cache-ttl",
+        type=float,
+        default=0.0,
+        help="Time (in seconds) a price is served from memory before it is refreshed in the background, 0 disables the cache (default: 0)",
+    )
+
+    parser.add_argument(
+        "--max-price-age",
+        type=float,
+        default=30.0,
+        help="Age (in seconds) beyond which prices are considered stale and no orders are synchronized (default: 30)",
+    )
+
+    parser.add_argument(
+        "--sync-deadline",
+        type=float,
+        default=None,
+        help="Time (in seconds) the requests of a synchronization, including the orders it places and cancels, have to complete within (default: the sync interval)",
+    )
+
+    parser.add_argument(
+        "--api-creds-cache",
+        type=str,
+        default=DEFAULT_CREDS_CACHE_PATH,
+        help=f"File caching the derived CLOB API credentials of each address, empty to always derive them (default: {DEFAULT_CREDS_CACHE_PATH})",
+    )
+
+    parser.add_argument(
+        "--chain-id",
+        type=int,
+        default=None,
+        help="Chain id of the RPC, known up front it lets the CLOB client start without waiting for the RPC (default: fetched from the RPC)",
+    )
+
+    parser.add_argument(
+        "--startup-timeout",
+        type=int,
+        default=30,
+        help="Maximum time (in seconds) to wait for the order book and prices before the first synchronization (default: 30)",
+    )
+
+    parser.add_argument(
+        "--request-timeout",
+        type=float,
+        default=10.0,
+        help="Timeout (in seconds) of every HTTP request (default: 10)",
+    )
+
     parser.add_argument(
         "--gas-strategy",
         type=str,
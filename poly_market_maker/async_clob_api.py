@@ -0,0 +1,350 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+
+import aiohttp
+from py_clob_client.clob_types import ApiCreds, RequestArgs
+from py_clob_client.constants import END_CURSOR
+from py_clob_client.endpoints import CANCEL, CANCEL_ALL, MID_POINT, ORDERS, POST_ORDER
+from py_clob_client.headers.headers import create_level_2_headers
+from py_clob_client.signer import Signer
+from py_clob_client.utilities import order_to_json
+
+from poly_market_maker.circuit_breaker import (
+    CircuitBreakers,
+    CircuitOpenError,
+    clob_circuit_breakers,
+)
+from poly_market_maker.clob_api import ClobApi
+from poly_market_maker.constants import OK
+from poly_market_maker.deadline import DeadlineExceeded, check_deadline, remaining_time
+from poly_market_maker.metrics import (
+    clob_requests_latency,
+    clob_requests_rejected,
+    clob_requests_timeouts,
+)
+from poly_market_maker.rate_limiter import RateLimiter, clob_rate_limiter
+from poly_market_maker.signing import OrderSigner
+from poly_market_maker.transport import transport
+
+DEFAULT_HEADERS = {
+    "User-Agent": "py_clob_client",
+    "Accept": "*/*",
+    "Content-Type": "application/json",
+}
+
+
+def create_session(
+    limit: int = 200, limit_per_host: int = 0, keepalive_timeout: float = 30.0
+) -> aiohttp.ClientSession:
+    """
+    Creates a session on a bounded keep-alive connection pool, to be shared by several `AsyncClobApi`.
+
+    Must be called from a running event loop.
+
+    Args:
+        limit: Maximum number of connections open at the same time.
+        limit_per_host: Maximum number of connections to the same host, `0` for no limit besides `limit`.
+        keepalive_timeout: Time (in seconds) idle connections are kept open.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+        ),
+        headers=DEFAULT_HEADERS,
+    )
+
+
+class AsyncClobApiException(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"status {status}: {message}")
+        self.status = status
+
+
+class AsyncClobApi:
+    """asyncio counterpart of `ClobApi`.
+
+    Requests go through an aiohttp session, so many of them can be in flight from a single
+    thread. Sessions can be shared: several instances (e.g. one per market) then draw
+    from the same bounded pool of keep-alive connections.
+
+    Attributes:
+        host: CLOB API url.
+        signer: Signer of the keeper, used for the L2 authentication headers.
+        creds: API credentials of the keeper, or a function returning the current ones.
+        order_signer: Signs new orders, off the event loop.
+        session: Optional shared session, see `create_session`. Created on first use if not given.
+        rate_limiter: Per-endpoint rate limits, shared with the synchronous `ClobApi` by default.
+        circuit_breakers: Per-endpoint circuit breakers, shared with the synchronous `ClobApi` by default.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        signer: Signer,
+        creds: ApiCreds | Callable[[], ApiCreds],
+        order_signer: OrderSigner,
+        session: aiohttp.ClientSession = None,
+        rate_limiter: RateLimiter = None,
+        circuit_breakers: CircuitBreakers = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert isinstance(host, str)
+        assert isinstance(creds, ApiCreds) or callable(creds)
+        assert isinstance(order_signer, OrderSigner)
+
+        self.host = host.rstrip("/")
+        self.signer = signer
+        self.get_creds = creds if callable(creds) else lambda: creds
+        self.order_signer = order_signer
+        self.rate_limiter = rate_limiter or clob_rate_limiter
+        self.circuit_breakers = circuit_breakers or clob_circuit_breakers
+
+        self._session = session
+        self._owns_session = session is None
+
+    @classmethod
+    def from_clob_api(
+        cls, clob_api: ClobApi, session: aiohttp.ClientSession = None
+    ) -> "AsyncClobApi":
+        """Reuses the credentials, as they get renewed, and order signer of an already connected `ClobApi`."""
+        return cls(
+            host=clob_api.client.host,
+            signer=clob_api.client.signer,
+            creds=clob_api.get_api_creds,
+            order_signer=clob_api.order_signer,
+            session=session,
+            rate_limiter=clob_api.rate_limiter,
+            circuit_breakers=clob_api.circuit_breakers,
+        )
+
+    async def close(self):
+        """Closes the session, unless it was given to the constructor."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_price(self, token_id: int) -> float | None:
+        """
+        Get the current price on the orderbook, `None` if it could not be fetched
+        """
+        self.logger.debug("Fetching midpoint price from the API...")
+        try:
+            resp = await self._send(
+                "get_midpoint",
+                "GET",
+                MID_POINT,
+                params={"token_id": str(token_id)},
+                auth=False,
+            )
+            if resp.get("mid") is not None:
+                return float(resp.get("mid"))
+        except Exception as e:
+            self.logger.error(f"Error fetching current price from the CLOB API: {e}")
+
+        return None
+
+    async def get_orders(self, condition_id: str) -> list[dict] | None:
+        """
+        Get open keeper orders on the orderbook, `None` if they could not be fetched
+        """
+        self.logger.debug("Fetching open keeper orders from the API...")
+        try:
+            orders = []
+            next_cursor = "MA=="
+            # every page is a request of its own, counted against the rate limit
+            while next_cursor != END_CURSOR:
+                resp = await self._send(
+                    "get_orders",
+                    "GET",
+                    ORDERS,
+                    params={"market": condition_id, "next_cursor": next_cursor},
+                )
+                orders += resp["data"]
+                next_cursor = resp["next_cursor"]
+
+            return [ClobApi._get_order(order) for order in orders]
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching keeper open orders from the CLOB API: {e}"
+            )
+        return None
+
+    async def place_order(
+        self, price: float, size: float, side: str, token_id: int
+    ) -> str:
+        """
+        Places a new order
+        """
+        self.logger.info(
+            f"Placing a new order: Order[price={price},size={size},side={side},token_id={token_id}]"
+        )
+        # signing may wait on the signing processes, keep it off the event loop
+        signed_order = (
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.order_signer.sign_orders,
+                [{"price": price, "size": size, "side": side, "token_id": token_id}],
+            )
+        )[0]
+        if signed_order is None:
+            return None
+
+        try:
+            resp = await self._send(
+                "post_order",
+                "POST",
+                POST_ORDER,
+                body=order_to_json(signed_order, self.get_creds().api_key, "GTC"),
+            )
+            if resp and resp.get("success") and resp.get("orderID"):
+                order_id = resp.get("orderID")
+                self.logger.info(
+                    f"Succesfully placed new order: Order[id={order_id},price={price},size={size},side={side},tokenID={token_id}]!"
+                )
+                return order_id
+
+            self.logger.error(
+                f"Could not place new order! CLOB returned error: {resp.get('errorMsg')}"
+            )
+        except Exception as e:
+            self.logger.error(f"Request exception: failed placing new order: {e}")
+        return None
+
+    async def cancel_order(self, order_id) -> bool:
+        self.logger.info(f"Cancelling order {order_id}...")
+        if order_id is None:
+            self.logger.debug("Invalid order_id")
+            return True
+
+        try:
+            resp = await self._send("cancel", "DELETE", CANCEL, body={"orderID": order_id})
+            return resp == OK
+        except Exception as e:
+            self.logger.error(f"Error cancelling order: {order_id}: {e}")
+        return False
+
+    async def cancel_all_orders(self) -> bool:
+        self.logger.info("Cancelling all open keeper orders..")
+        try:
+            resp = await self._send("cancel_all", "DELETE", CANCEL_ALL)
+            return resp == OK
+        except Exception as e:
+            self.logger.error(f"Error cancelling all orders: {e}")
+        return False
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    async def _send(self, method: str, http_method: str, path: str, **kwargs):
+        """Sends a single request, with the same deadline, circuit breaker and rate limit as `ClobApi._send`."""
+        endpoint = f"{http_method} {path}"
+        try:
+            check_deadline(method)
+        except DeadlineExceeded:
+            clob_requests_rejected.labels(method=method, reason="deadline").inc()
+            raise
+
+        breaker = self.circuit_breakers.get(endpoint)
+        if not breaker.allow():
+            clob_requests_rejected.labels(method=method, reason="circuit_open").inc()
+            raise CircuitOpenError(f"{endpoint} is failing, not sending {method}")
+
+        if not await self.rate_limiter.acquire_async(endpoint, timeout=remaining_time()):
+            # never sent, says nothing about the endpoint's health
+            breaker.release()
+            clob_requests_rejected.labels(method=method, reason="deadline").inc()
+            raise DeadlineExceeded(f"Deadline exceeded waiting for the {endpoint} rate limit")
+
+        # a request cut short by the keeper's own deadline says nothing about the endpoint
+        remaining = remaining_time()
+        shortened = remaining is not None and remaining < transport.timeout
+        timeout = transport.timeout if remaining is None else min(transport.timeout, remaining)
+
+        start_time = time.time()
+        status = "error"
+        try:
+            check_deadline(endpoint)
+            resp = await self._request(http_method, path, timeout=timeout, **kwargs)
+            status = "ok"
+            breaker.record_success()
+            return resp
+        except DeadlineExceeded:
+            status = "timeout"
+            clob_requests_timeouts.labels(method=method).inc()
+            breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            status = "timeout"
+            clob_requests_timeouts.labels(method=method).inc()
+            if shortened:
+                breaker.release()
+            else:
+                breaker.record_failure()
+            raise
+        except AsyncClobApiException as e:
+            # the endpoint answered, rejecting the request is not a failure of the endpoint
+            if e.status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            clob_requests_latency.labels(method=method, status=status).observe(
+                (time.time() - start_time)
+            )
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        body=None,
+        params: dict = None,
+        auth: bool = True,
+        timeout: float = None,
+    ):
+        # the body is signed and sent as the exact same bytes
+        serialized_body = (
+            json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+            if body is not None
+            else None
+        )
+        headers = {}
+        if auth:
+            headers = create_level_2_headers(
+                self.signer,
+                self.get_creds(),
+                RequestArgs(
+                    method=method,
+                    request_path=path,
+                    body=body,
+                    serialized_body=serialized_body,
+                ),
+            )
+
+        session = await self._get_session()
+        async with session.request(
+            method,
+            f"{self.host}{path}",
+            params=params,
+            data=serialized_body.encode("utf-8") if serialized_body is not None else None,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            text = await resp.text()
+            if resp.status != 200:
+                raise AsyncClobApiException(resp.status, text)
+            try:
+                return json.loads(text)
+            except ValueError:
+                return text
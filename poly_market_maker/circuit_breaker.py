@@ -0,0 +1,123 @@
+from enum import Enum
+import logging
+import threading
+import time
+
+from poly_market_maker.metrics import circuit_breaker_state
+
+
+class CircuitOpenError(Exception):
+    """The endpoint's circuit is open, the request was not sent."""
+
+
+class BreakerState(Enum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    """Thread safe circuit breaker of a single endpoint.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests fail
+    fast. Once `reset_timeout` seconds passed a single trial request is let through
+    (half open): its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert failure_threshold >= 1
+        assert reset_timeout > 0
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        circuit_breaker_state.labels(endpoint=name).set(BreakerState.CLOSED.value)
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._state == BreakerState.CLOSED:
+                return True
+            if self._state == BreakerState.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._set_state(BreakerState.HALF_OPEN)
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release(self):
+        """Gives back the trial slot of a request which was let through but never sent."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != BreakerState.CLOSED:
+                self._set_state(BreakerState.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if (
+                self._state == BreakerState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                if self._state != BreakerState.OPEN:
+                    self._set_state(BreakerState.OPEN)
+
+    def _set_state(self, state: BreakerState):
+        if state == BreakerState.OPEN:
+            self.logger.warning(
+                f"{self.name} failed {self._failures} times in a row, failing fast for {self.reset_timeout}s"
+            )
+        else:
+            self.logger.info(f"{self.name} circuit is {state.name.lower().replace('_', ' ')}")
+        self._state = state
+        circuit_breaker_state.labels(endpoint=self.name).set(state.value)
+
+
+class CircuitBreakers:
+    """Per-endpoint circuit breakers, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self.breakers = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.get(endpoint)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        endpoint, self.failure_threshold, self.reset_timeout
+                    )
+                    self.breakers[endpoint] = breaker
+        return breaker
+
+
+# shared by every ClobApi of the process, they all talk to the same CLOB
+clob_circuit_breakers = CircuitBreakers()
@@ -1,60 +1,98 @@
 import logging
 import sys
+import threading
 import time
-from py_clob_client.client import ClobClient, ApiCreds, OrderArgs, OpenOrderParams
-from py_clob_client.exceptions import PolyApiException
+from collections.abc import Callable
 
-from poly_market_maker.utils import randomize_default_price
-from poly_market_maker.constants import OK
-from poly_market_maker.metrics import clob_requests_latency
+import requests
+from py_clob_client.client import ClobClient, ApiCreds, OpenOrderParams
+from py_clob_client.clob_types import BookParams, PostOrdersArgs
+from py_clob_client.exceptions import PolyApiException
 
-DEFAULT_PRICE = 0.5
+from poly_market_maker.circuit_breaker import (
+    CircuitBreakers,
+    CircuitOpenError,
+    clob_circuit_breakers,
+)
+from poly_market_maker.constants import (
+    OK,
+    MAX_ORDERS_PER_BATCH,
+    MAX_ORDER_IDS_PER_CANCEL,
+    MAX_TOKENS_PER_MIDPOINTS,
+)
+from poly_market_maker.creds_cache import CredsCache
+from poly_market_maker.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    remaining_time,
+)
+from poly_market_maker.metrics import (
+    clob_requests_latency,
+    clob_requests_rejected,
+    clob_requests_timeouts,
+)
+from poly_market_maker.rate_limiter import RateLimiter, clob_rate_limiter
+from poly_market_maker.signing import OrderSigner
+from poly_market_maker.transport import transport
 
 
 class ClobApi:
-    def __init__(self, host, chain_id, private_key, funder_address=None, signature_type=0):
+    def __init__(
+        self,
+        host,
+        chain_id,
+        private_key,
+        funder_address=None,
+        signature_type=0,
+        rate_limiter: RateLimiter = None,
+        signing_processes: int = 0,
+        circuit_breakers: CircuitBreakers = None,
+        creds_cache: CredsCache = None,
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.rate_limiter = rate_limiter or clob_rate_limiter
+        self.circuit_breakers = circuit_breakers or clob_circuit_breakers
 
-        # Use proxy signature if funder_address is provided
-        if funder_address:
-            self.client = self._init_client_L1_proxy(
-                host=host,
-                chain_id=chain_id,
-                private_key=private_key,
-                funder_address=funder_address,
-                signature_type=signature_type
-            )
-        else:
-            self.client = self._init_client_L1(
-                host=host,
-                chain_id=chain_id,
-                private_key=private_key,
-            )
+        self.creds_cache = creds_cache
+        self._creds_lock = threading.Lock()
+        # whether the current credentials were derived by this instance, rather than
+        # loaded from the cache without being checked
+        self._creds_derived = False
 
-        try:
-            api_creds = self.client.derive_api_key()
-            self.logger.debug(f"Api key found: {api_creds.api_key}")
-        except PolyApiException:
-            self.logger.debug("Api key not found. Creating a new one...")
-            api_creds = self.client.create_api_key()
-            self.logger.debug(f"Api key created: {api_creds.api_key}.")
+        self.client = self._init_client(
+            host=host,
+            chain_id=chain_id,
+            private_key=private_key,
+            funder_address=funder_address,
+            signature_type=signature_type,
+        )
+        self._connect(funder_address)
 
-        if funder_address:
-            self.client = self._init_client_L2_proxy(
-                host=host,
-                chain_id=chain_id,
-                private_key=private_key,
-                funder_address=funder_address,
-                signature_type=signature_type,
-                creds=api_creds,
-            )
+        # cached credentials save the derivation round trips, they are checked lazily by
+        # the first authenticated request, see `_call`
+        api_creds = (
+            self.creds_cache.load(self.client.get_address())
+            if self.creds_cache is not None
+            else None
+        )
+        if api_creds is not None:
+            self.logger.debug(f"Api key loaded from the cache: {api_creds.api_key}")
         else:
-            self.client = self._init_client_L2(
-                host=host,
-                chain_id=chain_id,
-                private_key=private_key,
-                creds=api_creds,
-            )
+            api_creds = self._derive_api_creds()
+        self.client.set_api_creds(api_creds)
+
+        self.order_signer = OrderSigner(
+            self.client,
+            private_key=private_key,
+            chain_id=chain_id,
+            signature_type=signature_type if funder_address else None,
+            funder=funder_address,
+            processes=signing_processes,
+            call=self._call,
+        )
+
+    def get_api_creds(self) -> ApiCreds:
+        return self.client.creds
 
     def get_address(self):
         return self.client.get_address()
@@ -71,55 +109,68 @@ class ClobApi:
     def get_exchange(self, neg_risk = False):
         return self.client.get_exchange_address(neg_risk)
 
-    def get_price(self, token_id: int) -> float:
+    def get_price(self, token_id: int) -> float | None:
         """
-        Get the current price on the orderbook
+        Get the current price on the orderbook, `None` if it could not be fetched
         """
         self.logger.debug("Fetching midpoint price from the API...")
-        start_time = time.time()
         try:
-            resp = self.client.get_midpoint(token_id)
-            clob_requests_latency.labels(method="get_midpoint", status="ok").observe(
-                (time.time() - start_time)
+            resp = self._call(
+                "get_midpoint", "GET /midpoint", self.client.get_midpoint, token_id
             )
             if resp.get("mid") is not None:
                 return float(resp.get("mid"))
         except Exception as e:
             self.logger.error(f"Error fetching current price from the CLOB API: {e}")
-            clob_requests_latency.labels(method="get_midpoint", status="error").observe(
-                (time.time() - start_time)
-            )
 
-        return self._rand_price()
+        return None
 
-    def _rand_price(self) -> float:
-        price = randomize_default_price(DEFAULT_PRICE)
-        self.logger.info(
-            f"Could not fetch price from CLOB API, returning random price: {price}"
-        )
-        return price
+    def get_prices(self, token_ids: list[int]) -> dict[int, float]:
+        """
+        Get the current prices of several tokens, MAX_TOKENS_PER_MIDPOINTS per request
 
-    def get_orders(self, condition_id: str):
+        Returns:
+            The midpoint price of every token it could be fetched for.
         """
-        Get open keeper orders on the orderbook
+        self.logger.debug(f"Fetching {len(token_ids)} midpoint prices from the API...")
+        prices = {}
+        for i in range(0, len(token_ids), MAX_TOKENS_PER_MIDPOINTS):
+            batch = token_ids[i : i + MAX_TOKENS_PER_MIDPOINTS]
+            try:
+                resp = self._call(
+                    "get_midpoints",
+                    "POST /midpoints",
+                    self.client.get_midpoints,
+                    [BookParams(token_id=str(token_id)) for token_id in batch],
+                )
+            except Exception as e:
+                self.logger.error(f"Error fetching current prices from the CLOB API: {e}")
+                continue
+
+            for token_id in batch:
+                mid = (resp or {}).get(str(token_id))
+                if mid is not None:
+                    prices[token_id] = float(mid)
+        return prices
+
+    def get_orders(self, condition_id: str) -> list[dict] | None:
+        """
+        Get open keeper orders on the orderbook, `None` if they could not be fetched
         """
         self.logger.debug("Fetching open keeper orders from the API...")
-        start_time = time.time()
         try:
-            resp = self.client.get_orders(OpenOrderParams(market=condition_id))
-            clob_requests_latency.labels(method="get_orders", status="ok").observe(
-                (time.time() - start_time)
+            resp = self._call(
+                "get_orders",
+                "GET /data/orders",
+                self.client.get_orders,
+                OpenOrderParams(market=condition_id),
             )
-
             return [self._get_order(order) for order in resp]
         except Exception as e:
             self.logger.error(
                 f"Error fetching keeper open orders from the CLOB API: {e}"
             )
-            clob_requests_latency.labels(method="get_orders", status="error").observe(
-                (time.time() - start_time)
-            )
-        return []
+        return None
 
     def place_order(self, price: float, size: float, side: str, token_id: int) -> str:
         """
@@ -128,14 +179,16 @@ class ClobApi:
         self.logger.info(
             f"Placing a new order: Order[price={price},size={size},side={side},token_id={token_id}]"
         )
-        start_time = time.time()
+        signed_order = self.order_signer.sign_orders(
+            [{"price": price, "size": size, "side": side, "token_id": token_id}]
+        )[0]
+        if signed_order is None:
+            return None
+
         try:
-            resp = self.client.create_and_post_order(
-                OrderArgs(price=price, size=size, side=side, token_id=token_id)
+            resp = self._call(
+                "post_order", "POST /order", self.client.post_order, signed_order
             )
-            clob_requests_latency.labels(
-                method="create_and_post_order", status="ok"
-            ).observe((time.time() - start_time))
             order_id = None
             if resp and resp.get("success") and resp.get("orderID"):
                 order_id = resp.get("orderID")
@@ -150,122 +203,256 @@ class ClobApi:
             )
         except Exception as e:
             self.logger.error(f"Request exception: failed placing new order: {e}")
-            clob_requests_latency.labels(
-                method="create_and_post_order", status="error"
-            ).observe((time.time() - start_time))
         return None
 
+    def place_orders(self, orders: list[dict]) -> list[str]:
+        """
+        Places new orders, up to MAX_ORDERS_PER_BATCH per request
+
+        Args:
+            orders: List of dicts with the `price`, `size`, `side` and `token_id` of each order.
+
+        Returns:
+            List aligned with `orders`, holding the new order id or `None` for every order which was not placed.
+        """
+        self.logger.info(f"Placing {len(orders)} new orders...")
+        order_ids = [None] * len(orders)
+
+        signed_orders = [
+            (index, signed_order)
+            for index, signed_order in enumerate(self.order_signer.sign_orders(orders))
+            if signed_order is not None
+        ]
+
+        for i in range(0, len(signed_orders), MAX_ORDERS_PER_BATCH):
+            batch = signed_orders[i : i + MAX_ORDERS_PER_BATCH]
+            try:
+                resp = self._call(
+                    "post_orders",
+                    "POST /orders",
+                    self.client.post_orders,
+                    [PostOrdersArgs(order=signed_order) for _, signed_order in batch],
+                )
+            except Exception as e:
+                self.logger.error(f"Request exception: failed placing new orders: {e}")
+                continue
+
+            for (index, _), order_resp in zip(batch, resp or []):
+                order = orders[index]
+                if order_resp.get("success") and order_resp.get("orderID"):
+                    order_ids[index] = order_resp.get("orderID")
+                    self.logger.info(
+                        f"Succesfully placed new order: Order[id={order_ids[index]},price={order['price']},size={order['size']},side={order['side']},tokenID={order['token_id']}]!"
+                    )
+                else:
+                    self.logger.error(
+                        f"Could not place new order! CLOB returned error: {order_resp.get('errorMsg')}"
+                    )
+
+        return order_ids
+
+    def presign_orders(self, orders: list[dict]):
+        """
+        Signs orders which are likely to be placed soon in the background, see `OrderSigner.presign`
+        """
+        if self.order_signer.can_presign:
+            self.order_signer.presign(orders)
+
     def cancel_order(self, order_id) -> bool:
         self.logger.info(f"Cancelling order {order_id}...")
         if order_id is None:
             self.logger.debug("Invalid order_id")
             return True
 
-        start_time = time.time()
         try:
-            resp = self.client.cancel(order_id)
-            clob_requests_latency.labels(method="cancel", status="ok").observe(
-                (time.time() - start_time)
-            )
+            resp = self._call("cancel", "DELETE /order", self.client.cancel, order_id)
             return resp == OK
         except Exception as e:
             self.logger.error(f"Error cancelling order: {order_id}: {e}")
-            clob_requests_latency.labels(method="cancel", status="error").observe(
-                (time.time() - start_time)
-            )
         return False
 
+    def cancel_orders(self, order_ids: list[str]) -> set[str]:
+        """
+        Cancels orders by id, up to MAX_ORDER_IDS_PER_CANCEL per request
+
+        Returns:
+            The ids which are known to be cancelled.
+        """
+        self.logger.info(f"Cancelling {len(order_ids)} orders...")
+        cancelled = set(order_id for order_id in order_ids if order_id is None)
+        order_ids = [order_id for order_id in order_ids if order_id is not None]
+
+        for i in range(0, len(order_ids), MAX_ORDER_IDS_PER_CANCEL):
+            batch = order_ids[i : i + MAX_ORDER_IDS_PER_CANCEL]
+            try:
+                resp = self._call(
+                    "cancel_orders", "DELETE /orders", self.client.cancel_orders, batch
+                )
+            except Exception as e:
+                self.logger.error(f"Error cancelling orders: {batch}: {e}")
+                continue
+
+            cancelled.update(resp.get("canceled") or [])
+            for order_id, reason in (resp.get("not_canceled") or {}).items():
+                self.logger.error(f"Could not cancel order {order_id}: {reason}")
+
+        return cancelled
+
     def cancel_all_orders(self) -> bool:
         self.logger.info("Cancelling all open keeper orders..")
-        start_time = time.time()
         try:
-            resp = self.client.cancel_all()
-            clob_requests_latency.labels(method="cancel_all", status="ok").observe(
-                (time.time() - start_time)
-            )
+            resp = self._call("cancel_all", "DELETE /cancel-all", self.client.cancel_all)
             return resp == OK
         except Exception as e:
             self.logger.error(f"Error cancelling all orders: {e}")
-            clob_requests_latency.labels(method="cancel_all", status="error").observe(
-                (time.time() - start_time)
-            )
         return False
 
-    def _init_client_L1(
-        self,
-        host,
-        chain_id,
-        private_key,
-    ) -> ClobClient:
-        clob_client = ClobClient(host, chain_id, private_key)
+    def _call(self, method: str, endpoint: str, func: Callable, *args):
+        """
+        Sends a request to the CLOB through `func`, within the current deadline (see
+        `deadline_after`) and the endpoint's circuit breaker.
+
+        Args:
+            method: Name of the request in the metrics.
+            endpoint: Rate limiter and circuit breaker endpoint, e.g. "GET /data/orders".
+
+        Raises:
+            DeadlineExceeded: The deadline expired before or while sending the request.
+            CircuitOpenError: The endpoint is failing, the request was not sent.
+        """
+        creds = self.client.creds
         try:
-            if clob_client.get_ok() == OK:
-                self.logger.info("Connected to CLOB API!")
-                self.logger.info(
-                    "CLOB Keeper address: {}".format(clob_client.get_address())
-                )
-                return clob_client
-        except:
-            self.logger.error("Unable to connect to CLOB API, shutting down!")
-            sys.exit(1)
+            return self._send(method, endpoint, func, *args)
+        except PolyApiException as e:
+            if e.status_code != 401 or not self._renew_api_creds(creds):
+                raise
+        return self._send(method, endpoint, func, *args)
 
-    def _init_client_L2(
-        self, host, chain_id, private_key, creds: ApiCreds
-    ) -> ClobClient:
-        clob_client = ClobClient(host, chain_id, private_key, creds)
+    def _send(self, method: str, endpoint: str, func: Callable, *args):
         try:
-            if clob_client.get_ok() == OK:
-                self.logger.info("Connected to CLOB API!")
-                self.logger.info(
-                    "CLOB Keeper address: {}".format(clob_client.get_address())
-                )
-                return clob_client
-        except:
-            self.logger.error("Unable to connect to CLOB API, shutting down!")
-            sys.exit(1)
+            check_deadline(method)
+        except DeadlineExceeded:
+            clob_requests_rejected.labels(method=method, reason="deadline").inc()
+            raise
 
-    def _init_client_L1_proxy(
-        self,
-        host,
-        chain_id,
-        private_key,
-        funder_address,
-        signature_type
-    ) -> ClobClient:
-        clob_client = ClobClient(host, key=private_key, chain_id=chain_id, signature_type=signature_type, funder=funder_address)
+        breaker = self.circuit_breakers.get(endpoint)
+        if not breaker.allow():
+            clob_requests_rejected.labels(method=method, reason="circuit_open").inc()
+            raise CircuitOpenError(f"{endpoint} is failing, not sending {method}")
+
+        if not self.rate_limiter.acquire(endpoint, timeout=remaining_time()):
+            # never sent, says nothing about the endpoint's health
+            breaker.release()
+            clob_requests_rejected.labels(method=method, reason="deadline").inc()
+            raise DeadlineExceeded(f"Deadline exceeded waiting for the {endpoint} rate limit")
+
+        # a request cut short by the keeper's own deadline says nothing about the endpoint
+        remaining = remaining_time()
+        shortened = remaining is not None and remaining < transport.timeout
+
+        start_time = time.time()
+        status = "error"
         try:
-            if clob_client.get_ok() == OK:
-                self.logger.info("Connected to CLOB API with proxy wallet!")
-                self.logger.info(
-                    "CLOB Keeper address: {}".format(clob_client.get_address())
-                )
-                self.logger.info(
-                    "CLOB Funder address: {}".format(funder_address)
-                )
-                return clob_client
-        except:
-            self.logger.error("Unable to connect to CLOB API with proxy wallet, shutting down!")
-            sys.exit(1)
+            resp = func(*args)
+            status = "ok"
+            breaker.record_success()
+            return resp
+        except DeadlineExceeded:
+            status = "timeout"
+            clob_requests_timeouts.labels(method=method).inc()
+            breaker.release()
+            raise
+        except requests.Timeout:
+            status = "timeout"
+            clob_requests_timeouts.labels(method=method).inc()
+            if shortened:
+                breaker.release()
+            else:
+                breaker.record_failure()
+            raise
+        except PolyApiException as e:
+            # the endpoint answered, rejecting the request is not a failure of the endpoint
+            if e.status_code is None or e.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            clob_requests_latency.labels(method=method, status=status).observe(
+                (time.time() - start_time)
+            )
+
+    def _derive_api_creds(self) -> ApiCreds:
+        try:
+            api_creds = self.client.derive_api_key()
+            self.logger.debug(f"Api key found: {api_creds.api_key}")
+        except PolyApiException:
+            self.logger.debug("Api key not found. Creating a new one...")
+            api_creds = self.client.create_api_key()
+            self.logger.debug(f"Api key created: {api_creds.api_key}.")
+
+        self._creds_derived = True
+        if self.creds_cache is not None:
+            self.creds_cache.save(self.client.get_address(), api_creds)
+        return api_creds
+
+    def _renew_api_creds(self, rejected_creds: ApiCreds) -> bool:
+        """
+        Replaces credentials loaded from the cache once the CLOB rejected them
+
+        Returns:
+            Whether there are new credentials to retry with.
+        """
+        with self._creds_lock:
+            if self.client.creds is not rejected_creds:
+                # already renewed by a concurrent request
+                return True
+            if self._creds_derived:
+                return False
+
+            self.logger.warning("Cached api key was rejected, deriving it again...")
+            if self.creds_cache is not None:
+                self.creds_cache.invalidate(self.client.get_address())
+            self.client.set_api_creds(self._derive_api_creds())
+            return True
 
-    def _init_client_L2_proxy(
-        self, host, chain_id, private_key, funder_address, signature_type, creds: ApiCreds
+    def _init_client(
+        self, host, chain_id, private_key, funder_address, signature_type
     ) -> ClobClient:
-        clob_client = ClobClient(host, key=private_key, chain_id=chain_id, signature_type=signature_type, funder=funder_address, creds=creds)
+        # Use proxy signature if funder_address is provided
+        if funder_address:
+            return ClobClient(
+                host,
+                key=private_key,
+                chain_id=chain_id,
+                signature_type=signature_type,
+                funder=funder_address,
+            )
+        return ClobClient(host, chain_id, private_key)
+
+    def _connect(self, funder_address):
+        wallet = " with proxy wallet" if funder_address else ""
         try:
-            if clob_client.get_ok() == OK:
-                self.logger.info("Connected to CLOB API with proxy wallet and API creds!")
-                self.logger.info(
-                    "CLOB Keeper address: {}".format(clob_client.get_address())
-                )
+            if self.client.get_ok() == OK:
+                self.logger.info(f"Connected to CLOB API{wallet}!")
                 self.logger.info(
-                    "CLOB Funder address: {}".format(funder_address)
+                    "CLOB Keeper address: {}".format(self.client.get_address())
                 )
-                return clob_client
+                if funder_address:
+                    self.logger.info(
+                        "CLOB Funder address: {}".format(funder_address)
+                    )
+                return
         except:
-            self.logger.error("Unable to connect to CLOB API with proxy wallet and creds, shutting down!")
-            sys.exit(1)
+            pass
+        self.logger.error(f"Unable to connect to CLOB API{wallet}, shutting down!")
+        sys.exit(1)
 
-    def _get_order(self, order_dict: dict) -> dict:
+    @staticmethod
+    def _get_order(order_dict: dict) -> dict:
         size = float(order_dict.get("original_size")) - float(
             order_dict.get("size_matched")
         )
@@ -3,3 +3,6 @@ MIN_TICK = 0.01
 MIN_PRICE = 1.0
 MIN_SIZE = 5.0
 MAX_DECIMALS = 2
+MAX_ORDERS_PER_BATCH = 15
+MAX_ORDER_IDS_PER_CANCEL = 1000
+MAX_TOKENS_PER_MIDPOINTS = 500
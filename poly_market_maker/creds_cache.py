@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import threading
+
+from py_clob_client.clob_types import ApiCreds
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(
+    os.path.expanduser("~"), ".cache", "poly-market-maker"
+)
+DEFAULT_CREDS_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIRECTORY, "api_creds.json")
+
+
+class CredsCache:
+    """CLOB API credentials derived for each address, persisted in a file only the user can read.
+
+    The credentials are not checked when loaded: callers should `invalidate` them once
+    the CLOB rejects them, and derive new ones.
+    """
+
+    def __init__(self, path: str = DEFAULT_CREDS_CACHE_PATH):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert isinstance(path, str)
+
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, address: str) -> ApiCreds | None:
+        creds = self._read().get(address.lower())
+        if creds is None:
+            return None
+        try:
+            return ApiCreds(
+                api_key=creds["api_key"],
+                api_secret=creds["api_secret"],
+                api_passphrase=creds["api_passphrase"],
+            )
+        except (KeyError, TypeError):
+            return None
+
+    def save(self, address: str, creds: ApiCreds):
+        assert isinstance(creds, ApiCreds)
+
+        with self._lock:
+            entries = self._read()
+            entries[address.lower()] = {
+                "api_key": creds.api_key,
+                "api_secret": creds.api_secret,
+                "api_passphrase": creds.api_passphrase,
+            }
+            self._write(entries)
+
+    def invalidate(self, address: str):
+        with self._lock:
+            entries = self._read()
+            if entries.pop(address.lower(), None) is not None:
+                self._write(entries)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as fh:
+                entries = json.load(fh)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable credentials cache {self.path}: {e}")
+            return {}
+
+    def _write(self, entries: dict):
+        # written next to the cache and renamed over it, so that concurrent readers never
+        # see a partial file, and created readable by the user only
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+                if os.path.abspath(directory) == DEFAULT_CACHE_DIRECTORY:
+                    # shared with the other caches, which may have created it first
+                    os.chmod(directory, 0o700)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as fh:
+                json.dump(entries, fh)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write the credentials cache {self.path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,47 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+
+class DeadlineExceeded(Exception):
+    """The deadline of the current operation expired before it completed."""
+
+
+# monotonic time by which the current operation must complete, `None` when unbounded
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_after(seconds: float | None):
+    """
+    Bounds everything run in the block, including work it hands to other threads with
+    `contextvars.copy_context`, to complete within `seconds`.
+
+    Nested deadlines can only shorten the current one. `None` leaves it as is.
+    """
+    current = _deadline.get()
+    if seconds is not None:
+        at = time.monotonic() + seconds
+        if current is None or at < current:
+            current = at
+
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Time (in seconds) left before the current deadline, `None` if there is none."""
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+
+def check_deadline(operation: str):
+    """Raises `DeadlineExceeded` if the current deadline expired."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded {-remaining:.3f}s before {operation}")
@@ -0,0 +1,150 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+
+from poly_market_maker.order import Side
+
+
+class BookSide:
+    """Aggregated size per price level of one side of the book.
+
+    Prices are kept sorted in ascending order with bisect, so locating a level is
+    O(log n). Bids are best at the end, asks at the start.
+    """
+
+    def __init__(self, side: Side):
+        assert isinstance(side, Side)
+
+        self.side = side
+        self.prices = []
+        self.sizes = {}
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def clear(self):
+        self.prices.clear()
+        self.sizes.clear()
+
+    def set(self, price: float, size: float):
+        """Sets the size resting at `price`, removing the level if `size` is zero."""
+        if size <= 0:
+            if self.sizes.pop(price, None) is not None:
+                del self.prices[bisect_left(self.prices, price)]
+            return
+
+        if price not in self.sizes:
+            insort(self.prices, price)
+        self.sizes[price] = size
+
+    def best(self) -> float | None:
+        if len(self.prices) == 0:
+            return None
+        return self.prices[-1] if self.side == Side.BUY else self.prices[0]
+
+    def levels(self) -> Iterable[tuple[float, float]]:
+        """Yields (price, size) from the best price outwards."""
+        prices = reversed(self.prices) if self.side == Side.BUY else iter(self.prices)
+        for price in prices:
+            yield (price, self.sizes[price])
+
+    def cumulative_depth(self, price: float) -> float:
+        """Total size at `price` or better."""
+        if self.side == Side.BUY:
+            better = range(bisect_left(self.prices, price), len(self.prices))
+        else:
+            better = range(0, bisect_right(self.prices, price))
+        return sum(self.sizes[self.prices[index]] for index in better)
+
+
+class L2Book:
+    """Incremental level 2 book of a single token, built from snapshots and deltas.
+
+    Readers (strategies) and the writer (the market stream) run on different threads,
+    every method takes the book's lock for the duration of the call.
+    """
+
+    def __init__(self, asset_id: str):
+        self.asset_id = asset_id
+        self.bids = BookSide(Side.BUY)
+        self.asks = BookSide(Side.SELL)
+        # deltas are meaningless until a snapshot was applied
+        self.synced = False
+
+        self._lock = threading.Lock()
+
+    def _side(self, side: Side) -> BookSide:
+        return self.bids if side == Side.BUY else self.asks
+
+    def apply_snapshot(
+        self,
+        bids: Iterable[tuple[float, float]],
+        asks: Iterable[tuple[float, float]],
+    ):
+        """Replaces the whole book with the given (price, size) levels."""
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            for price, size in bids:
+                self.bids.set(price, size)
+            for price, size in asks:
+                self.asks.set(price, size)
+            self.synced = True
+
+    def apply_delta(self, side: Side, price: float, size: float):
+        """Sets the new total size of a level, `0` removes it. Ignored until synced."""
+        with self._lock:
+            if self.synced:
+                self._side(side).set(price, size)
+
+    def reset(self):
+        """Forgets the book until the next snapshot, e.g. after missing deltas."""
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+            self.synced = False
+
+    def best_bid(self) -> float | None:
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self) -> float | None:
+        with self._lock:
+            return self.asks.best()
+
+    def top_of_book(self) -> tuple[float | None, float | None]:
+        """Best bid and ask, read together."""
+        with self._lock:
+            return (self.bids.best(), self.asks.best())
+
+    def depth_at(self, side: Side, price: float) -> float:
+        """Size resting on the `side` level at `price`."""
+        with self._lock:
+            return self._side(side).sizes.get(price, 0.0)
+
+    def cumulative_depth(self, side: Side, price: float) -> float:
+        """Size resting on `side` at `price` or better."""
+        with self._lock:
+            return self._side(side).cumulative_depth(price)
+
+    def mid(self) -> float | None:
+        (best_bid, best_ask) = self.top_of_book()
+        if best_bid is None or best_ask is None:
+            return None
+        return (best_bid + best_ask) / 2
+
+    def microprice(self) -> float | None:
+        """Mid weighted by the opposite side's size at the top of book."""
+        with self._lock:
+            best_bid = self.bids.best()
+            best_ask = self.asks.best()
+            if best_bid is None or best_ask is None:
+                return None
+            bid_size = self.bids.sizes[best_bid]
+            ask_size = self.asks.sizes[best_ask]
+
+        return (best_bid * ask_size + best_ask * bid_size) / (bid_size + ask_size)
+
+    def __repr__(self):
+        (best_bid, best_ask) = self.top_of_book()
+        return f"L2Book[asset_id={self.asset_id}, bid={best_bid}, ask={best_ask}, levels={len(self.bids)}/{len(self.asks)}]"
@@ -24,3 +24,104 @@ gas_station_latency = Histogram(
     labelnames=["strategy", "status"],
     namespace="market_maker",
 )
+order_book_refresh_interval = Gauge(
+    "order_book_refresh_interval",
+    "Interval (in seconds) the order book refresh currently waits between refreshes",
+    labelnames=["market"],
+    namespace="market_maker",
+)
+order_book_snapshot_age = Gauge(
+    "order_book_snapshot_age",
+    "Time (in seconds) since the last successful order book refresh",
+    labelnames=["market"],
+    namespace="market_maker",
+)
+rate_limiter_wait_time = Histogram(
+    "rate_limiter_wait_time",
+    "Time (in seconds) requests waited for the per-endpoint rate limit",
+    labelnames=["endpoint"],
+    namespace="market_maker",
+)
+order_pipeline_queue_depth = Gauge(
+    "order_pipeline_queue_depth",
+    "Order placements and cancellations waiting for a free worker",
+    labelnames=["operation"],
+    namespace="market_maker",
+)
+order_pipeline_wait_time = Histogram(
+    "order_pipeline_wait_time",
+    "Time (in seconds) order placements and cancellations waited for a free worker",
+    labelnames=["operation"],
+    namespace="market_maker",
+)
+order_signing_time = Histogram(
+    "order_signing_time",
+    "Time (in seconds) spent signing an order",
+    namespace="market_maker",
+)
+order_signing_cache = Counter(
+    "order_signing_cache",
+    "Orders taken from the presigned orders cache (hit) or signed on demand (miss)",
+    labelnames=["result"],
+    namespace="market_maker",
+)
+websocket_connected = Gauge(
+    "websocket_connected",
+    "Whether the websocket stream is connected and subscribed",
+    labelnames=["stream", "market"],
+    namespace="market_maker",
+)
+websocket_messages = Counter(
+    "websocket_messages",
+    "Messages received on the websocket stream",
+    labelnames=["stream", "market"],
+    namespace="market_maker",
+)
+websocket_reconnects = Counter(
+    "websocket_reconnects",
+    "Times the websocket stream lost its connection",
+    labelnames=["stream", "market"],
+    namespace="market_maker",
+)
+transport_request_latency = Histogram(
+    "transport_request_latency",
+    "Latency (in seconds) of the HTTP requests sent through the transport",
+    labelnames=["host", "method", "status"],
+    namespace="market_maker",
+)
+transport_connections = Counter(
+    "transport_connections",
+    "HTTP requests which opened a new connection (new) or reused a pooled one (reused)",
+    labelnames=["host", "connection"],
+    namespace="market_maker",
+)
+clob_requests_timeouts = Counter(
+    "clob_requests_timeouts",
+    "Clob requests which timed out or ran out of their deadline",
+    labelnames=["method"],
+    namespace="market_maker",
+)
+clob_requests_rejected = Counter(
+    "clob_requests_rejected",
+    "Clob requests failed fast without being sent, because the deadline expired (deadline) or the circuit is open (circuit_open)",
+    labelnames=["method", "reason"],
+    namespace="market_maker",
+)
+circuit_breaker_state = Gauge(
+    "circuit_breaker_state",
+    "State of the endpoint's circuit breaker: 0 closed, 1 half open, 2 open",
+    labelnames=["endpoint"],
+    namespace="market_maker",
+)
+startup_phase_duration = Gauge(
+    "startup_phase_duration",
+    "Time (in seconds) spent in each startup phase",
+    labelnames=["phase", "market"],
+    namespace="market_maker",
+)
+amm_expected_orders_cache = Counter(
+    "amm_expected_orders_cache",
+    "AMM ladders taken from the expected orders cache (hit) or computed (miss)",
+    labelnames=["result"],
+    namespace="market_maker",
+)
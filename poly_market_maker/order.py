@@ -2,6 +2,7 @@ from enum import Enum
 from py_clob_client.order_builder.constants import BUY, SELL
 
 from poly_market_maker.market import Token
+from poly_market_maker.ticks import to_lots, to_ticks
 
 
 class Side(Enum):
@@ -34,6 +35,9 @@ class Order:
         self.side = side
         self.token = token
         self.id = id
+        # exact integer forms of the price and size, for comparisons and arithmetic
+        self.price_ticks = to_ticks(price)
+        self.size_lots = to_lots(size)
 
     def __repr__(self):
         return f"Order[id={self.id}, price={self.price}, size={self.size}, side={self.side.value}, token={self.token.value}]"
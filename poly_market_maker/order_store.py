@@ -0,0 +1,88 @@
+from collections.abc import Iterable
+
+from poly_market_maker.order import Order
+
+
+class OrderStore:
+    """Open keeper orders indexed by id.
+
+    Placements, cancellations and refresh results are applied as deltas. The
+    tuple returned by `orders()` is cached until the next mutation, so taking
+    repeated snapshots of an unchanged store costs nothing.
+    """
+
+    def __init__(self, orders: Iterable[Order] = ()):
+        self._orders = {}
+        self._snapshot = None
+
+        for order in orders:
+            self.add(order)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._orders
+
+    def __iter__(self):
+        return iter(self.orders())
+
+    def get(self, order_id: str) -> Order | None:
+        return self._orders.get(order_id)
+
+    def orders(self) -> tuple[Order, ...]:
+        """Returns all stored orders, in insertion order."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._orders.values())
+        return self._snapshot
+
+    def add(self, order: Order) -> bool:
+        """Inserts or updates an order. Returns `True` if the store changed."""
+        assert isinstance(order, Order)
+        assert order.id is not None
+
+        existing = self._orders.get(order.id)
+        if existing is not None:
+            if self._same(existing, order):
+                return False
+            self.remove(order.id)
+
+        self._orders[order.id] = order
+        self._snapshot = None
+        return True
+
+    def remove(self, order_id: str) -> Order | None:
+        """Removes an order by id. Returns the removed order, if it was stored."""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+
+        self._snapshot = None
+        return order
+
+    def replace_all(self, orders: Iterable[Order]) -> bool:
+        """Makes the store hold exactly `orders`, touching only what differs.
+
+        When the same id appears more than once, the first occurrence wins.
+        Returns `True` if the store changed.
+        """
+        target = {}
+        for order in orders:
+            target.setdefault(order.id, order)
+
+        changed = False
+        for order_id in [i for i in self._orders if i not in target]:
+            self.remove(order_id)
+            changed = True
+        for order in target.values():
+            changed |= self.add(order)
+        return changed
+
+    @staticmethod
+    def _same(order: Order, other: Order) -> bool:
+        return (
+            order.size == other.size
+            and order.price_ticks == other.price_ticks
+            and order.side == other.side
+            and order.token == other.token
+        )
@@ -1,36 +1,129 @@
+import contextvars
+import itertools
 import logging
 import threading
 import time
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, wait
-
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from types import MappingProxyType
+
+from poly_market_maker.constants import MAX_ORDERS_PER_BATCH, MAX_ORDER_IDS_PER_CANCEL
+from poly_market_maker.metrics import (
+    order_book_refresh_interval,
+    order_book_snapshot_age,
+    order_pipeline_queue_depth,
+    order_pipeline_wait_time,
+)
 from poly_market_maker.order import Order, Side
+from poly_market_maker.order_store import OrderStore
+from poly_market_maker.token import Collateral
 
 
 class OrderBook:
-    """Represents the current snapshot of the order book.
+    """Represents an immutable snapshot of the order book.
+
+    Snapshots are published by the `OrderBookManager` and never change once
+    published, so they can be read without any locking.
 
     Attributes:
-        -orders: Current list of active orders.
-        -balances: Current balances state.
+        -orders: Tuple of active orders.
+        -balances: Read-only view of the balances state, `None` if balances were never fetched.
         -orders_being_placed: `True` if at least one order is currently being placed. `False` otherwise.
         -orders_being_cancelled: `True` if at least one orders is currently being cancelled. `False` otherwise.
+        -version: Monotonically increasing number, bumped whenever any of the above changes.
     """
 
+    __slots__ = (
+        "orders",
+        "balances",
+        "orders_being_placed",
+        "orders_being_cancelled",
+        "version",
+    )
+
     def __init__(
         self,
-        orders: list[Order],
+        orders: tuple[Order, ...],
         balances: dict,
         orders_being_placed: bool,
         orders_being_cancelled: bool,
+        version: int = 0,
     ):
         assert isinstance(orders_being_placed, bool)
         assert isinstance(orders_being_cancelled, bool)
+        assert isinstance(version, int)
+
+        set_attribute = super().__setattr__
+        set_attribute("orders", tuple(orders))
+        set_attribute(
+            "balances", MappingProxyType(dict(balances)) if balances is not None else None
+        )
+        set_attribute("orders_being_placed", orders_being_placed)
+        set_attribute("orders_being_cancelled", orders_being_cancelled)
+        set_attribute("version", version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("OrderBook snapshots are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("OrderBook snapshots are immutable")
+
+    def __repr__(self):
+        return (
+            f"OrderBook[version={self.version}, orders={len(self.orders)},"
+            f" placing={self.orders_being_placed}, cancelling={self.orders_being_cancelled}]"
+        )
+
 
-        self.orders = orders
-        self.balances = balances
-        self.orders_being_placed = orders_being_placed
-        self.orders_being_cancelled = orders_being_cancelled
+class RefreshScheduler:
+    """Picks the interval between two background order book refreshes.
+
+    Placements and cancellations drop the interval to `min_interval` so their effect is
+    confirmed quickly. Every refresh which finds nothing new multiplies it by `backoff`,
+    up to `max_interval`, so a quiet book is polled less and less often.
+
+    While a stream keeps the book up to date, refreshes only reconcile it and run every
+    `reconciliation_interval` seconds, unless one is explicitly requested.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 2.0,
+    ):
+        assert 0 < min_interval <= interval <= max_interval
+        assert backoff >= 1.0
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = interval
+        self.reconciliation_interval = None
+
+    def activity(self):
+        """Orders were placed or cancelled, refresh soon unless a stream reports their outcome."""
+        if self.reconciliation_interval is None:
+            self.interval = self.min_interval
+
+    def refresh_soon(self):
+        """Runs the next refresh after `min_interval`, whatever the mode."""
+        self.interval = self.min_interval
+
+    def reconcile_every(self, interval: float | None):
+        """Switches to reconciling every `interval` seconds, or back to adaptive polling with `None`."""
+        self.reconciliation_interval = interval
+        self.interval = interval if interval is not None else self.min_interval
+
+    def refreshed(self, changed: bool):
+        """A refresh completed, `changed` tells whether it found anything new."""
+        if self.reconciliation_interval is not None:
+            self.interval = self.reconciliation_interval
+        elif changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
 
 
 class OrderBookManager:
@@ -39,30 +132,81 @@ class OrderBookManager:
     Attributes:
         refresh_frequency: Frequency (in seconds) of how often background order book (and balances)
             refresh takes place.
+        max_workers: Maximum number of placements and cancellations in flight at the same time.
+        min_refresh_frequency: Shortest refresh interval (in seconds), used right after placements
+            and cancellations. Defaults to `refresh_frequency`.
+        max_refresh_frequency: Longest refresh interval (in seconds) the refresh backs off to while
+            the order book is quiet. Defaults to `refresh_frequency`.
+        reconciliation_frequency: Refresh interval (in seconds) while a stream applies order updates,
+            see `stream_connected`. Defaults to `max_refresh_frequency`.
+        market: Condition id of the market, labelling the order book metrics.
     """
 
-    def __init__(self, refresh_frequency: int, max_workers: int = 5):
+    def __init__(
+        self,
+        refresh_frequency: int,
+        max_workers: int = 5,
+        min_refresh_frequency: float = None,
+        max_refresh_frequency: float = None,
+        reconciliation_frequency: float = None,
+        market: str = "",
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
 
         assert isinstance(refresh_frequency, int)
         assert isinstance(max_workers, int)
+        assert isinstance(market, str)
 
         self.refresh_frequency = refresh_frequency
+        self.market = market
+        self._scheduler = RefreshScheduler(
+            interval=refresh_frequency,
+            min_interval=min(
+                min_refresh_frequency or refresh_frequency, refresh_frequency
+            ),
+            max_interval=max(
+                max_refresh_frequency or refresh_frequency, refresh_frequency
+            ),
+        )
+        self.reconciliation_frequency = (
+            reconciliation_frequency or self._scheduler.max_interval
+        )
         self.get_orders_function = None
         self.get_balances_function = None
         self.place_order_function = None
+        self.place_orders_batch_function = None
+        self.presign_orders_function = None
         self.cancel_order_function = None
+        self.cancel_orders_batch_function = None
         self.cancel_all_orders_function = None
         self.on_update_function = None
 
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # orders and balances are fetched side by side
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="refresh"
+        )
+        # set to make the refresh thread re-evaluate how long it still has to sleep
+        self._refresh_wakeup = threading.Event()
+        self._last_refresh_time = None
         self._lock = threading.Lock()
+        # notified whenever a snapshot is published or a refresh completes
+        self._changed = threading.Condition(self._lock)
         self._state = None
+        # latest published snapshot, replaced (never mutated) under `_lock`
+        self._order_book = None
         self._refresh_count = 0
         self._currently_placing_orders = 0
-        self._orders_placed = list()
-        self._order_ids_cancelling = set()
+        # open orders as of the last refresh, plus placements since then
+        self._orders = OrderStore()
+        # orders withheld from snapshots while their cancellation is in flight
+        self._orders_cancelling = OrderStore()
+        self._orders_placed = dict()
         self._order_ids_cancelled = set()
+        # size matched so far of the orders updated by a stream
+        self._sizes_matched = dict()
+        # bumped whenever a stream applies a fill to the balances
+        self._balances_revision = 0
 
     def get_orders_with(self, get_orders_function: Callable[[], list[Order]]):
         """
@@ -94,6 +238,32 @@ class OrderBookManager:
 
         self.place_order_function = place_order_function
 
+    def place_orders_batch_with(
+        self, place_orders_batch_function: Callable[[list[Order]], list[Order]]
+    ):
+        """
+        Configures the (optional) function used to place several orders in one request.
+        Args:
+            place_orders_batch_function: The function which will be called with up to `MAX_ORDERS_PER_BATCH`
+                new orders. It must return a list aligned with its argument, holding the placed order or
+                `None` for every order which could not be placed. When configured, it is used instead of the
+                function configured with `place_orders_with`.
+        """
+        assert callable(place_orders_batch_function)
+
+        self.place_orders_batch_function = place_orders_batch_function
+
+    def presign_orders_with(self, presign_orders_function: Callable[[list[Order]], None]):
+        """
+        Configures the (optional) function used to prepare orders which are likely to be placed soon.
+        Args:
+            presign_orders_function: The function which will be called with orders the strategy expects
+                to place in one of the next synchronizations. It must not block.
+        """
+        assert callable(presign_orders_function)
+
+        self.presign_orders_function = presign_orders_function
+
     def cancel_orders_with(self, cancel_order_function: Callable):
         """
         Configures the function used to cancel orders.
@@ -104,6 +274,21 @@ class OrderBookManager:
 
         self.cancel_order_function = cancel_order_function
 
+    def cancel_orders_batch_with(
+        self, cancel_orders_batch_function: Callable[[list[Order]], set[str]]
+    ):
+        """
+        Configures the (optional) function used to cancel several orders in one request.
+        Args:
+            cancel_orders_batch_function: The function which will be called with up to
+                `MAX_ORDER_IDS_PER_CANCEL` orders to cancel. It must return the ids of the orders
+                which were cancelled. When configured, it is used instead of the function configured
+                with `cancel_orders_with`.
+        """
+        assert callable(cancel_orders_batch_function)
+
+        self.cancel_orders_batch_function = cancel_orders_batch_function
+
     def cancel_all_orders_with(self, cancel_all_orders_function: Callable):
         """
         Configures the function used to cancel all keeper orders.
@@ -123,61 +308,37 @@ class OrderBookManager:
         """Start the background refresh of active keeper orders."""
         threading.Thread(target=self._thread_refresh_order_book, daemon=True).start()
 
+    @property
+    def version(self) -> int:
+        """Version of the latest published snapshot, `0` before the order book is available."""
+        order_book = self._order_book
+        return order_book.version if order_book is not None else 0
+
     def get_order_book(self) -> OrderBook:
         """
         Returns the current snapshot of the active keeper orders and balances.
+
+        Never takes the order book lock: the latest published snapshot is returned as is.
         """
-        while self._state is None:
+        if self._order_book is None:
             self.logger.info("Waiting for the order book to become available...")
-            time.sleep(0.5)
+            self.wait_for_order_book()
 
-        with self._lock:
-            self.logger.debug("Getting the order book...")
-            if self._state.get("orders") is not None:
-                self.logger.debug(
-                    f"Orders retrieved last time: {[order.id for order in self._state['orders']]}"
-                )
-            self.logger.debug(
-                f"Orders placed since then: {[order.id for order in self._orders_placed]}"
-            )
-            self.logger.debug(
-                f"Orders cancelled since then: {[order_id for order_id in self._order_ids_cancelled]}"
-            )
-            self.logger.debug(
-                f"Orders being cancelled: {[order_id for order_id in self._order_ids_cancelling]}"
-            )
-            self.logger.debug(
-                f"Orders being placed: {self._currently_placing_orders} order(s)"
-            )
+        return self._order_book
 
-            orders = []
-
-            # Add orders which have been placed if they exist
-            if self._state.get("orders") is not None:
-                orders = list(self._state["orders"])
-                for order in self._orders_placed:
-                    if order.id not in list(map(lambda order: order.id, orders)):
-                        orders.append(order)
-
-                # Remove orders being cancelled and already cancelled.
-                orders = list(
-                    filter(
-                        lambda order: order.id not in self._order_ids_cancelling
-                        and order.id not in self._order_ids_cancelled,
-                        orders,
-                    )
-                )
+    def wait_for_order_book(self, timeout: float = None) -> bool:
+        """Wait until the first order book snapshot is published.
 
-                self.logger.debug(
-                    f"Open keeper orders: {[order.id for order in orders]}"
-                )
+        Args:
+            timeout: Maximum time to wait (in seconds), `None` to wait indefinitely.
 
-        return OrderBook(
-            orders=orders,
-            balances=self._state["balances"],
-            orders_being_placed=self._currently_placing_orders > 0,
-            orders_being_cancelled=len(self._order_ids_cancelling) > 0,
-        )
+        Returns:
+            `True` if the order book is available, `False` if the timeout expired first.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._order_book is not None, timeout
+            )
 
     def place_order(self, place_order_function: Callable[[Order], Order], order: Order):
         """Places new order. Order placement will happen in a background thread.
@@ -189,59 +350,118 @@ class OrderBookManager:
 
         with self._lock:
             self._currently_placing_orders += 1
+            self._publish()
 
         self._report_order_book_updated()
 
-        result = self._executor.submit(
-            self._thread_place_order(place_order_function, order)
+        result = self._submit(
+            "place", self._thread_place_order(place_order_function, order)
         )
         wait([result])
 
     def place_orders(self, orders: list[Order]):
         """Places new orders. Order placement will happen in a background thread.
 
+        Orders are sent in batches of up to `MAX_ORDERS_PER_BATCH` if a batch placement function
+        is configured, one by one otherwise.
+
         Args:
             new_orders: List of new orders to place.
         """
         assert isinstance(orders, list)
-        assert callable(self.place_order_function)
+        assert callable(self.place_orders_batch_function) or callable(
+            self.place_order_function
+        )
 
         with self._lock:
             self._currently_placing_orders += len(orders)
+            self._publish()
 
         self._report_order_book_updated()
 
-        results = [
-            self._executor.submit(
-                self._thread_place_order(self.place_order_function, order)
-            )
-            for order in orders
-        ]
+        if self.place_orders_batch_function is not None:
+            results = [
+                self._submit(
+                    "place",
+                    self._thread_place_orders_batch(
+                        self.place_orders_batch_function,
+                        orders[i : i + MAX_ORDERS_PER_BATCH],
+                    ),
+                )
+                for i in range(0, len(orders), MAX_ORDERS_PER_BATCH)
+            ]
+        else:
+            results = [
+                self._submit(
+                    "place", self._thread_place_order(self.place_order_function, order)
+                )
+                for order in orders
+            ]
         wait(results)
 
+    @property
+    def can_presign(self) -> bool:
+        """Whether `presign_orders` does anything, so that callers can skip computing the orders."""
+        return self.presign_orders_function is not None
+
+    def presign_orders(self, orders: list[Order]):
+        """Prepares orders which are likely to be placed soon, if a presign function is configured.
+
+        Args:
+            orders: List of orders which may be placed in one of the next synchronizations.
+        """
+        assert isinstance(orders, list)
+
+        if self.presign_orders_function is None or len(orders) == 0:
+            return
+
+        try:
+            self.presign_orders_function(orders)
+        except Exception as e:
+            self.logger.error(f"Failed to presign orders: {e}")
+
     def cancel_orders(self, orders: list[Order]):
         """
         Cancels existing orders. Order cancellation will happen in a background thread.
 
+        Orders are cancelled in batches of up to `MAX_ORDER_IDS_PER_CANCEL` if a batch cancellation
+        function is configured, one by one otherwise.
+
         Args:
             orders: List of orders to cancel.
         """
         self.logger.info("Cancelling orders...")
         assert isinstance(orders, list)
-        assert callable(self.cancel_order_function)
+        assert callable(self.cancel_orders_batch_function) or callable(
+            self.cancel_order_function
+        )
 
         with self._lock:
             for order in orders:
-                self._order_ids_cancelling.add(order.id)
+                self._withhold_order(order)
+            self._publish()
 
         self._report_order_book_updated()
 
-        results = [
-            self._executor.submit(
-                self._thread_cancel_order(self.cancel_order_function, order)
-            )
-            for order in orders
-        ]
+        if self.cancel_orders_batch_function is not None:
+            results = [
+                self._submit(
+                    "cancel",
+                    self._thread_cancel_orders_batch(
+                        self.cancel_orders_batch_function,
+                        orders[i : i + MAX_ORDER_IDS_PER_CANCEL],
+                    ),
+                )
+                for i in range(0, len(orders), MAX_ORDER_IDS_PER_CANCEL)
+            ]
+        else:
+            results = [
+                self._submit(
+                    "cancel",
+                    self._thread_cancel_order(self.cancel_order_function, order),
+                )
+                for order in orders
+            ]
         wait(results)
 
     def cancel_all_orders(self):
@@ -253,20 +473,24 @@ class OrderBookManager:
             if len(orders) == 0:
                 self.logger.info("No open orders on order book.")
                 break
-            order_ids = [order.id for order in orders]
             with self._lock:
-                for order_id in order_ids:
-                    self._order_ids_cancelling.add(order_id)
+                for order in orders:
+                    self._withhold_order(order)
+                self._publish()
 
-            self.logger.info(f"Cancelling {len(order_ids)} open orders...")
+            self.logger.info(f"Cancelling {len(orders)} open orders...")
 
             # Cancel all orders
-            result = self._executor.submit(
-                self._thread_cancel_all_orders(self.cancel_all_orders_function, orders)
+            result = self._submit(
+                "cancel_all",
+                self._thread_cancel_all_orders(self.cancel_all_orders_function, orders),
             )
             wait([result])
             self.wait_for_stable_order_book()
-            time.sleep(2)
+
+            # Orders are only left if the cancellation failed, give the backend a refresh before retrying
+            if len(self.get_order_book().orders) > 0:
+                self.wait_for_order_book_refresh()
 
         # Wait for the background thread to refresh the order book twice, so we are 99.9% sure
         # that there are no orders left in the backend.
@@ -290,35 +514,222 @@ class OrderBookManager:
 
         self.logger.info("All orders successfully cancelled!")
 
-    def wait_for_order_cancellation(self):
-        """Wait until no background order cancellation takes place."""
-        while len(self._order_ids_cancelling) > 0:
-            time.sleep(0.1)
+    def stream_connected(self, connected: bool):
+        """Tells whether a stream currently applies order updates.
+
+        While it does, the background refresh only reconciles the order book every
+        `reconciliation_frequency` seconds. When it disconnects, adaptive polling resumes
+        right away so nothing missed meanwhile goes unnoticed for long.
+        """
+        with self._lock:
+            self._scheduler.reconcile_every(
+                self.reconciliation_frequency if connected else None
+            )
+            self._refresh_wakeup.set()
+
+    def refresh_soon(self):
+        """Asks for a refresh after the shortest refresh interval, e.g. once a trade settles."""
+        with self._lock:
+            self._scheduler.refresh_soon()
+            self._refresh_wakeup.set()
+
+    def apply_order_update(self, order: Order, size_matched: float = 0.0):
+        """Applies the state of an order pushed by a stream.
+
+        Args:
+            order: The order, its `size` being the size still open. A fully matched order is
+                forgotten, an order being cancelled or already cancelled is not brought back.
+            size_matched: Total size matched so far. Increases are applied to the balances.
+        """
+        assert isinstance(order, Order)
+        assert order.id is not None
 
-    def wait_for_order_book_refresh(self):
-        """Wait until at least one background order book refresh happens since now."""
         with self._lock:
+            if order.id in self._order_ids_cancelled:
+                return
+
+            known = self._orders.get(order.id) or self._orders_cancelling.get(order.id)
+            previous = self._sizes_matched.get(order.id)
+            if previous is None:
+                # the first update only tells how much was matched since the order was last seen
+                previous = size_matched - (
+                    known.size - order.size if known is not None else 0.0
+                )
+            self._sizes_matched[order.id] = size_matched
+            if size_matched > previous:
+                self._apply_fill(order, size_matched - previous)
+
+            if order.size <= 0:
+                self._forget_order(order.id)
+            elif order.id in self._orders_cancelling:
+                self._orders_cancelling.add(order)
+            else:
+                self._orders_placed[order.id] = order
+                self._orders.add(order)
+            self._publish()
+
+    def apply_order_cancellation(self, order_id: str):
+        """Applies the cancellation of an order pushed by a stream."""
+        with self._lock:
+            if order_id in self._orders_cancelling:
+                # settled by the thread cancelling it
+                return
+
+            self._forget_order(order_id)
+            self._publish()
+
+    def wait_for_order_cancellation(self, timeout: float = None) -> bool:
+        """Wait until no background order cancellation takes place.
+
+        Args:
+            timeout: Maximum time to wait (in seconds), `None` to wait indefinitely.
+
+        Returns:
+            `True` once no cancellation is in flight, `False` if the timeout expired first.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: len(self._orders_cancelling) == 0, timeout
+            )
+
+    def wait_for_order_book_refresh(self, timeout: float = None) -> bool:
+        """Wait until at least one background order book refresh happens since now.
+
+        Args:
+            timeout: Maximum time to wait (in seconds), `None` to wait indefinitely.
+
+        Returns:
+            `True` once a refresh completed, `False` if the timeout expired first.
+        """
+        with self._changed:
             old_counter = self._refresh_count
+            return self._changed.wait_for(
+                lambda: self._refresh_count > old_counter, timeout
+            )
 
-        while True:
-            with self._lock:
-                new_counter = self._refresh_count
+    def wait_for_stable_order_book(self, timeout: float = None) -> bool:
+        """Wait until no background order placement nor cancellation takes place.
 
-            if new_counter > old_counter:
-                break
+        Args:
+            timeout: Maximum time to wait (in seconds), `None` to wait indefinitely.
+
+        Returns:
+            `True` once the order book is stable, `False` if the timeout expired first.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._order_book is not None
+                and self._currently_placing_orders == 0
+                and len(self._orders_cancelling) == 0,
+                timeout,
+            )
+
+    def _submit(self, operation: str, func: Callable) -> Future:
+        """
+        Queues a placement or cancellation, tracking queue depth and time spent queued.
 
-            time.sleep(0.1)
+        The work runs in the caller's context, so it is bound by the caller's deadline.
+        """
+        queued_at = time.monotonic()
+        queue_depth = order_pipeline_queue_depth.labels(operation=operation)
+        queue_depth.inc()
+
+        def run():
+            queue_depth.dec()
+            order_pipeline_wait_time.labels(operation=operation).observe(
+                time.monotonic() - queued_at
+            )
+            return func()
+
+        return self._executor.submit(contextvars.copy_context().run, run)
+
+    def _publish(self):
+        """Publishes a new snapshot if the visible state changed. Must be called with `_lock` held."""
+        if self._state is None:
+            return
 
-    def wait_for_stable_order_book(self):
-        """Wait until no background order placement nor cancellation takes place."""
+        previous = self._order_book
+        orders = self._orders.orders()
+        balances = self._state.get("balances")
+        orders_being_placed = self._currently_placing_orders > 0
+        orders_being_cancelled = len(self._orders_cancelling) > 0
+
+        if (
+            previous is not None
+            and previous.orders is orders
+            and previous.balances == balances
+            and previous.orders_being_placed == orders_being_placed
+            and previous.orders_being_cancelled == orders_being_cancelled
+        ):
+            return
+
+        self._order_book = OrderBook(
+            orders=orders,
+            balances=balances,
+            orders_being_placed=orders_being_placed,
+            orders_being_cancelled=orders_being_cancelled,
+            version=previous.version + 1 if previous is not None else 1,
+        )
+        self._changed.notify_all()
+
+    def _note_activity(self):
+        """Asks for a quick refresh after a placement or cancellation. Must be called with `_lock` held."""
+        self._scheduler.activity()
+        self._refresh_wakeup.set()
+
+    def _snapshot_age(self) -> float:
+        if self._last_refresh_time is None:
+            return 0.0
+        return time.monotonic() - self._last_refresh_time
+
+    def _sleep_until_next_refresh(self):
+        started = time.monotonic()
         while True:
-            order_book = self.get_order_book()
-            if (
-                not order_book.orders_being_cancelled
-                and not order_book.orders_being_placed
-            ):
-                break
-            time.sleep(0.1)
+            with self._lock:
+                interval = self._scheduler.interval
+            remaining = interval - (time.monotonic() - started)
+            if remaining <= 0:
+                return
+            if self._refresh_wakeup.wait(remaining):
+                self._refresh_wakeup.clear()
+
+    def _withhold_order(self, order: Order):
+        """Moves an order out of the open orders while it is being cancelled."""
+        self._orders_cancelling.add(self._orders.remove(order.id) or order)
+
+    def _release_order(self, order_id: str, cancelled: bool):
+        """Settles a cancellation: forgets the order, or restores it if the cancel failed."""
+        order = self._orders_cancelling.remove(order_id)
+        if cancelled:
+            self._order_ids_cancelled.add(order_id)
+            self._orders_placed.pop(order_id, None)
+        elif order is not None:
+            self._orders.add(order)
+
+    def _forget_order(self, order_id: str):
+        """Drops an order which is no longer open, so in-flight refreshes do not bring it back."""
+        self._orders.remove(order_id)
+        self._orders_cancelling.remove(order_id)
+        self._orders_placed.pop(order_id, None)
+        self._sizes_matched.pop(order_id, None)
+        self._order_ids_cancelled.add(order_id)
+
+    def _apply_fill(self, order: Order, size: float):
+        """Moves the matched size of an order between the token and collateral balances."""
+        balances = self._state.get("balances") if self._state is not None else None
+        if balances is None:
+            return
+
+        amount = size * order.price
+        balances = dict(balances)
+        if order.side == Side.BUY:
+            balances[order.token] = balances.get(order.token, 0.0) + size
+            balances[Collateral] = balances.get(Collateral, 0.0) - amount
+        else:
+            balances[order.token] = balances.get(order.token, 0.0) - size
+            balances[Collateral] = balances.get(Collateral, 0.0) + amount
+        self._state["balances"] = balances
+        self._balances_revision += 1
 
     def _report_order_book_updated(self):
         if self.on_update_function is not None:
@@ -346,24 +757,29 @@ class OrderBookManager:
             return None
 
     def _thread_refresh_order_book(self):
+        order_book_snapshot_age.labels(market=self.market).set_function(
+            self._snapshot_age
+        )
+
         while True:
             try:
                 with self._lock:
                     orders_already_cancelled_before = set(self._order_ids_cancelled)
                     orders_already_placed_before = set(self._orders_placed)
+                    balances_revision_before = self._balances_revision
+                    # placements and cancellations from now on are not covered by this refresh
+                    self._refresh_wakeup.clear()
 
-                # get orders
-                orders = self._run_get_orders()
-
-                # get balances
-                balances = self._run_get_balances()
+                # get orders and balances
+                orders_future = self._refresh_executor.submit(self._run_get_orders)
+                balances_future = self._refresh_executor.submit(self._run_get_balances)
+                orders = orders_future.result()
+                balances = balances_future.result()
 
                 with self._lock:
-                    self._order_ids_cancelled = (
-                        self._order_ids_cancelled - orders_already_cancelled_before
-                    )
-                    for order in orders_already_placed_before:
-                        self._orders_placed.remove(order)
+                    self._order_ids_cancelled -= orders_already_cancelled_before
+                    for order_id in orders_already_placed_before:
+                        self._orders_placed.pop(order_id, None)
 
                     if self._state is None:
                         self.logger.info("Order book became available")
@@ -374,26 +790,57 @@ class OrderBookManager:
                     if self._state is None:
                         self._state = {}
 
+                    previous_order_book = self._order_book
                     if orders is not None:
-                        # If either the orderbook or balance check fails, the state stays as it was before the refresh
-                        self._state["orders"] = orders
-                    if balances is not None:
+                        # If either the orderbook or balance check fails, the state stays as it was before the refresh.
+                        # Orders cancelled or being cancelled while the fetch was in flight stay hidden, orders
+                        # placed meanwhile are kept until the next refresh confirms them.
+                        self._orders.replace_all(
+                            itertools.chain(
+                                (
+                                    order
+                                    for order in orders
+                                    if order.id not in self._order_ids_cancelled
+                                    and order.id not in self._orders_cancelling
+                                ),
+                                self._orders_placed.values(),
+                            )
+                        )
+                        self._sizes_matched = {
+                            order_id: size_matched
+                            for order_id, size_matched in self._sizes_matched.items()
+                            if order_id in self._orders or order_id in self._orders_cancelling
+                        }
+                    # fills applied while the fetch was in flight are not reflected in its balances
+                    if (
+                        balances is not None
+                        and self._balances_revision == balances_revision_before
+                    ):
                         self._state["balances"] = balances
-                    # self._state = {'orders': orders, 'balances': balances}
                     self._refresh_count += 1
+                    self._publish()
+                    self._changed.notify_all()
+
+                    if orders is not None or balances is not None:
+                        self._last_refresh_time = time.monotonic()
+                    self._scheduler.refreshed(self._order_book is not previous_order_book)
+                    order_book_refresh_interval.labels(market=self.market).set(
+                        self._scheduler.interval
+                    )
 
                 self._report_order_book_updated()
 
-                self.logger.debug(
-                    f"Fetched the order book"
-                    f" (orders: {[order.id for order in orders]}, "
-                    f" buys: {len([order for order in orders if order.side == Side.BUY])}, "
-                    f" sells: {len([order for order in orders if order.side == Side.SELL])})"
-                )
+                if orders is not None and self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        f"Fetched the order book"
+                        f" (orders: {[order.id for order in orders]}, "
+                        f" buys: {len([order for order in orders if order.side == Side.BUY])}, "
+                        f" sells: {len([order for order in orders if order.side == Side.SELL])})"
+                    )
             except ValueError as e:
                 self.logger.error(f"Failed to fetch the order book or balances ({e})!")
 
-            time.sleep(self.refresh_frequency)
+            self._sleep_until_next_refresh()
 
     def _thread_place_order(
         self, place_order_function: Callable[[Order], Order], order: Order
@@ -406,12 +853,49 @@ class OrderBookManager:
 
                 if new_order is not None:
                     with self._lock:
-                        self._orders_placed.append(new_order)
+                        self._orders_placed[new_order.id] = new_order
+                        self._orders.add(new_order)
+                        self._publish()
             except BaseException as exception:
                 self.logger.exception(exception)
             finally:
                 with self._lock:
                     self._currently_placing_orders -= 1
+                    self._note_activity()
+                    self._publish()
+                self._report_order_book_updated()
+
+        return func
+
+    def _thread_place_orders_batch(
+        self,
+        place_orders_batch_function: Callable[[list[Order]], list[Order]],
+        orders: list[Order],
+    ):
+        assert callable(place_orders_batch_function)
+
+        def func():
+            try:
+                new_orders = place_orders_batch_function(orders)
+
+                placed = [order for order in new_orders if order is not None]
+                if len(placed) < len(orders):
+                    self.logger.warning(
+                        f"Placed {len(placed)} out of {len(orders)} orders of the batch"
+                    )
+
+                with self._lock:
+                    for new_order in placed:
+                        self._orders_placed[new_order.id] = new_order
+                        self._orders.add(new_order)
+                    self._publish()
+            except BaseException as exception:
+                self.logger.exception(exception)
+            finally:
+                with self._lock:
+                    self._currently_placing_orders -= len(orders)
+                    self._note_activity()
+                    self._publish()
                 self._report_order_book_updated()
 
         return func
@@ -423,20 +907,42 @@ class OrderBookManager:
 
         def func():
             order_id = order.id
+            cancelled = False
             try:
-                if cancel_order_function(order):
-                    with self._lock:
-                        self._order_ids_cancelled.add(order_id)
-                        self._order_ids_cancelling.remove(order_id)
+                cancelled = bool(cancel_order_function(order))
             except BaseException as e:
                 self.logger.exception(f"Failed to cancel {order_id}")
                 self.logger.exception(f"Exception: {e}")
             finally:
                 with self._lock:
-                    try:
-                        self._order_ids_cancelling.remove(order_id)
-                    except KeyError:
-                        pass
+                    self._release_order(order_id, cancelled)
+                    self._note_activity()
+                    self._publish()
+                self._report_order_book_updated()
+
+        return func
+
+    def _thread_cancel_orders_batch(
+        self,
+        cancel_orders_batch_function: Callable[[list[Order]], set[str]],
+        orders: list[Order],
+    ):
+        assert callable(cancel_orders_batch_function)
+
+        def func():
+            cancelled_ids = set()
+            try:
+                cancelled_ids = cancel_orders_batch_function(orders)
+            except BaseException:
+                self.logger.exception(
+                    f"Failed to cancel {[order.id for order in orders]}"
+                )
+            finally:
+                with self._lock:
+                    for order in orders:
+                        self._release_order(order.id, order.id in cancelled_ids)
+                    self._note_activity()
+                    self._publish()
                 self._report_order_book_updated()
 
         return func
@@ -449,22 +955,17 @@ class OrderBookManager:
         assert callable(cancel_all_orders_function)
 
         def func():
-            order_ids = [order.id for order in orders]
+            cancelled = False
             try:
-                if cancel_all_orders_function(orders):
-                    with self._lock:
-                        for order_id in order_ids:
-                            self._order_ids_cancelled.add(order_id)
-                            self._order_ids_cancelling.remove(order_id)
+                cancelled = bool(cancel_all_orders_function(orders))
             except BaseException:
                 self.logger.exception("Failed to cancel all")
             finally:
                 with self._lock:
-                    for order_id in order_ids:
-                        try:
-                            self._order_ids_cancelling.remove(order_id)
-                        except KeyError:
-                            pass
+                    for order in orders:
+                        self._release_order(order.id, cancelled)
+                    self._note_activity()
+                    self._publish()
                 self._report_order_book_updated()
 
         return func
@@ -1,13 +1,22 @@
 from enum import Enum
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from poly_market_maker.clob_api import ClobApi
+from poly_market_maker.l2_book import L2Book
 from poly_market_maker.market import Market
+from poly_market_maker.order import Side
 from poly_market_maker.token import Token
+from poly_market_maker.websocket_stream import WebsocketStream
+
+MARKET_CHANNEL_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
 
 
 class PriceFeedSource(Enum):
     CLOB = "clob"
+    WEBSOCKET = "websocket"
 
 
 class PriceFeed:
@@ -16,9 +25,14 @@ class PriceFeed:
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def get_price(self) -> float:
+    def get_price(self, token: Token) -> float | None:
+        """The mid price of `token`, `None` if it is not available."""
         raise NotImplemented()
 
+    def get_price_age(self, token: Token) -> float | None:
+        """Age (in seconds) of the price `get_price` returns, `None` if there is none."""
+        return 0.0
+
 
 class PriceFeedClob(PriceFeed):
     """Resolves the prices from the clob"""
@@ -32,10 +46,195 @@ class PriceFeedClob(PriceFeed):
         self.market = market
         self.clob_api = clob_api
 
-    def get_price(self, token: Token) -> float:
+    def get_price(self, token: Token) -> float | None:
         token_id = self.market.token_id(token)
 
         self.logger.debug("Fetching target price using the clob midpoint price...")
         target_price = self.clob_api.get_price(token_id)
         self.logger.debug(f"target_price: {target_price}")
         return target_price
+
+
+class CachedPriceFeed(PriceFeed):
+    """Serves the prices of another feed from memory, refreshing them in the background.
+
+    A price younger than `ttl` seconds is served as is. An older one is still served
+    immediately while a single background refresh fetches a new one (stale-while-revalidate).
+    Only the very first price of a token is fetched synchronously. Failed fetches keep the
+    last good price, whose age keeps growing, see `get_price_age`.
+    """
+
+    def __init__(self, price_feed: PriceFeed, ttl: float):
+        super().__init__()
+
+        assert isinstance(price_feed, PriceFeed)
+        assert ttl >= 0
+
+        self.price_feed = price_feed
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        # token -> (price, time it was fetched)
+        self._prices = {}
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="price")
+
+    def get_price(self, token: Token) -> float | None:
+        with self._lock:
+            cached = self._prices.get(token)
+            refresh = (
+                cached is not None
+                and time.monotonic() - cached[1] >= self.ttl
+                and token not in self._refreshing
+            )
+            if refresh:
+                self._refreshing.add(token)
+
+        if cached is None:
+            return self._fetch(token)
+        if refresh:
+            self._executor.submit(self._refresh, token)
+        return cached[0]
+
+    def get_price_age(self, token: Token) -> float | None:
+        with self._lock:
+            cached = self._prices.get(token)
+        if cached is None:
+            return None
+        return time.monotonic() - cached[1]
+
+    def _fetch(self, token: Token) -> float | None:
+        fetched_at = time.monotonic()
+        price = self.price_feed.get_price(token)
+        if price is not None:
+            with self._lock:
+                cached = self._prices.get(token)
+                if cached is None or cached[1] < fetched_at:
+                    self._prices[token] = (price, fetched_at)
+        return price
+
+    def _refresh(self, token: Token):
+        try:
+            self._fetch(token)
+        except Exception as e:
+            self.logger.error(f"Failed to refresh the {token.value} price: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(token)
+
+
+class PriceFeedWebsocket(PriceFeedClob):
+    """Serves the mid price from the books streamed on the CLOB market channel.
+
+    Every token has an `L2Book` kept up to date from book snapshots and price changes.
+    Falls back to the clob midpoint endpoint while the stream is disconnected, silent for
+    longer than `max_age` seconds, or has no two-sided book for the token.
+    """
+
+    def __init__(
+        self,
+        market: Market,
+        clob_api: ClobApi,
+        url: str = MARKET_CHANNEL_URL,
+        max_age: float = 15.0,
+    ):
+        super().__init__(market, clob_api)
+
+        self.max_age = max_age
+        self.books = {
+            str(market.token_id(token)): L2Book(str(market.token_id(token)))
+            for token in Token
+        }
+        self.stream = WebsocketStream(
+            name="market",
+            url=url,
+            market=market.condition_id,
+            subscription=self._subscription,
+            on_message=self.handle_message,
+            on_connection=self._on_connection,
+        )
+
+    def start(self):
+        self.stream.start()
+
+    def stop(self):
+        self.stream.stop()
+
+    def get_book(self, token: Token) -> L2Book | None:
+        """The streamed book of the token, `None` if the stream can not be trusted."""
+        if not self.stream.connected:
+            return None
+        message_age = self.stream.message_age()
+        if message_age is None or message_age > self.max_age:
+            return None
+
+        book = self.books[str(self.market.token_id(token))]
+        return book if book.synced else None
+
+    def get_top_of_book(self, token: Token) -> tuple[float, float] | None:
+        """Best bid and ask of the token, `None` if either is unknown."""
+        book = self.get_book(token)
+        if book is None:
+            return None
+
+        top_of_book = book.top_of_book()
+        return top_of_book if None not in top_of_book else None
+
+    def get_price(self, token: Token) -> float | None:
+        top_of_book = self.get_top_of_book(token)
+        if top_of_book is None:
+            self.logger.debug("Market stream is stale, falling back to the clob")
+            return super().get_price(token)
+
+        (best_bid, best_ask) = top_of_book
+        return (best_bid + best_ask) / 2
+
+    def get_price_age(self, token: Token) -> float | None:
+        if self.get_top_of_book(token) is None:
+            # served by a fresh clob request
+            return 0.0
+        return self.stream.message_age()
+
+    def _subscription(self) -> dict:
+        return {"assets_ids": list(self.books), "type": "market"}
+
+    def _on_connection(self, connected: bool):
+        if not connected:
+            # whatever was missed while disconnected comes with the next book snapshots
+            for book in self.books.values():
+                book.reset()
+
+    def handle_message(self, message: dict):
+        event_type = message.get("event_type")
+        if event_type == "book":
+            self._handle_book(message)
+        elif event_type == "price_change":
+            self._handle_price_change(message)
+
+    def _handle_book(self, message: dict):
+        book = self.books.get(message["asset_id"])
+        if book is None:
+            return
+
+        book.apply_snapshot(
+            bids=_levels(message.get("bids", [])),
+            asks=_levels(message.get("asks", [])),
+        )
+
+    def _handle_price_change(self, message: dict):
+        # current messages carry one change per entry of `price_changes`, legacy ones
+        # a list of `changes` for a single asset
+        changes = message.get("price_changes") or [
+            dict(change, asset_id=message.get("asset_id"))
+            for change in message.get("changes", [])
+        ]
+        for change in changes:
+            book = self.books.get(change["asset_id"])
+            if book is not None:
+                book.apply_delta(
+                    Side(change["side"]), float(change["price"]), float(change["size"])
+                )
+
+
+def _levels(levels: list[dict]) -> list[tuple[float, float]]:
+    return [(float(level["price"]), float(level["size"])) for level in levels]
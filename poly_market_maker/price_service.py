@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from poly_market_maker.market import Market
+from poly_market_maker.price_feed import PriceFeed
+from poly_market_maker.token import Token
+
+
+class PriceService:
+    """Fetches the prices of every subscribed token in one batched request per interval.
+
+    Meant to be shared by all the markets of a process, each reading its prices through
+    a `PriceFeedService`.
+
+    Attributes:
+        interval: Time (in seconds) between two fetches.
+    """
+
+    def __init__(self, interval: float):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert interval > 0
+
+        self.interval = interval
+        self.get_prices_function = None
+
+        self._lock = threading.Lock()
+        # token id -> number of feeds subscribed to it
+        self._subscriptions = {}
+        # token id -> (price, time it was fetched)
+        self._prices = {}
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def get_prices_with(self, get_prices_function: Callable[[list[int]], dict[int, float]]):
+        """
+        Configures the function used to fetch prices.
+        Args:
+            get_prices_function: The function which will be called with all subscribed token ids and
+                must return the price of every token it could fetch, e.g. `ClobApi.get_prices`.
+        """
+        assert callable(get_prices_function)
+
+        self.get_prices_function = get_prices_function
+
+    def start(self):
+        """Starts the background fetch, unless it is already running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._thread_fetch_prices, name="price-service", daemon=True
+            )
+        self._thread.start()
+
+    def subscribe(self, token_ids: list[int]):
+        with self._lock:
+            new = [token_id for token_id in token_ids if token_id not in self._subscriptions]
+            for token_id in token_ids:
+                self._subscriptions[token_id] = self._subscriptions.get(token_id, 0) + 1
+        if len(new) > 0:
+            # new markets should not wait a whole interval for their first prices
+            self._wakeup.set()
+
+    def unsubscribe(self, token_ids: list[int]):
+        with self._lock:
+            for token_id in token_ids:
+                count = self._subscriptions.get(token_id, 0) - 1
+                if count > 0:
+                    self._subscriptions[token_id] = count
+                else:
+                    self._subscriptions.pop(token_id, None)
+                    self._prices.pop(token_id, None)
+
+    def get_price(self, token_id: int) -> float | None:
+        cached = self._prices.get(token_id)
+        return cached[0] if cached is not None else None
+
+    def get_price_age(self, token_id: int) -> float | None:
+        cached = self._prices.get(token_id)
+        return time.monotonic() - cached[1] if cached is not None else None
+
+    def fetch_prices(self):
+        """Fetches the prices of all subscribed tokens in one go."""
+        with self._lock:
+            token_ids = list(self._subscriptions)
+        if len(token_ids) == 0 or self.get_prices_function is None:
+            return
+
+        fetched_at = time.monotonic()
+        prices = self.get_prices_function(token_ids)
+        with self._lock:
+            for token_id, price in prices.items():
+                if token_id in self._subscriptions:
+                    self._prices[token_id] = (price, fetched_at)
+
+        missing = len(token_ids) - len(prices)
+        if missing > 0:
+            self.logger.warning(f"No price for {missing} of {len(token_ids)} tokens")
+
+    def _thread_fetch_prices(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                self.fetch_prices()
+            except Exception as e:
+                self.logger.error(f"Failed to fetch prices: {e}")
+            self._wakeup.wait(self.interval)
+
+
+class PriceFeedService(PriceFeed):
+    """Resolves the prices of a market from a shared `PriceService`"""
+
+    def __init__(self, market: Market, price_service: PriceService):
+        super().__init__()
+
+        assert isinstance(market, Market)
+        assert isinstance(price_service, PriceService)
+
+        self.market = market
+        self.price_service = price_service
+        self.price_service.subscribe([market.token_id(token) for token in Token])
+
+    def close(self):
+        self.price_service.unsubscribe([self.market.token_id(token) for token in Token])
+
+    def get_price(self, token: Token) -> float | None:
+        return self.price_service.get_price(self.market.token_id(token))
+
+    def get_price_age(self, token: Token) -> float | None:
+        return self.price_service.get_price_age(self.market.token_id(token))
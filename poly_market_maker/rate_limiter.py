@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+import time
+
+from poly_market_maker.metrics import rate_limiter_wait_time
+
+# Per-endpoint (sustained requests per second, burst) pairs, derived from the
+# CLOB's published limits: the burst is the 10 second allowance, the rate the
+# 10 minute one spread evenly.
+CLOB_RATE_LIMITS = {
+    "POST /order": (60.0, 3500),
+    "POST /orders": (25.0, 1000),
+    "DELETE /order": (50.0, 3000),
+    "DELETE /orders": (25.0, 1000),
+    "DELETE /cancel-all": (10.0, 250),
+    "GET /data/orders": (15.0, 150),
+    "GET /midpoint": (150.0, 1500),
+    "POST /midpoints": (50.0, 500),
+}
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: Maximum number of tokens the bucket holds, i.e. the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        assert rate > 0
+        assert capacity >= 1
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Takes `tokens` if available.
+
+        Returns:
+            `0` if the tokens were taken, otherwise the time (in seconds) until they will be available.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> bool:
+        """Blocks until `tokens` are taken from the bucket.
+
+        Args:
+            tokens: Number of tokens to take.
+            timeout: Maximum time to wait (in seconds), `None` to wait indefinitely.
+
+        Returns:
+            `True` if the tokens were taken, `False` if the timeout expired first.
+        """
+        assert tokens <= self.capacity
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay == 0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """Token buckets keyed by endpoint, e.g. `"POST /order"`.
+
+    Endpoints without a configured limit are not throttled.
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, float]]):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.buckets = {
+            endpoint: TokenBucket(rate, capacity)
+            for endpoint, (rate, capacity) in limits.items()
+        }
+
+    def acquire(self, endpoint: str, tokens: float = 1, timeout: float = None) -> bool:
+        """Waits for the endpoint's bucket, see `TokenBucket.acquire`."""
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            return True
+
+        start_time = time.monotonic()
+        acquired = bucket.acquire(tokens, timeout)
+        waited = time.monotonic() - start_time
+        rate_limiter_wait_time.labels(endpoint=endpoint).observe(waited)
+        if waited > 0.1:
+            self.logger.debug(f"Waited {waited:.3f}s for the {endpoint} rate limit")
+        return acquired
+
+    async def acquire_async(
+        self, endpoint: str, tokens: float = 1, timeout: float = None
+    ) -> bool:
+        """Waits for the endpoint's bucket without blocking the event loop, see `acquire`."""
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            return True
+
+        start_time = time.monotonic()
+        deadline = None if timeout is None else start_time + timeout
+        acquired = True
+        while True:
+            delay = bucket.try_acquire(tokens)
+            if delay == 0:
+                break
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    acquired = False
+                    break
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+        rate_limiter_wait_time.labels(endpoint=endpoint).observe(
+            time.monotonic() - start_time
+        )
+        return acquired
+
+
+# The CLOB enforces its limits per account, so every ClobApi in the process shares these buckets
+clob_rate_limiter = RateLimiter(CLOB_RATE_LIMITS)
@@ -0,0 +1,228 @@
+import logging
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from py_clob_client.client import ClobClient, OrderArgs
+from py_clob_client.clob_types import CreateOrderOptions
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.signer import Signer
+from py_clob_client.utilities import price_valid
+
+from poly_market_maker.metrics import order_signing_cache, order_signing_time
+
+# order builder of the current signing process, see `_init_signing_process`
+_order_builder = None
+
+
+def _init_signing_process(private_key: str, chain_id: int, signature_type, funder):
+    global _order_builder
+    _order_builder = OrderBuilder(
+        Signer(private_key, chain_id), sig_type=signature_type, funder=funder
+    )
+
+
+def _sign_order(order_args: OrderArgs, options: CreateOrderOptions):
+    start_time = time.perf_counter()
+    signed_order = _order_builder.create_order(order_args, options)
+    return signed_order, time.perf_counter() - start_time
+
+
+def _copy_outcome(source: Future, destination: Future):
+    if source.exception() is not None:
+        destination.set_exception(source.exception())
+    else:
+        destination.set_result(source.result())
+
+
+class OrderSigner:
+    """Creates signed CLOB orders off the placement path.
+
+    The token options (tick size, neg risk and fee rate) are resolved through the
+    client, which caches them, by `call` (e.g. `ClobApi._call`), while the EIP-712 signatures themselves are computed
+    in a pool of `processes` worker processes, or inline when `processes` is `0`.
+
+    Orders can also be signed ahead of time with `presign`, which resolves the token options
+    on a background thread so that a cold client cache never blocks its caller. Presigned orders are kept
+    in a bounded cache keyed by (token_id, side, price, size) and handed out once by
+    `sign_orders`, so placing them is only I/O.
+    """
+
+    def __init__(
+        self,
+        client: ClobClient,
+        private_key: str,
+        chain_id: int,
+        signature_type: int = None,
+        funder: str = None,
+        processes: int = 0,
+        cache_size: int = 512,
+        call: Callable = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert isinstance(processes, int)
+        assert isinstance(cache_size, int)
+
+        self.client = client
+        self.cache_size = cache_size
+        self.call = call or (lambda method, endpoint, func, *args: func(*args))
+
+        init_args = (private_key, chain_id, signature_type, funder)
+        self._pool = (
+            ProcessPoolExecutor(
+                max_workers=processes,
+                # forking a process which already runs the keeper threads is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_signing_process,
+                initargs=init_args,
+            )
+            if processes > 0
+            else None
+        )
+        self._builder = None if self._pool is not None else OrderBuilder(
+            Signer(private_key, chain_id), sig_type=signature_type, funder=funder
+        )
+        # the option lookups of presigned orders may go over HTTP, off the caller's thread
+        self._resolver = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="presign")
+            if self._pool is not None
+            else None
+        )
+
+        self._lock = threading.Lock()
+        self._presigned = OrderedDict()
+
+    @property
+    def can_presign(self) -> bool:
+        """Presigning only pays off when signatures are computed off the calling thread."""
+        return self._pool is not None
+
+    @staticmethod
+    def _key(order: dict) -> tuple:
+        return (
+            str(order["token_id"]),
+            order["side"],
+            float(order["price"]),
+            float(order["size"]),
+        )
+
+    def _options(self, order_args: OrderArgs) -> CreateOrderOptions:
+        token_id = order_args.token_id
+        tick_size = self.call(
+            "get_tick_size", "GET /tick-size", self.client.get_tick_size, token_id
+        )
+        if not price_valid(order_args.price, tick_size):
+            raise Exception(
+                f"price ({order_args.price}), min: {tick_size} - max: {1 - float(tick_size)}"
+            )
+        order_args.fee_rate_bps = self.call(
+            "get_fee_rate", "GET /fee-rate", self.client.get_fee_rate_bps, token_id
+        )
+        return CreateOrderOptions(
+            tick_size=tick_size,
+            neg_risk=self.call(
+                "get_neg_risk", "GET /neg-risk", self.client.get_neg_risk, token_id
+            ),
+        )
+
+    def _submit(self, order: dict) -> Future:
+        order_args = OrderArgs(
+            price=order["price"],
+            size=order["size"],
+            side=order["side"],
+            token_id=order["token_id"],
+        )
+        options = self._options(order_args)
+
+        if self._pool is not None:
+            future = self._pool.submit(_sign_order, order_args, options)
+        else:
+            future = Future()
+            start_time = time.perf_counter()
+            future.set_result(
+                (
+                    self._builder.create_order(order_args, options),
+                    time.perf_counter() - start_time,
+                )
+            )
+        future.add_done_callback(self._observe_signing_time)
+        return future
+
+    def _submit_later(self, order: dict) -> Future:
+        """`_submit` without waiting for the token options on the calling thread."""
+        future = Future()
+
+        def submit():
+            try:
+                self._submit(order).add_done_callback(
+                    lambda signing: _copy_outcome(signing, future)
+                )
+            except Exception as e:
+                future.set_exception(e)
+
+        if self._resolver is not None:
+            self._resolver.submit(submit)
+        else:
+            submit()
+        return future
+
+    @staticmethod
+    def _observe_signing_time(future: Future):
+        if future.exception() is None:
+            order_signing_time.observe(future.result()[1])
+
+    def presign(self, orders: list[dict]):
+        """Starts signing `orders` in the background and caches the results."""
+        for order in orders:
+            key = self._key(order)
+            with self._lock:
+                if key in self._presigned:
+                    self._presigned.move_to_end(key)
+                    continue
+            future = self._submit_later(order)
+            with self._lock:
+                self._presigned[key] = future
+                while len(self._presigned) > self.cache_size:
+                    self._presigned.popitem(last=False)
+
+    def sign_orders(self, orders: list[dict]) -> list:
+        """
+        Signs orders, reusing presigned ones when available.
+
+        Args:
+            orders: List of dicts with the `price`, `size`, `side` and `token_id` of each order.
+
+        Returns:
+            List aligned with `orders`, holding the signed order or `None` if signing failed.
+        """
+        futures = []
+        for order in orders:
+            with self._lock:
+                future = self._presigned.pop(self._key(order), None)
+            if future is not None:
+                order_signing_cache.labels(result="hit").inc()
+                futures.append(future)
+                continue
+
+            order_signing_cache.labels(result="miss").inc()
+            try:
+                futures.append(self._submit(order))
+            except Exception as e:
+                self.logger.error(f"Failed creating new order {order}: {e}")
+                futures.append(None)
+
+        signed_orders = []
+        for order, future in zip(orders, futures):
+            if future is None:
+                signed_orders.append(None)
+                continue
+            try:
+                signed_orders.append(future.result()[0])
+            except Exception as e:
+                self.logger.error(f"Failed signing new order {order}: {e}")
+                signed_orders.append(None)
+        return signed_orders
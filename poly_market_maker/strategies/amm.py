@@ -1,9 +1,14 @@
 import logging
+import threading
+from collections import OrderedDict
 from math import sqrt
 
+import numpy as np
+
+from poly_market_maker.metrics import amm_expected_orders_cache
 from poly_market_maker.token import Token, Collateral
 from poly_market_maker.order import Order, Side
-from poly_market_maker.utils import math_round_down
+from poly_market_maker.utils import math_round_down, math_round_down_array
 
 
 class AMMConfig:
@@ -30,6 +35,54 @@ class AMMConfig:
         self.depth = depth
         self.max_collateral = max_collateral
 
+    @property
+    def key(self) -> tuple:
+        return (
+            self.p_min,
+            self.p_max,
+            self.delta,
+            self.spread,
+            self.depth,
+            self.max_collateral,
+        )
+
+
+class ExpectedOrdersCache:
+    """Thread safe LRU cache of expected orders, shared by the AMM managers of all markets.
+
+    Attributes:
+        max_size: Maximum number of cached ladders, the least recently used are evicted.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        assert max_size > 0
+
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._orders = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def get(self, key: tuple) -> list[Order] | None:
+        with self._lock:
+            orders = self._orders.get(key)
+            if orders is not None:
+                self._orders.move_to_end(key)
+        amm_expected_orders_cache.labels(result="miss" if orders is None else "hit").inc()
+        return list(orders) if orders is not None else None
+
+    def put(self, key: tuple, orders: list[Order]):
+        with self._lock:
+            self._orders[key] = list(orders)
+            self._orders.move_to_end(key)
+            while len(self._orders) > self.max_size:
+                self._orders.popitem(last=False)
+
+
+expected_orders_cache = ExpectedOrdersCache()
+
 
 class AMM:
     def __init__(self, token: Token, config: AMMConfig):
@@ -53,62 +106,62 @@ class AMM:
         self.p_u = round(min(p_i + self.depth, self.p_max), 2)
         self.p_l = round(max(p_i - self.depth, self.p_min), 2)
 
-        self.buy_prices = []
-        price = round(self.p_i - self.spread, 2)
-        while price >= self.p_l:
-            self.buy_prices.append(price)
-            price = round(price - self.delta, 2)
+        self._buy_prices = self._ladder(round(self.p_i - self.spread, 2), self.p_l, -self.delta)
+        self._sell_prices = self._ladder(round(self.p_i + self.spread, 2), self.p_u, self.delta)
 
-        self.sell_prices = []
-        price = round(self.p_i + self.spread, 2)
-        while price <= self.p_u:
-            self.sell_prices.append(price)
-            price = round(price + self.delta, 2)
+    @property
+    def buy_prices(self) -> list[float]:
+        return self._buy_prices.tolist()
 
-    def get_sell_orders(self, x):
-        sizes = [
-            # round down to avoid too large orders
-            math_round_down(size, 2)
-            for size in self.diff([self.sell_size(x, p_t) for p_t in self.sell_prices])
-        ]
+    @property
+    def sell_prices(self) -> list[float]:
+        return self._sell_prices.tolist()
 
-        orders = [
-            Order(
-                price=price,
-                side=Side.SELL,
-                token=self.token,
-                size=size,
-            )
-            for (price, size) in zip(self.sell_prices, sizes)
-        ]
+    @staticmethod
+    def _ladder(start: float, bound: float, step: float) -> np.ndarray:
+        """
+        Prices from `start` to `bound` (included) by `step`, each rounded to 2 decimals
+        """
+        steps = round(step * 100)
+        if steps != 0 and steps == step * 100:
+            # whole cents: in integer cents the repeated rounding is exact
+            first = round(start * 100)
+            last = round(bound * 100)
+            return np.arange(first, last + (1 if steps > 0 else -1), steps) / 100
+
+        prices = []
+        price = start
+        while (price <= bound) if step > 0 else (price >= bound):
+            prices.append(price)
+            price = round(price + step, 2)
+        return np.array(prices, dtype=float)
 
-        return orders
+    def get_sell_orders(self, x):
+        if len(self._sell_prices) == 0:
+            return []
+        with np.errstate(divide="raise", invalid="raise"):
+            sizes = self.level_sizes(self.sell_size(x, self._sell_prices))
+        return self._orders(self._sell_prices, sizes, Side.SELL)
 
     def get_buy_orders(self, y):
-        sizes = [
-            # round down to avoid too large orders
-            math_round_down(size, 2)
-            for size in self.diff([self.buy_size(y, p_t) for p_t in self.buy_prices])
-        ]
-
-        orders = [
-            Order(
-                price=price,
-                side=Side.BUY,
-                token=self.token,
-                size=size,
-            )
-            for (price, size) in zip(self.buy_prices, sizes)
+        if len(self._buy_prices) == 0:
+            return []
+        with np.errstate(divide="raise", invalid="raise"):
+            sizes = self.level_sizes(self.buy_size(y, self._buy_prices))
+        return self._orders(self._buy_prices, sizes, Side.BUY)
+
+    def _orders(self, prices: np.ndarray, sizes: np.ndarray, side: Side) -> list[Order]:
+        return [
+            Order(price=price, side=side, token=self.token, size=size)
+            for (price, size) in zip(prices.tolist(), sizes.tolist())
         ]
 
-        return orders
-
     def phi(self):
-        if len(self.buy_prices) == 0:
+        if len(self._buy_prices) == 0:
             # Return default value when no buy prices available
             return 1.0
         return (1 / (sqrt(self.p_i) - sqrt(self.p_l))) * (
-            1 / sqrt(self.buy_prices[0]) - 1 / sqrt(self.p_i)
+            1 / sqrt(self._buy_prices[0]) - 1 / sqrt(self.p_i)
         )
 
     def sell_size(self, x, p_t):
@@ -116,8 +169,9 @@ class AMM:
 
     @staticmethod
     def _sell_size(x, p_i, p_t, p_u):
+        """Cumulative size to sell up to `p_t`, a price or an array of prices."""
         L = x / (1 / sqrt(p_i) - 1 / sqrt(p_u))
-        a = L / sqrt(p_u) - L / sqrt(p_t) + x
+        a = L / sqrt(p_u) - L / np.sqrt(p_t) + x
         return a
 
     def buy_size(self, y, p_t):
@@ -125,26 +179,50 @@ class AMM:
 
     @staticmethod
     def _buy_size(y, p_i, p_t, p_l):
+        """Cumulative size to buy down to `p_t`, a price or an array of prices."""
         L = y / (sqrt(p_i) - sqrt(p_l))
-        a = L * (1 / sqrt(p_t) - 1 / sqrt(p_i))
+        a = L * (1 / np.sqrt(p_t) - 1 / sqrt(p_i))
         return a
 
     @staticmethod
-    def diff(arr: list[float]) -> list[float]:
-        return [arr[i] if i == 0 else arr[i] - arr[i - 1] for i in range(len(arr))]
+    def level_sizes(cumulative_sizes: np.ndarray) -> np.ndarray:
+        """Size of each level from the cumulative ones, rounded down to avoid too large orders."""
+        return math_round_down_array(np.diff(cumulative_sizes, prepend=0.0), 2)
 
 
 class AMMManager:
-    def __init__(self, config: AMMConfig):
+    def __init__(self, config: AMMConfig, cache: ExpectedOrdersCache = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.amm_a = AMM(token=Token.A, config=config)
         self.amm_b = AMM(token=Token.B, config=config)
         self.max_collateral = config.max_collateral
+        self.config_key = config.key
+        self.cache = cache if cache is not None else expected_orders_cache
 
     def get_expected_orders(
         self,
         target_prices,
         balances,
+    ):
+        # prices already sit on the tick grid, balances are kept exact as they size the orders
+        key = (
+            self.config_key,
+            target_prices[Token.A],
+            target_prices[Token.B],
+            balances[Token.A],
+            balances[Token.B],
+            balances[Collateral],
+        )
+        orders = self.cache.get(key)
+        if orders is None:
+            orders = self._get_expected_orders(target_prices, balances)
+            self.cache.put(key, orders)
+        return orders
+
+    def _get_expected_orders(
+        self,
+        target_prices,
+        balances,
     ):
         self.amm_a.set_price(target_prices[Token.A])
         self.amm_b.set_price(target_prices[Token.B])
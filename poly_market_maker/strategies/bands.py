@@ -1,9 +1,12 @@
+import copy
 import itertools
 import logging
+from bisect import bisect_left
 
 from poly_market_maker.token import Token
 from poly_market_maker.constants import MIN_TICK, MIN_SIZE, MAX_DECIMALS
 from poly_market_maker.order import Order, Side
+from poly_market_maker.ticks import TICKS_PER_UNIT, from_ticks, to_ticks
 
 
 class Band:
@@ -50,11 +53,23 @@ class Band:
         is_last_band: bool,
     ) -> list[Order]:
         """Return orders which need to be cancelled to bring the total order amount in the band below maximum."""
-        self.logger.debug("Running excessive orders.")
         # Get all orders which are currently present in the band.
         orders_in_band = [
             order for order in orders if self.includes(order, target_price)
         ]
+        return self.excessive_orders_in_band(
+            orders_in_band, target_price, is_first_band, is_last_band
+        )
+
+    def excessive_orders_in_band(
+        self,
+        orders_in_band: list[Order],
+        target_price: float,
+        is_first_band: bool,
+        is_last_band: bool,
+    ) -> list[Order]:
+        """Same as `excessive_orders`, for orders already known to be in the band."""
+        self.logger.debug("Running excessive orders.")
         orders_total_size = sum(order.size for order in orders_in_band)
 
         # The sorting in which we remove orders depends on which band we are in.
@@ -100,8 +115,7 @@ class Band:
         if order.side == Side.BUY:
             price = order.price
         else:
-            # round to 6 decimals to avoid floating point issues
-            price = round(1 - order.price, MAX_DECIMALS)
+            price = from_ticks(TICKS_PER_UNIT - order.price_ticks)
 
         return (price > self.min_price(target_price)) and (
             price <= self.max_price(target_price)
@@ -123,6 +137,13 @@ class Band:
     def max_price(self, target_price: float) -> float:
         return self._apply_margin(target_price, self.min_margin)
 
+    @staticmethod
+    def buy_price_ticks(order: Order) -> int:
+        """Price of the order as the buy price of the band's token, in ticks."""
+        if order.side == Side.BUY:
+            return order.price_ticks
+        return TICKS_PER_UNIT - order.price_ticks
+
     def __repr__(self):
         return f"Band[spread<{self.min_margin}, {self.max_margin}>, amount<{self.min_amount}, {self.max_amount}>]"
 
@@ -130,6 +151,50 @@ class Band:
         return self.__repr__()
 
 
+class BandOrders:
+    """Orders of one token assigned to the virtual bands of a target price, in one pass.
+
+    Attributes:
+        bands: The virtual bands.
+        orders: The orders in each band, in the order they were given.
+        amounts: The total size of the orders in each band.
+        outside: The orders which are not in any band.
+    """
+
+    def __init__(self, bands: list[Band], orders: list[Order], target_price: float):
+        self.target_price = target_price
+        self.bands = bands
+        self.orders = [[] for _ in bands]
+        self.amounts = [0.0 for _ in bands]
+        self.outside = []
+
+        # a band holds the prices in (min_price, max_price], the bands do not overlap,
+        # so sorted by max_price each order's band is found by bisecting
+        ranges = sorted(
+            (
+                (
+                    to_ticks(band.max_price(target_price)),
+                    to_ticks(band.min_price(target_price)),
+                    i,
+                )
+                for (i, band) in enumerate(bands)
+            )
+        )
+        # a band narrower than a tick holds nothing and would shadow its neighbour
+        ranges = [(upper, lower, i) for (upper, lower, i) in ranges if lower < upper]
+        upper_bounds = [upper for (upper, _, _) in ranges]
+
+        for order in orders:
+            ticks = Band.buy_price_ticks(order)
+            k = bisect_left(upper_bounds, ticks)
+            if k < len(ranges) and ticks > ranges[k][1]:
+                i = ranges[k][2]
+                self.orders[i].append(order)
+                self.amounts[i] += order.size
+            else:
+                self.outside.append(order)
+
+
 class Bands:
     def __init__(self, bands_from_config: list[dict]):
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -159,43 +224,51 @@ class Bands:
         for band in self.bands:
             if band.max_price(target_price) > 0:
                 if band.buy_price(target_price) <= 0:
+                    # adjust a copy, the configured band serves other prices and tokens too
+                    band = copy.copy(band)
                     band.avg_margin = target_price - MIN_TICK
                 virtual_bands.append(band)
         return virtual_bands
 
-    def _excessive_orders(
-        self, orders: list[Order], bands: list[Band], target_price: float
-    ) -> list[Order]:
-        """Return orders which need to be cancelled to bring total amounts within all bands below maximums."""
+    def band_orders(self, orders: list[Order], target_price: float) -> BandOrders:
+        """
+        Assigns the orders to the virtual bands of the target price, to be shared by
+        `cancellable_orders` and `new_orders`.
+        """
         assert isinstance(orders, list)
-        assert isinstance(bands, list)
         assert isinstance(target_price, float)
 
-        for band in bands:
-            for order in band.excessive_orders(
-                orders,
-                target_price,
+        return BandOrders(
+            self._calculate_virtual_bands(target_price), orders, target_price
+        )
+
+    def _excessive_orders(self, band_orders: BandOrders) -> list[Order]:
+        """Return orders which need to be cancelled to bring total amounts within all bands below maximums."""
+        assert isinstance(band_orders, BandOrders)
+
+        bands = band_orders.bands
+        for band, orders_in_band in zip(bands, band_orders.orders):
+            for order in band.excessive_orders_in_band(
+                orders_in_band,
+                band_orders.target_price,
                 band == bands[0],  # is first
                 band == bands[-1],  # is last
             ):
                 yield order
 
-    def _outside_any_band_orders(
-        self, orders: list[Order], bands: list[Band], target_price: float
-    ) -> list[Order]:
+    def _outside_any_band_orders(self, band_orders: BandOrders) -> list[Order]:
         """Return buy or sell orders which need to be cancelled as they do not fall into any buy or sell band."""
-        assert isinstance(orders, list)
-        assert isinstance(bands, list)
-        assert isinstance(target_price, float)
+        assert isinstance(band_orders, BandOrders)
 
-        for order in orders:
-            if not any(band.includes(order, target_price) for band in bands):
-                self.logger.info(
-                    f"Order #{order.id} doesn't belong to any band, scheduling it for cancellation"
-                )
-                yield order
+        for order in band_orders.outside:
+            self.logger.info(
+                f"Order #{order.id} doesn't belong to any band, scheduling it for cancellation"
+            )
+            yield order
 
-    def cancellable_orders(self, orders: list, target_price: float) -> list:
+    def cancellable_orders(
+        self, orders: list, target_price: float, band_orders: BandOrders = None
+    ) -> list:
         assert isinstance(orders, list)
         assert isinstance(target_price, float)
 
@@ -204,18 +277,12 @@ class Bands:
             orders_to_cancel = orders
 
         else:
+            if band_orders is None:
+                band_orders = self.band_orders(orders, target_price)
             orders_to_cancel = list(
                 itertools.chain(
-                    self._excessive_orders(
-                        orders,
-                        self._calculate_virtual_bands(target_price),
-                        target_price,
-                    ),
-                    self._outside_any_band_orders(
-                        orders,
-                        self._calculate_virtual_bands(target_price),
-                        target_price,
-                    ),
+                    self._excessive_orders(band_orders),
+                    self._outside_any_band_orders(band_orders),
                 )
             )
 
@@ -228,17 +295,18 @@ class Bands:
         token_balance: float,
         target_price: float,
         buy_token: Token,
+        band_orders: BandOrders = None,
     ) -> list[Order]:
         assert isinstance(orders, list)
         assert isinstance(collateral_balance, float)
         assert isinstance(target_price, float)
 
+        if band_orders is None:
+            band_orders = self.band_orders(orders, target_price)
+
         sell_token = buy_token.complement()
         new_orders = []
-        for band in self._calculate_virtual_bands(target_price):
-            band_amount = sum(
-                order.size for order in orders if band.includes(order, target_price)
-            )
+        for band, band_amount in zip(band_orders.bands, band_orders.amounts):
 
             self.logger.debug(f"{band} has existing amount {band_amount},")
 
@@ -4,6 +4,7 @@ from poly_market_maker.orderbook import OrderBook
 
 from poly_market_maker.strategies.bands import Bands
 from poly_market_maker.strategies.base_strategy import BaseStrategy
+from poly_market_maker.strategies.order_diff import diff_orders
 
 
 class BandsStrategy(BaseStrategy):
@@ -34,13 +35,24 @@ class BandsStrategy(BaseStrategy):
             for token in Token:
                 self.logger.debug(f"{token.value} target price: {target_prices[token]}")
 
-            # cancel orders
+            # assign the orders to the bands once, for both cancelling and placing
+            orders_by_token = {}
+            band_orders_by_token = {}
             for token in Token:
                 orders = self._orders_by_corresponding_buy_token(orderbook.orders, token)
-                orders_to_cancel += self.bands.cancellable_orders(
+                orders_by_token[token] = orders
+                band_orders_by_token[token] = self.bands.band_orders(
                     orders, target_prices[token]
                 )
 
+            # cancel orders
+            for token in Token:
+                orders_to_cancel += self.bands.cancellable_orders(
+                    orders_by_token[token],
+                    target_prices[token],
+                    band_orders_by_token[token],
+                )
+
             # remaining open orders
             open_orders = list(set(orderbook.orders) - set(orders_to_cancel))
             balance_locked_by_open_buys = sum(
@@ -55,7 +67,7 @@ class BandsStrategy(BaseStrategy):
 
             # place orders
             for token in Token:
-                orders = self._orders_by_corresponding_buy_token(orderbook.orders, token)
+                orders = orders_by_token[token]
 
                 balance_locked_by_open_sells = sum(
                     order.size for order in orders if order.side == Side.SELL
@@ -77,6 +89,7 @@ class BandsStrategy(BaseStrategy):
                     free_token_balance,
                     target_prices[token],
                     token,
+                    band_orders_by_token[token],
                 )
                 free_collateral_balance -= sum(
                     order.size * order.price
@@ -84,6 +97,15 @@ class BandsStrategy(BaseStrategy):
                     if order.side == Side.BUY
                 )
                 orders_to_place += new_orders
+
+            # net out cancellations and placements on the same price level
+            cancelled = set(orders_to_cancel)
+            orders_to_keep = [
+                order for order in orderbook.orders if order not in cancelled
+            ]
+            (orders_to_cancel, orders_to_place) = diff_orders(
+                orders_to_keep + orders_to_place, list(orderbook.orders)
+            )
         except Exception as e:
             self.logger.error(f"Error generating Bands orders: {e}")
             # Return empty lists to prevent strategy crash
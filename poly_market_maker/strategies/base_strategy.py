@@ -17,3 +17,7 @@ class BaseStrategy:
         self, orderbook: OrderBook, token_prices
     ) -> Tuple[list[Order], list[Order]]:
         pass
+
+    def get_likely_orders(self, orderbook: OrderBook, token_prices) -> list[Order]:
+        """Orders which are likely to be placed in one of the next synchronizations."""
+        return []
@@ -0,0 +1,98 @@
+from poly_market_maker.constants import MIN_SIZE
+from poly_market_maker.order import Order
+from poly_market_maker.ticks import from_lots, to_lots
+
+
+def level(order: Order) -> tuple:
+    """Key of the price level an order rests on."""
+    return (order.token, order.side, order.price_ticks)
+
+
+def diff_level(
+    expected_size: float, open_orders: list[Order], min_size: float = MIN_SIZE
+) -> tuple[list[Order], float]:
+    """
+    Matches the open orders of a single price level against the size expected on it.
+
+    Resting orders are kept, oldest first, as long as they fit in the expected size, so
+    the level keeps its queue priority and only the shortfall is placed.
+
+    Args:
+        expected_size: Total size the level should hold.
+        open_orders: Open orders on the level, oldest first.
+        min_size: Smallest size which can be placed.
+
+    Returns:
+        Tuple of the orders to cancel and the size to place, `0` if nothing needs to be placed.
+    """
+    # sizes are matched in whole lots, so sums do not accumulate float errors
+    expected_lots = to_lots(expected_size)
+    orders_to_cancel = []
+    kept_lots = 0
+    for order in open_orders:
+        if kept_lots + order.size_lots <= expected_lots:
+            kept_lots += order.size_lots
+        else:
+            orders_to_cancel.append(order)
+
+    new_size = from_lots(expected_lots - kept_lots)
+    return (orders_to_cancel, new_size if new_size >= min_size else 0.0)
+
+
+def diff_orders(
+    expected_orders: list[Order], open_orders: list[Order], min_size: float = MIN_SIZE
+) -> tuple[list[Order], list[Order]]:
+    """
+    Computes the minimal set of cancellations and placements turning `open_orders` into
+    `expected_orders`.
+
+    Both sides are grouped by (token, side, price) level into dicts in a single pass, so
+    the diff takes O(n). Expected sizes on a level are summed, every open order on a level
+    which is not expected is cancelled.
+
+    Args:
+        expected_orders: The desired ladder.
+        open_orders: The live orders, oldest first.
+        min_size: Smallest size which can be placed.
+
+    Returns:
+        Tuple of the orders to cancel and the orders to place, placements in ladder order.
+    """
+    # level -> (first expected order, total lots expected on the level)
+    expected_levels = {}
+    for order in expected_orders:
+        key = level(order)
+        expected = expected_levels.get(key)
+        expected_levels[key] = (
+            (order, order.size_lots)
+            if expected is None
+            else (expected[0], expected[1] + order.size_lots)
+        )
+
+    # level -> open orders on it, oldest first
+    open_levels = {}
+    for order in open_orders:
+        open_levels.setdefault(level(order), []).append(order)
+
+    orders_to_cancel = []
+    orders_to_place = []
+    for key, (expected, lots) in expected_levels.items():
+        (cancel, new_size) = diff_level(
+            from_lots(lots), open_levels.pop(key, []), min_size
+        )
+        orders_to_cancel += cancel
+        if new_size > 0:
+            orders_to_place.append(
+                Order(
+                    price=expected.price,
+                    size=new_size,
+                    side=expected.side,
+                    token=expected.token,
+                )
+            )
+
+    # whatever is left rests on levels which are not expected at all
+    for resting in open_levels.values():
+        orders_to_cancel += resting
+
+    return (orders_to_cancel, orders_to_place)
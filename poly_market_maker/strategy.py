@@ -2,10 +2,12 @@ from enum import Enum
 import json
 import logging
 
+from poly_market_maker.deadline import deadline_after
 from poly_market_maker.orderbook import OrderBookManager
 from poly_market_maker.price_feed import PriceFeed
 from poly_market_maker.token import Token, Collateral
 from poly_market_maker.constants import MAX_DECIMALS
+from poly_market_maker.ticks import TICKS_PER_UNIT, from_ticks, to_ticks
 
 from poly_market_maker.strategies.base_strategy import BaseStrategy
 from poly_market_maker.strategies.amm_strategy import AMMStrategy
@@ -32,6 +34,8 @@ class StrategyManager:
         config_path: str,
         price_feed: PriceFeed,
         order_book_manager: OrderBookManager,
+        max_price_age: float = None,
+        sync_deadline: float = None,
     ) -> BaseStrategy:
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -47,6 +51,13 @@ class StrategyManager:
 
         self.price_feed = price_feed
         self.order_book_manager = order_book_manager
+        # prices older than this (in seconds) are not quoted on
+        self.max_price_age = max_price_age
+        # every request of a synchronization, including the placements and cancellations
+        # it queues, has to complete within this (in seconds)
+        self.sync_deadline = sync_deadline
+        # (order book version, token prices) of the last synchronization
+        self._last_synchronized = None
 
         try:
             match Strategy(strategy):
@@ -60,6 +71,10 @@ class StrategyManager:
             raise Exception(f"Error initializing {strategy} strategy: {e}")
 
     def synchronize(self):
+        with deadline_after(self.sync_deadline):
+            self._synchronize()
+
+    def _synchronize(self):
         self.logger.debug("Synchronizing strategy...")
 
         try:
@@ -69,7 +84,17 @@ class StrategyManager:
             return
 
         token_prices = self.get_token_prices()
+        if token_prices is None:
+            return
         self.logger.debug(f"{token_prices}")
+
+        if self._last_synchronized == (orderbook.version, token_prices):
+            self.logger.debug(
+                f"Order book (version {orderbook.version}) and prices unchanged, nothing to do"
+            )
+            return
+        self._last_synchronized = (orderbook.version, token_prices)
+
         (orders_to_cancel, orders_to_place) = self.strategy.get_orders(
             orderbook, token_prices
         )
@@ -79,24 +104,37 @@ class StrategyManager:
 
         self.cancel_orders(orders_to_cancel)
         self.place_orders(orders_to_place)
+        if self.order_book_manager.can_presign:
+            self.order_book_manager.presign_orders(
+                self.strategy.get_likely_orders(orderbook, token_prices)
+            )
 
         self.logger.debug("Synchronized strategy!")
 
     def get_order_book(self):
         orderbook = self.order_book_manager.get_order_book()
 
-        if None in orderbook.balances.values():
+        if orderbook.balances is None or None in orderbook.balances.values():
             self.logger.debug("Balances invalid/non-existent")
             raise Exception("Balances invalid/non-existent")
 
         return orderbook
 
     def get_token_prices(self):
-        price_a = round(
-            self.price_feed.get_price(Token.A),
-            MAX_DECIMALS,
-        )
-        price_b = round(1 - price_a, MAX_DECIMALS)
+        price_a = self.price_feed.get_price(Token.A)
+        if price_a is None:
+            self.logger.warning("No price available, not quoting")
+            return None
+
+        price_age = self.price_feed.get_price_age(Token.A)
+        if self.max_price_age is not None and (
+            price_age is None or price_age > self.max_price_age
+        ):
+            self.logger.warning(f"Price is {price_age}s old, not quoting on stale data")
+            return None
+
+        price_a = round(price_a, MAX_DECIMALS)
+        price_b = from_ticks(TICKS_PER_UNIT - to_ticks(price_a))
         return {Token.A: price_a, Token.B: price_b}
 
     def cancel_orders(self, orders_to_cancel):
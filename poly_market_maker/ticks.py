@@ -0,0 +1,25 @@
+from poly_market_maker.constants import MAX_DECIMALS, MIN_TICK
+
+# prices are counted in ticks and sizes in lots, the smallest increments the CLOB accepts.
+# Integers compare, hash and add exactly, floats are only needed at the CLOB boundary.
+TICKS_PER_UNIT = round(1 / MIN_TICK)
+LOTS_PER_UNIT = 10**MAX_DECIMALS
+
+
+def to_ticks(price: float) -> int:
+    """Number of ticks in `price`, rounded to the nearest tick."""
+    return round(price * TICKS_PER_UNIT)
+
+
+def from_ticks(ticks: int) -> float:
+    # a correctly rounded division, so e.g. 41 ticks are exactly 0.41
+    return ticks / TICKS_PER_UNIT
+
+
+def to_lots(size: float) -> int:
+    """Number of lots in `size`, rounded to the nearest lot."""
+    return round(size * LOTS_PER_UNIT)
+
+
+def from_lots(lots: int) -> float:
+    return lots / LOTS_PER_UNIT
@@ -0,0 +1,253 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from poly_market_maker.deadline import DeadlineExceeded, remaining_time
+from poly_market_maker.metrics import transport_connections, transport_request_latency
+from poly_market_maker.rate_limiter import TokenBucket
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "cross-site",
+    "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"macOS"',
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+POST_HEADERS = {
+    "Origin": "https://polymarket.com",
+    "Referer": "https://polymarket.com/",
+    "Content-Type": "application/json",
+}
+
+# Per-host (sustained requests per second, burst) pairs. The CLOB's general limit
+# covers every endpoint, the per-endpoint ones are enforced by ClobApi.
+HOST_RATE_LIMITS = {
+    "clob.polymarket.com": (500.0, 5000),
+}
+
+# the original `requests.Session.request`, which `install` replaces
+_session_request = requests.Session.request
+
+
+class _HostSession(requests.Session):
+    """Session bound to a single host, never routed back through the transport."""
+
+    def request(self, method, url, **kwargs):
+        return _session_request(self, method, url, **kwargs)
+
+
+class Transport:
+    """Pooled HTTP transport shared by everything talking to the CLOB and other HTTP APIs.
+
+    Every host gets its own session with a tuned connection pool. Requests are given the
+    browser headers (without overriding the caller's ones), are paced by a per-host token
+    bucket which also honours `Retry-After` on 429s, and report per-host latency and
+    connection reuse.
+
+    Requests without an explicit timeout get `timeout`, shortened to whatever is left of
+    the current deadline (see `deadline_after`).
+
+    Attributes:
+        pool_maxsize: Maximum number of connections kept open per host.
+        host_limits: Per-host (rate, burst) pairs, hosts without one are not paced.
+        timeout: Default timeout (in seconds) of every request.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 32,
+        host_limits: dict[str, tuple[float, float]] = HOST_RATE_LIMITS,
+        timeout: float = 10.0,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert isinstance(pool_maxsize, int)
+
+        self.pool_maxsize = pool_maxsize
+        self.host_limits = dict(host_limits)
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._buckets = {}
+        self._paused_until = {}
+        self._connections_seen = {}
+        self._installed = False
+
+    @staticmethod
+    def headers_for(method: str, headers: dict = None) -> dict:
+        """The browser headers for `method`, overridden by `headers`."""
+        merged = dict(BROWSER_HEADERS)
+        if method.upper() == "POST":
+            merged.update(POST_HEADERS)
+        merged.update(headers or {})
+        return merged
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request through the host's session, see `requests.Session.request`."""
+        host = urlsplit(url).hostname or ""
+        kwargs["headers"] = self.headers_for(method, kwargs.get("headers"))
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout(f"{method} {url}")
+
+        session = self._session(host)
+        self._pace(host)
+
+        start_time = time.monotonic()
+        status = "error"
+        try:
+            response = session.request(method, url, **kwargs)
+            status = str(response.status_code)
+            if response.status_code == 429:
+                self._pause(host, response.headers.get("Retry-After"))
+            return response
+        finally:
+            transport_request_latency.labels(
+                host=host, method=method.upper(), status=status
+            ).observe(time.monotonic() - start_time)
+            self._observe_connections(session, url, host)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def clob_request(self, endpoint: str, method: str, headers=None, data=None):
+        """Drop-in for `py_clob_client.http_helpers.helpers.request`."""
+        from py_clob_client.exceptions import PolyApiException
+
+        headers = dict(headers or {})
+        headers.setdefault("Content-Type", "application/json")
+        if isinstance(data, str):
+            # pre-serialized body, the exact bytes are signed
+            kwargs = {"data": data.encode("utf-8")}
+        else:
+            kwargs = {"json": data}
+
+        try:
+            resp = self.request(method, endpoint, headers=headers, **kwargs)
+        except requests.Timeout:
+            # left as is, so that callers can tell a timeout from a failure
+            raise
+        except requests.RequestException:
+            raise PolyApiException(error_msg="Request exception!")
+
+        if resp.status_code != 200:
+            raise PolyApiException(resp)
+        try:
+            return resp.json()
+        except ValueError:
+            return resp.text
+
+    def install(self):
+        """Routes `requests` and the CLOB client through this transport. Idempotent."""
+        with self._lock:
+            if self._installed:
+                return
+            self._installed = True
+
+        transport = self
+
+        def session_request(session, method, url, **kwargs):
+            kwargs["headers"] = transport.headers_for(method, kwargs.get("headers"))
+            return _session_request(session, method, url, **kwargs)
+
+        requests.Session.request = session_request
+        requests.request = self.request
+        requests.get = self.get
+        requests.post = self.post
+
+        try:
+            import py_clob_client.http_helpers.helpers as helpers
+
+            helpers.request = self.clob_request
+        except ImportError:
+            self.logger.warning("py_clob_client is not available, not routing it")
+
+    def _timeout(self, request: str) -> float:
+        remaining = remaining_time()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before {request}")
+        return min(self.timeout, remaining)
+
+    def _session(self, host: str) -> requests.Session:
+        session = self._sessions.get(host)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = _HostSession()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                limit = self.host_limits.get(host)
+                if limit is not None:
+                    self._buckets[host] = TokenBucket(*limit)
+        return session
+
+    def _pace(self, host: str):
+        paused_until = self._paused_until.get(host)
+        if paused_until is not None:
+            delay = paused_until - time.monotonic()
+            if delay > 0:
+                self.logger.warning(f"{host} is rate limiting us, waiting {delay:.1f}s")
+                time.sleep(delay)
+
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.acquire()
+
+    def _pause(self, host: str, retry_after: str | None):
+        delay = 1.0
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+        self._paused_until[host] = time.monotonic() + max(delay, 0.0)
+
+    def _observe_connections(self, session: requests.Session, url: str, host: str):
+        try:
+            pools = session.get_adapter(url).poolmanager.pools
+            # the session only talks to `host`, so all of its pools are that host's
+            opened_total = sum(pools[key].num_connections for key in pools.keys())
+        except Exception:
+            return
+
+        with self._lock:
+            opened = opened_total - self._connections_seen.get(host, 0)
+            self._connections_seen[host] = opened_total
+        if opened > 0:
+            transport_connections.labels(host=host, connection="new").inc(opened)
+        else:
+            transport_connections.labels(host=host, connection="reused").inc()
+
+
+# shared by the whole process, so every caller draws from the same per-host pools
+transport = Transport()
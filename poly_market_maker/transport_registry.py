@@ -0,0 +1,253 @@
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+DEFAULT_HEALTH_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "poly-market-maker", "transport_health.json"
+)
+
+
+class TransportCandidate:
+    """A way of reaching the CLOB, e.g. through a residential proxy.
+
+    Attributes:
+        name: Key of the candidate in the health cache.
+        install: Routes the CLOB client through the candidate, returns whether it succeeded.
+        probe: Checks that the candidate works, `None` if there is nothing to check.
+        configured: Whether the candidate can be used at all, e.g. has credentials.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        install: Callable[[], bool],
+        probe: Callable[[], bool] = None,
+        configured: Callable[[], bool] = None,
+    ):
+        assert callable(install)
+
+        self.name = name
+        self.install = install
+        self.probe = probe
+        self.configured = configured or (lambda: True)
+
+
+class TransportRegistry:
+    """Selects and installs the transport to reach the CLOB with, on first use.
+
+    Candidates are tried in order of preference. Probing a proxy takes live requests,
+    so every probe's outcome and latency is persisted and reused for `ttl` seconds:
+    a candidate known to be healthy is installed without being probed again, one known
+    to be failing is skipped.
+    """
+
+    def __init__(
+        self,
+        candidates: list[TransportCandidate],
+        cache_path: str = DEFAULT_HEALTH_CACHE_PATH,
+        ttl: float = 3600.0,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.candidates = candidates
+        self.cache_path = cache_path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._selected = None
+        self._installed = False
+
+    @property
+    def selected(self) -> str | None:
+        """Name of the installed transport, `None` until `install` found one."""
+        return self._selected
+
+    def install(self) -> str | None:
+        """
+        Installs the first working candidate, unless one already was. Idempotent.
+
+        Returns:
+            The name of the installed candidate, `None` if none works.
+        """
+        with self._lock:
+            if self._installed:
+                return self._selected
+            self._installed = True
+
+            health = self._read_health()
+            for candidate in self.candidates:
+                if not candidate.configured():
+                    continue
+                if not self._healthy(candidate, health):
+                    continue
+
+                try:
+                    installed = candidate.install()
+                except Exception as e:
+                    self.logger.error(f"Failed to install the {candidate.name} transport: {e}")
+                    installed = False
+                if installed:
+                    self.logger.info(f"Using the {candidate.name} transport")
+                    self._selected = candidate.name
+                    break
+                health[candidate.name] = {"healthy": False, "checked_at": time.time()}
+                self._write_health(health)
+
+            if self._selected is None:
+                self.logger.warning(
+                    "No transport available, POST requests will likely fail!"
+                )
+            return self._selected
+
+    def _healthy(self, candidate: TransportCandidate, health: dict) -> bool:
+        if candidate.probe is None:
+            return True
+
+        cached = health.get(candidate.name)
+        if cached is not None and time.time() - cached.get("checked_at", 0) < self.ttl:
+            self.logger.debug(f"Using the cached health of {candidate.name}: {cached}")
+            return bool(cached.get("healthy"))
+
+        start_time = time.monotonic()
+        try:
+            healthy = bool(candidate.probe())
+        except Exception as e:
+            self.logger.error(f"Probing the {candidate.name} transport failed: {e}")
+            healthy = False
+        latency = time.monotonic() - start_time
+        self.logger.info(
+            f"{candidate.name} transport is {'healthy' if healthy else 'failing'} ({latency:.2f}s)"
+        )
+
+        health[candidate.name] = {
+            "healthy": healthy,
+            "latency": latency,
+            "checked_at": time.time(),
+        }
+        self._write_health(health)
+        return healthy
+
+    def _read_health(self) -> dict:
+        try:
+            with open(self.cache_path) as fh:
+                health = json.load(fh)
+            return health if isinstance(health, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable transport health cache: {e}")
+            return {}
+
+    def _write_health(self, health: dict):
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            with open(tmp_path, "w") as fh:
+                json.dump(health, fh)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write the transport health cache: {e}")
+
+
+def _importable(module: str) -> bool:
+    try:
+        importlib.import_module(module)
+        return True
+    except ImportError:
+        return False
+
+
+def _residential_proxy(
+    name: str,
+    module: str,
+    cls: str,
+    instance: str,
+    username_env: str,
+    password_env: str,
+    endpoint: str,
+) -> TransportCandidate:
+    """Candidate for one of the residential proxy integrations next to the package."""
+    proxies = []
+
+    def proxy():
+        if len(proxies) == 0:
+            integration = importlib.import_module(module)
+            proxies.append(
+                getattr(integration, cls)(
+                    os.getenv(username_env), os.getenv(password_env), endpoint
+                )
+            )
+            # the integration's own accessor, e.g. `get_oxylabs_proxy`, keeps working
+            setattr(integration, instance, proxies[0])
+        return proxies[0]
+
+    def configured() -> bool:
+        return bool(os.getenv(username_env) and os.getenv(password_env)) and _importable(
+            module
+        )
+
+    return TransportCandidate(
+        name,
+        install=lambda: proxy().patch_py_clob_client(),
+        probe=lambda: proxy().test_connection(),
+        configured=configured,
+    )
+
+
+def _install_pooled_transport() -> bool:
+    from poly_market_maker.transport import transport
+
+    transport.install()
+    return True
+
+
+def _probe_flaresolverr() -> bool:
+    import requests
+
+    return requests.get("http://localhost:8191", timeout=5).status_code == 200
+
+
+def _install_flaresolverr() -> bool:
+    from flaresolverr_integration import CloudflareBypassMonkeyPatch
+
+    CloudflareBypassMonkeyPatch().apply_patch()
+    return True
+
+
+transport_registry = TransportRegistry(
+    [
+        _residential_proxy(
+            "smartproxy",
+            "smartproxy_integration",
+            "SmartProxy",
+            "_smartproxy",
+            "SMARTPROXY_USERNAME",
+            "SMARTPROXY_PASSWORD",
+            "gate.decodo.com:10001",
+        ),
+        _residential_proxy(
+            "oxylabs",
+            "oxylabs_proxy",
+            "OxylabsProxy",
+            "_oxylabs_proxy",
+            "OXYLABS_USERNAME",
+            "OXYLABS_PASSWORD",
+            "residential.oxylabs.io:8001",
+        ),
+        TransportCandidate("pooled", install=_install_pooled_transport),
+        # only reached if the pooled transport could not be installed
+        TransportCandidate(
+            "flaresolverr",
+            install=_install_flaresolverr,
+            probe=_probe_flaresolverr,
+            configured=lambda: _importable("flaresolverr_integration"),
+        ),
+    ],
+    cache_path=os.getenv("TRANSPORT_HEALTH_CACHE", DEFAULT_HEALTH_CACHE_PATH),
+)
@@ -0,0 +1,99 @@
+import logging
+from collections.abc import Callable
+
+from py_clob_client.clob_types import ApiCreds
+
+from poly_market_maker.market import Market
+from poly_market_maker.order import Order, Side
+from poly_market_maker.orderbook import OrderBookManager
+from poly_market_maker.websocket_stream import WebsocketStream
+
+USER_CHANNEL_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+
+# trade statuses after which the onchain balances are final
+SETTLED_TRADE_STATUSES = {"CONFIRMED", "FAILED"}
+
+
+class UserStream:
+    """Applies the CLOB user channel (order updates and trades) to the order book manager.
+
+    Order placements, partial fills and cancellations update the open orders and balances as
+    they happen. Trades which settle, or fail to, ask for a refresh so the balances are
+    reconciled with the chain.
+    """
+
+    def __init__(
+        self,
+        market: Market,
+        get_api_creds: Callable[[], ApiCreds],
+        order_book_manager: OrderBookManager,
+        url: str = USER_CHANNEL_URL,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        assert isinstance(market, Market)
+        assert callable(get_api_creds)
+        assert isinstance(order_book_manager, OrderBookManager)
+
+        self.market = market
+        # read on every connection, the credentials are renewed if the CLOB rejects them
+        self.get_api_creds = get_api_creds
+        self.order_book_manager = order_book_manager
+        self.stream = WebsocketStream(
+            name="user",
+            url=url,
+            subscription=self._subscription,
+            on_message=self.handle_message,
+            on_connection=self.order_book_manager.stream_connected,
+            market=market.condition_id,
+        )
+
+    def start(self):
+        self.stream.start()
+
+    def stop(self):
+        self.stream.stop()
+
+    def _subscription(self) -> dict:
+        api_creds = self.get_api_creds()
+        return {
+            "auth": {
+                "apiKey": api_creds.api_key,
+                "secret": api_creds.api_secret,
+                "passphrase": api_creds.api_passphrase,
+            },
+            "markets": [self.market.condition_id],
+            "type": "user",
+        }
+
+    def handle_message(self, message: dict):
+        event_type = message.get("event_type")
+        if event_type == "order":
+            self._handle_order(message)
+        elif event_type == "trade":
+            self._handle_trade(message)
+
+    def _handle_order(self, message: dict):
+        order_id = message["id"]
+        if message.get("type") == "CANCELLATION":
+            self.logger.debug(f"Order #{order_id} was cancelled")
+            self.order_book_manager.apply_order_cancellation(order_id)
+            return
+
+        original_size = float(message["original_size"])
+        size_matched = float(message.get("size_matched") or 0.0)
+        order = Order(
+            size=round(original_size - size_matched, 6),
+            price=float(message["price"]),
+            side=Side(message["side"]),
+            token=self.market.token(int(message["asset_id"])),
+            id=order_id,
+        )
+        self.logger.debug(f"Order update ({message.get('type')}): {order}")
+        self.order_book_manager.apply_order_update(order, size_matched)
+
+    def _handle_trade(self, message: dict):
+        status = message.get("status")
+        self.logger.debug(f"Trade #{message.get('id')} is {status}")
+        if status in SETTLED_TRADE_STATUSES:
+            self.order_book_manager.refresh_soon()
@@ -2,6 +2,7 @@ import logging
 import math
 import os
 import random
+import numpy as np
 import yaml
 from logging import config
 from web3 import Web3
@@ -63,20 +64,55 @@ def setup_web3(rpc_url, private_key):
     return w3
 
 
-def math_round_down(f: float, sig_digits: int) -> float:
+# floats print positionally from 1e-4, and below 2**44 scaling them is off by far less
+# than half a unit, so their printed decimals can be told from the scaled value
+_MIN_POSITIONAL = 1e-4
+_MAX_SCALED = float(2**44)
+
+
+def _has_sig_digits(f: float, sig_digits: int, scaled: float, scale: int) -> bool:
+    """Whether `f` prints with exactly `sig_digits` decimals."""
+    if _MIN_POSITIONAL <= abs(f) and abs(scaled) < _MAX_SCALED:
+        # tested arithmetically, printing floats is slow
+        nearest = round(scaled)
+        return nearest / scale == f and nearest % 10 != 0
     str_f = str(f).split(".")
-    if len(str_f) > 1 and len(str_f[1]) == sig_digits:
+    return len(str_f) > 1 and len(str_f[1]) == sig_digits
+
+
+def math_round_down(f: float, sig_digits: int) -> float:
+    scale = 10**sig_digits
+    scaled = f * scale
+    if _has_sig_digits(f, sig_digits, scaled, scale):
         # don't round values which are already the number of sig_digits
         return f
-    return math.floor((f * (10**sig_digits))) / (10**sig_digits)
+    return math.floor(scaled) / scale
+
+
+def math_round_down_array(values: np.ndarray, sig_digits: int) -> np.ndarray:
+    """`math_round_down` of every value, bit for bit."""
+    assert sig_digits > 0
+
+    scale = 10**sig_digits
+    scaled = values * scale
+    nearest = np.rint(scaled)
+    # the values `math_round_down` leaves as they are: printed with exactly sig_digits decimals
+    exact = (nearest / scale == values) & (nearest % 10 != 0)
+    rounded = np.where(exact, values, np.floor(scaled) / scale)
+
+    outside = (np.abs(values) < _MIN_POSITIONAL) | (np.abs(scaled) >= _MAX_SCALED)
+    if outside.any():
+        rounded[outside] = [math_round_down(f, sig_digits) for f in values[outside]]
+    return rounded
 
 
 def math_round_up(f: float, sig_digits: int) -> float:
-    str_f = str(f).split(".")
-    if len(str_f) > 1 and len(str_f[1]) == sig_digits:
+    scale = 10**sig_digits
+    scaled = f * scale
+    if _has_sig_digits(f, sig_digits, scaled, scale):
         # don't round values which are already the number of sig_digits
         return f
-    return math.ceil((f * (10**sig_digits))) / (10**sig_digits)
+    return math.ceil(scaled) / scale
 
 
 def add_randomness(price: float, lower: float, upper: float) -> float:
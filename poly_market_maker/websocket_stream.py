@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+
+import websockets
+
+from poly_market_maker.metrics import (
+    websocket_connected,
+    websocket_messages,
+    websocket_reconnects,
+)
+
+
+class WebsocketStream:
+    """Consumes a JSON websocket in a background thread, reconnecting whenever it drops.
+
+    Attributes:
+        name: Name of the stream, used in logs and metrics.
+        url: Websocket url.
+        subscription: Function returning the message(s) sent right after connecting.
+        on_message: Function called, on the stream thread, with every decoded message.
+        on_connection: Optional function called with `True` once subscribed and with `False`
+            when the connection is lost.
+        ping_interval: Interval (in seconds) of the `PING` keepalive messages.
+        max_reconnect_delay: Longest delay (in seconds) the reconnection backs off to.
+        market: Condition id of the market the stream follows, labelling the metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        subscription: Callable[[], dict | list[dict]],
+        on_message: Callable[[dict], None],
+        on_connection: Callable[[bool], None] = None,
+        ping_interval: float = 10.0,
+        max_reconnect_delay: float = 30.0,
+        market: str = "",
+    ):
+        self.logger = logging.getLogger(f"{self.__class__.__name__}[{name}]")
+
+        assert isinstance(url, str)
+        assert isinstance(market, str)
+        assert callable(subscription)
+        assert callable(on_message)
+        if on_connection is not None:
+            assert callable(on_connection)
+
+        self.name = name
+        self.url = url
+        self.subscription = subscription
+        self.on_message = on_message
+        self.on_connection = on_connection
+        self.ping_interval = ping_interval
+        self.max_reconnect_delay = max_reconnect_delay
+        self.market = market
+
+        self.connected = False
+        self.last_message_time = None
+
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def start(self):
+        """Starts consuming the stream in a daemon thread."""
+        assert self._thread is None
+
+        self._thread = threading.Thread(
+            target=self._thread_run, name=f"ws-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Closes the connection and waits for the stream thread to exit."""
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def message_age(self) -> float | None:
+        """Time (in seconds) since the last message, `None` if nothing was received yet."""
+        if self.last_message_time is None:
+            return None
+        return time.monotonic() - self.last_message_time
+
+    def _thread_run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._task = self._loop.create_task(self._run())
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._set_connected(False)
+            self._loop.close()
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as websocket:
+                    messages = self.subscription()
+                    for message in messages if isinstance(messages, list) else [messages]:
+                        await websocket.send(json.dumps(message))
+                    self.logger.info(f"Subscribed to {self.url}")
+                    self._set_connected(True)
+                    delay = 1.0
+
+                    keepalive = asyncio.ensure_future(self._keepalive(websocket))
+                    try:
+                        async for raw_message in websocket:
+                            self._dispatch(raw_message)
+                    finally:
+                        keepalive.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Websocket connection failed ({e})")
+
+            self._set_connected(False)
+            websocket_reconnects.labels(stream=self.name, market=self.market).inc()
+            # jitter keeps several keepers from reconnecting in lockstep
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _keepalive(self, websocket):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send("PING")
+
+    def _dispatch(self, raw_message: str):
+        self.last_message_time = time.monotonic()
+        if raw_message == "PONG":
+            return
+
+        try:
+            decoded = json.loads(raw_message)
+        except ValueError:
+            self.logger.warning(f"Ignoring malformed message: {raw_message}")
+            return
+
+        for message in decoded if isinstance(decoded, list) else [decoded]:
+            websocket_messages.labels(stream=self.name, market=self.market).inc()
+            try:
+                self.on_message(message)
+            except Exception as e:
+                self.logger.exception(f"Failed to handle message {message}: {e}")
+
+    def _set_connected(self, connected: bool):
+        if connected == self.connected:
+            return
+
+        self.connected = connected
+        websocket_connected.labels(stream=self.name, market=self.market).set(
+            1 if connected else 0
+        )
+        if self.on_connection is not None:
+            try:
+                self.on_connection(connected)
+            except Exception as e:
+                self.logger.exception(f"Connection callback failed: {e}")
@@ -61,3 +61,23 @@ class TestAMM(TestCase):
             sell_prices,
             [0.55, 0.56, 0.57, 0.58, 0.59, 0.60],
         )
+
+    def test_ladder_off_the_cent_grid(self):
+        config = AMMConfig(
+            p_min=0.05,
+            p_max=0.95,
+            delta=0.015,
+            depth=0.1,
+            spread=0.013,
+            max_collateral=200.0,
+        )
+        amm = AMM(self.token, config)
+        amm.set_price(0.5)
+
+        # every step is rounded to 2 decimals, like the price ladder always was
+        self.assertEqual(amm.buy_prices, [0.49, 0.47, 0.45, 0.43, 0.41])
+        self.assertEqual(amm.sell_prices, [0.51, 0.53, 0.55, 0.57, 0.58, 0.59, 0.6])
+        self.assertEqual(
+            [order.size for order in amm.get_sell_orders(100)],
+            [11.3, 21.64, 20.45, 19.36, 9.3, 9.06, 8.84],
+        )
@@ -1,6 +1,10 @@
 from unittest import TestCase
 
-from poly_market_maker.strategies.amm import AMMManager, AMMConfig
+from poly_market_maker.strategies.amm import (
+    AMMManager,
+    AMMConfig,
+    ExpectedOrdersCache,
+)
 from poly_market_maker.order import Side
 from poly_market_maker.token import Token, Collateral
 
@@ -81,3 +85,46 @@ class TestAMMManager(TestCase):
 
     #     target_prices = {Token.A: 0.5, Token.B: 0.5}
     #     orders = amm_manager.get_expected_orders(target_prices, self.balances)
+
+    def test_expected_orders_cache(self):
+        cache = ExpectedOrdersCache(max_size=2)
+        amm_manager = AMMManager(self.config, cache=cache)
+        target_prices = {Token.A: 0.4, Token.B: 0.6}
+
+        orders = amm_manager.get_expected_orders(target_prices, self.balances)
+        amm_manager.amm_a = amm_manager.amm_b = None  # a hit skips the AMM math
+        cached_orders = amm_manager.get_expected_orders(target_prices, self.balances)
+        self.assertEqual(cached_orders, orders)
+        self.assertIsNot(cached_orders, orders)
+
+        # same inputs under another config are not shared
+        other_config = AMMConfig(
+            p_min=0.05,
+            p_max=0.95,
+            delta=0.01,
+            spread=0.02,
+            depth=0.05,
+            max_collateral=200.0,
+        )
+        other_orders = AMMManager(other_config, cache=cache).get_expected_orders(
+            target_prices, self.balances
+        )
+        self.assertNotEqual(other_orders, orders)
+        self.assertEqual(len(cache), 2)
+
+    def test_expected_orders_cache_eviction(self):
+        cache = ExpectedOrdersCache(max_size=2)
+        amm_manager = AMMManager(self.config, cache=cache)
+
+        for price in [0.4, 0.5, 0.6]:
+            amm_manager.get_expected_orders(
+                {Token.A: price, Token.B: round(1 - price, 2)}, self.balances
+            )
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(
+            cache.get((self.config.key, 0.4, 0.6, 1000, 1000, 1000))
+        )
+        self.assertIsNotNone(
+            cache.get((self.config.key, 0.6, 0.4, 1000, 1000, 1000))
+        )
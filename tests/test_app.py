@@ -0,0 +1,59 @@
+import logging
+from types import SimpleNamespace
+from unittest import TestCase
+
+from prometheus_client import REGISTRY
+
+from poly_market_maker.app import App
+
+
+class PriceFeed:
+    def __init__(self):
+        self.requests = 0
+
+    def get_price(self, token):
+        self.requests += 1
+        return None
+
+
+class TestApp(TestCase):
+    def test_readiness_backs_off_price_checks(self):
+        price_feed = PriceFeed()
+        app = SimpleNamespace(
+            order_book_manager=SimpleNamespace(wait_for_order_book=lambda timeout: True),
+            price_feed=price_feed,
+            _next_price_check=0.0,
+            _price_check_delay=0.5,
+        )
+
+        for _ in range(10):
+            self.assertFalse(App.is_ready(app))
+
+        # polled in a tight loop, the price was only requested once
+        self.assertEqual(price_feed.requests, 1)
+        self.assertEqual(app._price_check_delay, 1.0)
+
+    def test_readiness_waits_for_the_order_book(self):
+        price_feed = PriceFeed()
+        app = SimpleNamespace(
+            order_book_manager=SimpleNamespace(wait_for_order_book=lambda timeout: False),
+            price_feed=price_feed,
+            _next_price_check=0.0,
+            _price_check_delay=0.5,
+        )
+
+        self.assertFalse(App.is_ready(app))
+        self.assertEqual(price_feed.requests, 0)
+
+    def test_startup_phases_per_market(self):
+        app = SimpleNamespace(
+            condition_id="0xbootstrap", logger=logging.getLogger(__name__)
+        )
+
+        self.assertEqual(App._bootstrap_step(app, "market", lambda: 42), 42)
+        self.assertIsNotNone(
+            REGISTRY.get_sample_value(
+                "market_maker_startup_phase_duration",
+                {"phase": "market", "market": "0xbootstrap"},
+            )
+        )
@@ -0,0 +1,129 @@
+import json
+from unittest import IsolatedAsyncioTestCase
+
+from aiohttp import web
+from py_clob_client.clob_types import ApiCreds
+from py_clob_client.order_builder.constants import BUY
+from py_clob_client.signer import Signer
+
+from poly_market_maker.async_clob_api import AsyncClobApi, create_session
+from poly_market_maker.circuit_breaker import CircuitBreakers
+from poly_market_maker.deadline import deadline_after
+from poly_market_maker.rate_limiter import RateLimiter
+from poly_market_maker.signing import OrderSigner
+
+PRIVATE_KEY = "0x" + "11" * 32
+
+
+class FakeClient:
+    def get_tick_size(self, token_id):
+        return "0.01"
+
+    def get_neg_risk(self, token_id):
+        return False
+
+    def get_fee_rate_bps(self, token_id):
+        return 0
+
+
+class TestAsyncClobApi(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def get_orders(request):
+            self.requests.append(request)
+            if request.query["market"] == "0xfailing":
+                return web.json_response({"error": "unavailable"}, status=503)
+            if request.query["next_cursor"] == "MA==":
+                data, next_cursor = [self.order("1")], "MQ=="
+            else:
+                data, next_cursor = [self.order("2")], "LTE="
+            return web.json_response({"data": data, "next_cursor": next_cursor})
+
+        async def post_order(request):
+            self.requests.append(request)
+            body = json.loads(await request.text())
+            return web.json_response(
+                {"success": True, "orderID": f"0x{body['order']['tokenId']}"}
+            )
+
+        async def cancel_order(request):
+            self.requests.append(request)
+            return web.json_response("OK")
+
+        async def midpoint(request):
+            return web.json_response({"mid": "0.42"})
+
+        app = web.Application()
+        app.router.add_get("/data/orders", get_orders)
+        app.router.add_post("/order", post_order)
+        app.router.add_delete("/order", cancel_order)
+        app.router.add_get("/midpoint", midpoint)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        self.session = create_session(limit=4)
+        self.api = AsyncClobApi(
+            host=f"http://127.0.0.1:{port}",
+            signer=Signer(PRIVATE_KEY, 137),
+            creds=ApiCreds("key", "c2VjcmV0", "passphrase"),
+            order_signer=OrderSigner(FakeClient(), PRIVATE_KEY, chain_id=137),
+            session=self.session,
+            rate_limiter=RateLimiter({"GET /data/orders": (0.001, 10)}),
+            circuit_breakers=CircuitBreakers(failure_threshold=1),
+        )
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await self.session.close()
+        await self.runner.cleanup()
+
+    @staticmethod
+    def order(order_id: str) -> dict:
+        return {
+            "id": order_id,
+            "original_size": "10",
+            "size_matched": "4",
+            "price": "0.5",
+            "side": "BUY",
+            "asset_id": "1234",
+        }
+
+    async def test_get_orders_follows_pagination(self):
+        orders = await self.api.get_orders("0xcondition")
+
+        self.assertEqual([order["id"] for order in orders], ["1", "2"])
+        self.assertEqual(orders[0]["size"], 6.0)
+        self.assertEqual(self.requests[0].query["market"], "0xcondition")
+        self.assertEqual(self.requests[0].headers["POLY_API_KEY"], "key")
+
+    async def test_get_orders_takes_a_token_per_page(self):
+        bucket = self.api.rate_limiter.buckets["GET /data/orders"]
+
+        await self.api.get_orders("0xcondition")
+
+        self.assertAlmostEqual(bucket._tokens, 8, places=2)
+
+    async def test_get_orders_failure(self):
+        # not an empty book, the caller keeps the last known orders
+        self.assertIsNone(await self.api.get_orders("0xfailing"))
+
+        # the endpoint's circuit opened, requests fail fast until it resets
+        self.assertIsNone(await self.api.get_orders("0xcondition"))
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_get_orders_past_the_deadline(self):
+        with deadline_after(0):
+            self.assertIsNone(await self.api.get_orders("0xcondition"))
+
+        self.assertEqual(self.requests, [])
+
+    async def test_orders(self):
+        self.assertEqual(await self.api.get_price(1234), 0.42)
+        self.assertEqual(await self.api.place_order(0.5, 10.0, BUY, 1234), "0x1234")
+        self.assertTrue(await self.api.cancel_order("0x1234"))
+        self.assertTrue(await self.api.cancel_order(None))
+        self.assertEqual(len(self.requests), 2)
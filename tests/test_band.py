@@ -286,6 +286,38 @@ class TestBand(TestCase):
         self.assertEqual(virtual_bands[0].avg_margin, 0.03)
         self.assertEqual(virtual_bands[0].max_margin, 0.04)
 
+    def test_band_orders(self):
+        test_bands = Bands(test_bands_config.get("bands"))
+
+        target_price = 0.50
+        orders = [
+            Order(size=20, price=0.47, side=Side.BUY, token=self.token),
+            Order(size=30, price=0.45, side=Side.BUY, token=self.token),
+            Order(size=10, price=0.54, side=Side.SELL, token=self.token),
+            Order(size=5, price=0.49, side=Side.BUY, token=self.token),
+        ]
+
+        band_orders = test_bands.band_orders(orders, target_price)
+
+        # the sell at 0.54 is a buy of the complement at 0.46
+        self.assertEqual(band_orders.orders, [[orders[0]], [orders[1], orders[2]]])
+        self.assertEqual(band_orders.amounts, [20.0, 40.0])
+        self.assertEqual(band_orders.outside, [orders[3]])
+        self.assertEqual(
+            test_bands.cancellable_orders(orders, target_price, band_orders),
+            [orders[3]],
+        )
+
+    def test_virtual_bands_keep_config(self):
+        test_bands = Bands(test_bands_config.get("bands"))
+
+        virtual_bands = test_bands._calculate_virtual_bands(0.03)
+
+        self.assertEqual(len(virtual_bands), 1)
+        self.assertEqual(virtual_bands[0].buy_price(0.03), 0.01)
+        # the configured band is left as it is for the next prices
+        self.assertEqual(test_bands.bands[0].avg_margin, 0.03)
+
     # def test_tight_bands_cancellable_and_new_orders(self):
     #     with open("./tests/tight_bands.json") as fh:
     #         test_bands = Bands.read(json.load(fh))
@@ -0,0 +1,133 @@
+import time
+from types import SimpleNamespace
+from unittest import TestCase
+
+import requests
+from py_clob_client.exceptions import PolyApiException
+
+from poly_market_maker.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitOpenError,
+)
+from poly_market_maker.clob_api import ClobApi
+from poly_market_maker.deadline import DeadlineExceeded, deadline_after, remaining_time
+from poly_market_maker.rate_limiter import RateLimiter
+
+
+class TestCircuitBreaker(TestCase):
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker("GET /test", failure_threshold=2, reset_timeout=0.05)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, BreakerState.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, BreakerState.OPEN)
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        # a single trial request goes through
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, BreakerState.HALF_OPEN)
+        self.assertFalse(breaker.allow())
+
+        # which failing opens the circuit again right away
+        breaker.record_failure()
+        self.assertEqual(breaker.state, BreakerState.OPEN)
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        # a trial which was never sent leaves the circuit half open for the next one
+        breaker.release()
+        self.assertEqual(breaker.state, BreakerState.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, BreakerState.CLOSED)
+        self.assertTrue(breaker.allow())
+
+
+class MockClobApi(ClobApi):
+    def __init__(self):
+        self.client = SimpleNamespace(creds=None)
+        self.rate_limiter = RateLimiter({})
+        self.circuit_breakers = CircuitBreakers(failure_threshold=2, reset_timeout=60)
+
+
+class TestClobApiCall(TestCase):
+    def setUp(self):
+        self.api = MockClobApi()
+
+    def fail(self, exception: Exception):
+        def func():
+            raise exception
+
+        return func
+
+    def test_failures_open_the_circuit(self):
+        with self.assertRaises(requests.Timeout):
+            self.api._call("get", "GET /test", self.fail(requests.Timeout()))
+        with self.assertRaises(PolyApiException):
+            self.api._call("get", "GET /test", self.fail(PolyApiException(error_msg="")))
+
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            self.api._call("get", "GET /test", lambda: calls.append(1))
+        self.assertEqual(calls, [])
+
+        # the other endpoints are unaffected
+        self.assertEqual(self.api._call("get", "GET /other", lambda: "ok"), "ok")
+
+    def test_rejections_do_not_open_the_circuit(self):
+        class Response:
+            status_code = 400
+
+            def json(self):
+                return {}
+
+        for _ in range(3):
+            with self.assertRaises(PolyApiException):
+                self.api._call(
+                    "post", "POST /test", self.fail(PolyApiException(Response()))
+                )
+        self.assertEqual(
+            self.api.circuit_breakers.get("POST /test").state, BreakerState.CLOSED
+        )
+
+    def test_deadline(self):
+        calls = []
+        with deadline_after(10):
+            self.assertGreater(self.api._call("get", "GET /test", remaining_time), 9)
+            with deadline_after(0):
+                with self.assertRaises(DeadlineExceeded):
+                    self.api._call("get", "GET /test", lambda: calls.append(1))
+            # nested deadlines only apply to their block
+            self.assertGreater(remaining_time(), 9)
+        self.assertIsNone(remaining_time())
+        self.assertEqual(calls, [])
+
+    def test_rate_limited_trial_keeps_the_circuit_half_open(self):
+        self.api.circuit_breakers = CircuitBreakers(failure_threshold=2, reset_timeout=0.01)
+        for _ in range(2):
+            with self.assertRaises(requests.Timeout):
+                self.api._call("get", "GET /test", self.fail(requests.Timeout()))
+        time.sleep(0.02)
+
+        self.api.rate_limiter = SimpleNamespace(acquire=lambda *_, **__: False)
+        with self.assertRaises(DeadlineExceeded):
+            self.api._call("get", "GET /test", lambda: "ok")
+        self.assertEqual(
+            self.api.circuit_breakers.get("GET /test").state, BreakerState.HALF_OPEN
+        )
+
+    def test_deadline_timeouts_do_not_open_the_circuit(self):
+        with deadline_after(1):
+            for _ in range(3):
+                with self.assertRaises(requests.Timeout):
+                    self.api._call("get", "GET /test", self.fail(requests.Timeout()))
+                with self.assertRaises(DeadlineExceeded):
+                    self.api._call("get", "GET /test", self.fail(DeadlineExceeded()))
+        self.assertEqual(
+            self.api.circuit_breakers.get("GET /test").state, BreakerState.CLOSED
+        )
@@ -0,0 +1,119 @@
+import logging
+import os
+import stat
+import tempfile
+import threading
+from unittest import TestCase, mock
+
+from py_clob_client.clob_types import ApiCreds
+from py_clob_client.exceptions import PolyApiException
+
+from poly_market_maker.circuit_breaker import CircuitBreakers
+from poly_market_maker.clob_api import ClobApi
+from poly_market_maker.creds_cache import CredsCache
+from poly_market_maker.rate_limiter import RateLimiter
+
+ADDRESS = "0x8B2a0E5DD5e5A2c0C0B3C3a1b7a2b4A7f2d7e1c3"
+
+
+def creds(key: str) -> ApiCreds:
+    return ApiCreds(api_key=key, api_secret="secret", api_passphrase="passphrase")
+
+
+class TestCredsCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CredsCache(os.path.join(self.directory.name, "creds", "api.json"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.load(ADDRESS))
+
+        self.cache.save(ADDRESS, creds("key"))
+        self.assertEqual(self.cache.load(ADDRESS.lower()), creds("key"))
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache.path).st_mode), 0o600)
+
+        self.cache.save("0x01", creds("other"))
+        self.cache.invalidate(ADDRESS)
+        self.assertIsNone(self.cache.load(ADDRESS))
+        self.assertEqual(self.cache.load("0x01"), creds("other"))
+
+    def test_shared_cache_directory(self):
+        # created first by another cache, with the default permissions
+        directory = os.path.dirname(self.cache.path)
+        os.makedirs(directory, mode=0o755)
+        os.chmod(directory, 0o755)
+
+        with mock.patch("poly_market_maker.creds_cache.DEFAULT_CACHE_DIRECTORY", directory):
+            self.cache.save(ADDRESS, creds("key"))
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode), 0o700)
+
+    def test_unreadable_cache(self):
+        os.makedirs(os.path.dirname(self.cache.path))
+        with open(self.cache.path, "w") as fh:
+            fh.write("{not json")
+
+        self.assertIsNone(self.cache.load(ADDRESS))
+        self.cache.save(ADDRESS, creds("key"))
+        self.assertEqual(self.cache.load(ADDRESS), creds("key"))
+
+
+class Response:
+    status_code = 401
+
+    def json(self):
+        return {}
+
+
+class MockClient:
+    def __init__(self):
+        self.creds = None
+        self.derived = 0
+
+    def get_address(self):
+        return ADDRESS
+
+    def set_api_creds(self, creds: ApiCreds):
+        self.creds = creds
+
+    def derive_api_key(self):
+        self.derived += 1
+        return creds("derived")
+
+    def get_orders(self):
+        if self.creds.api_key != "derived":
+            raise PolyApiException(Response())
+        return []
+
+
+class MockClobApi(ClobApi):
+    def __init__(self, creds_cache: CredsCache):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.client = MockClient()
+        self.rate_limiter = RateLimiter({})
+        self.circuit_breakers = CircuitBreakers()
+        self.creds_cache = creds_cache
+        self._creds_lock = threading.Lock()
+        self._creds_derived = False
+
+
+class TestLazyValidation(TestCase):
+    def test_rejected_creds_are_derived_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CredsCache(os.path.join(directory, "api.json"))
+            cache.save(ADDRESS, creds("revoked"))
+
+            api = MockClobApi(cache)
+            api.client.set_api_creds(cache.load(ADDRESS))
+
+            self.assertEqual(api._call("get_orders", "GET /test", api.client.get_orders), [])
+            self.assertEqual(api.client.derived, 1)
+            self.assertEqual(cache.load(ADDRESS), creds("derived"))
+
+            # freshly derived credentials are not derived again
+            api.client.creds = creds("revoked")
+            with self.assertRaises(PolyApiException):
+                api._call("get_orders", "GET /test", api.client.get_orders)
+            self.assertEqual(api.client.derived, 1)
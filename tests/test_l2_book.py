@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from poly_market_maker.l2_book import L2Book
+from poly_market_maker.order import Side
+
+
+class TestL2Book(TestCase):
+    def setUp(self):
+        self.book = L2Book("1")
+        self.book.apply_snapshot(
+            bids=[(0.48, 100.0), (0.50, 30.0), (0.49, 50.0)],
+            asks=[(0.53, 40.0), (0.52, 10.0), (0.55, 200.0)],
+        )
+
+    def test_deltas_before_snapshot_are_ignored(self):
+        book = L2Book("2")
+        book.apply_delta(Side.BUY, 0.5, 10.0)
+
+        self.assertFalse(book.synced)
+        self.assertEqual(book.top_of_book(), (None, None))
+        self.assertIsNone(book.mid())
+
+    def test_top_of_book(self):
+        self.assertEqual(self.book.top_of_book(), (0.50, 0.52))
+        self.assertAlmostEqual(self.book.mid(), 0.51)
+        # 30 bid against 10 offered pulls the price towards the ask
+        self.assertAlmostEqual(self.book.microprice(), (0.50 * 10 + 0.52 * 30) / 40)
+
+    def test_deltas(self):
+        self.book.apply_delta(Side.BUY, 0.51, 5.0)
+        self.assertEqual(self.book.best_bid(), 0.51)
+
+        self.book.apply_delta(Side.BUY, 0.51, 0.0)
+        self.book.apply_delta(Side.BUY, 0.50, 0.0)
+        self.assertEqual(self.book.best_bid(), 0.49)
+
+        self.book.apply_delta(Side.SELL, 0.53, 15.0)
+        self.assertEqual(self.book.depth_at(Side.SELL, 0.53), 15.0)
+        self.assertEqual(self.book.depth_at(Side.SELL, 0.54), 0.0)
+
+        # removing a missing level is a no-op
+        self.book.apply_delta(Side.SELL, 0.60, 0.0)
+        self.assertEqual(list(self.book.asks.levels())[-1], (0.55, 200.0))
+
+    def test_cumulative_depth(self):
+        self.assertEqual(self.book.cumulative_depth(Side.BUY, 0.50), 30.0)
+        self.assertEqual(self.book.cumulative_depth(Side.BUY, 0.485), 80.0)
+        self.assertEqual(self.book.cumulative_depth(Side.BUY, 0.40), 180.0)
+        self.assertEqual(self.book.cumulative_depth(Side.SELL, 0.53), 50.0)
+        self.assertEqual(self.book.cumulative_depth(Side.SELL, 0.51), 0.0)
+
+    def test_reset(self):
+        self.book.reset()
+
+        self.assertFalse(self.book.synced)
+        self.assertEqual(self.book.top_of_book(), (None, None))
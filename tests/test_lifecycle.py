@@ -36,4 +36,22 @@ class TestLifecycle(TestCase):
         self.assertTrue(lc.terminated_internally)
         self.assertEqual(self.counter, 2)
 
-    pass
+    def test_startup_waits_for_readiness(self):
+        lc = Lifecycle()
+        checks = []
+
+        def ready():
+            checks.append(1)
+            return len(checks) >= 3
+
+        def startup():
+            # only called once ready
+            self.assertEqual(len(checks), 3)
+
+        with pytest.raises(SystemExit):
+            with lc as lifecycle:
+                lifecycle.wait_for(ready, 5)
+                lifecycle.on_startup(MagicMock(side_effect=startup))
+                lifecycle.every(0.1, lambda: lifecycle.terminate())
+
+        self.assertEqual(len(checks), 3)
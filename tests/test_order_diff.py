@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from poly_market_maker.order import Order, Side
+from poly_market_maker.token import Token
+from poly_market_maker.strategies.order_diff import diff_level, diff_orders, level
+
+
+def order(price: float, size: float, side=Side.BUY, token=Token.A, id=None) -> Order:
+    return Order(price=price, size=size, side=side, token=token, id=id)
+
+
+class TestOrderDiff(TestCase):
+    def test_diff_level(self):
+        resting = [order(0.5, 10.0, id="1"), order(0.5, 20.0, id="2")]
+
+        self.assertEqual(diff_level(30.0, resting), ([], 0.0))
+        self.assertEqual(diff_level(40.0, resting), ([], 10.0))
+        # the shortfall is below the minimum size
+        self.assertEqual(diff_level(33.0, resting), ([], 0.0))
+        # the oldest order keeps its place in the queue
+        self.assertEqual(diff_level(25.0, resting), ([resting[1]], 15.0))
+        self.assertEqual(diff_level(0.0, resting), (resting, 0.0))
+
+    def test_float_error_lands_on_the_same_level(self):
+        # 0.1 + 0.2 is 0.30000000000000004, but both prices are 30 ticks
+        self.assertEqual(level(order(0.1 + 0.2, 1.0)), level(order(0.3, 1.0)))
+
+        # so a resting order at the computed price is kept, not replaced
+        (to_cancel, to_place) = diff_orders(
+            [order(0.3, 10.0)], [order(0.1 + 0.2, 10.0, id="1")]
+        )
+
+        self.assertEqual(to_cancel, [])
+        self.assertEqual(to_place, [])
+
+    def test_empty_book(self):
+        expected = [order(0.5, 10.0), order(0.5, 5.0), order(0.4, 2.0)]
+
+        (to_cancel, to_place) = diff_orders(expected, [])
+
+        self.assertEqual(to_cancel, [])
+        self.assertEqual(len(to_place), 1)
+        self.assertEqual(to_place[0].price, 0.5)
+        self.assertEqual(to_place[0].size, 15.0)
+
+    def test_keeps_matching_levels(self):
+        open_orders = [
+            order(0.5, 10.0, id="1"),
+            order(0.4, 10.0, id="2"),
+            order(0.6, 10.0, side=Side.SELL, token=Token.B, id="3"),
+        ]
+        expected = [
+            order(0.5, 10.0),
+            order(0.4, 16.0),
+            order(0.3, 10.0),
+        ]
+
+        (to_cancel, to_place) = diff_orders(expected, open_orders)
+
+        self.assertEqual([o.id for o in to_cancel], ["3"])
+        self.assertEqual(
+            sorted((o.price, o.size) for o in to_place), [(0.3, 10.0), (0.4, 6.0)]
+        )
+
+    def test_shrinking_level(self):
+        open_orders = [order(0.5, 10.0, id="1"), order(0.5, 10.0, id="2")]
+
+        (to_cancel, to_place) = diff_orders([order(0.5, 12.0)], open_orders)
+
+        self.assertEqual([o.id for o in to_cancel], ["2"])
+        self.assertEqual(to_place, [])
+
+    def test_places_in_ladder_order(self):
+        expected = [order(0.5, 10.0), order(0.45, 10.0), order(0.4, 10.0)]
+        open_orders = [order(0.3, 10.0, id="1"), order(0.45, 10.0, id="2")]
+
+        (to_cancel, to_place) = diff_orders(expected, open_orders)
+
+        self.assertEqual([o.id for o in to_cancel], ["1"])
+        self.assertEqual([o.price for o in to_place], [0.5, 0.4])
@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from poly_market_maker.order import Order, Side
+from poly_market_maker.order_store import OrderStore
+from poly_market_maker.token import Token
+
+
+def order(id, price=0.5, size=10.0, side=Side.BUY, token=Token.A):
+    return Order(id=id, price=price, size=size, side=side, token=token)
+
+
+class TestOrderStore(TestCase):
+    def test_add_and_remove(self):
+        store = OrderStore()
+
+        self.assertTrue(store.add(order("a")))
+        self.assertTrue(store.add(order("b", price=0.4)))
+        self.assertFalse(store.add(order("a")))
+
+        self.assertEqual(len(store), 2)
+        self.assertIn("a", store)
+        self.assertEqual([o.id for o in store.orders()], ["a", "b"])
+
+        self.assertEqual(store.remove("a").id, "a")
+        self.assertIsNone(store.remove("a"))
+        self.assertEqual([o.id for o in store.orders()], ["b"])
+
+    def test_snapshot_is_cached_until_mutation(self):
+        store = OrderStore([order("a"), order("b")])
+
+        snapshot = store.orders()
+        self.assertIs(store.orders(), snapshot)
+
+        store.add(order("a"))
+        self.assertIs(store.orders(), snapshot)
+
+        store.add(order("c"))
+        self.assertIsNot(store.orders(), snapshot)
+
+    def test_replace_all(self):
+        store = OrderStore([order("a"), order("b"), order("c")])
+        snapshot = store.orders()
+
+        self.assertFalse(store.replace_all([order("a"), order("b"), order("c")]))
+        self.assertIs(store.orders(), snapshot)
+
+        self.assertTrue(
+            store.replace_all([order("b", size=5.0), order("d"), order("d", size=1.0)])
+        )
+        self.assertEqual(sorted(o.id for o in store.orders()), ["b", "d"])
+        self.assertEqual(store.get("b").size, 5.0)
+        self.assertEqual(store.get("d").size, 10.0)
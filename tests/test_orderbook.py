@@ -0,0 +1,245 @@
+from unittest import TestCase
+
+from prometheus_client import REGISTRY
+
+from poly_market_maker.order import Order, Side
+from poly_market_maker.orderbook import OrderBook, OrderBookManager, RefreshScheduler
+from poly_market_maker.token import Token, Collateral
+
+
+class TestOrderBook(TestCase):
+    def test_snapshot_is_immutable(self):
+        balances = {Collateral: 100.0, Token.A: 0.0, Token.B: 0.0}
+        order_book = OrderBook(
+            orders=[Order(price=0.5, size=10.0, side=Side.BUY, token=Token.A)],
+            balances=balances,
+            orders_being_placed=False,
+            orders_being_cancelled=False,
+            version=3,
+        )
+
+        self.assertEqual(order_book.version, 3)
+        self.assertIsInstance(order_book.orders, tuple)
+        self.assertEqual(order_book.balances[Collateral], 100.0)
+
+        with self.assertRaises(AttributeError):
+            order_book.version = 4
+        with self.assertRaises(AttributeError):
+            order_book.orders = ()
+        with self.assertRaises(TypeError):
+            order_book.balances[Collateral] = 0.0
+
+        # the snapshot does not follow later changes to the source balances
+        balances[Collateral] = 0.0
+        self.assertEqual(order_book.balances[Collateral], 100.0)
+
+
+class FakeBackend:
+    def __init__(self):
+        self.orders = {}
+        self.counter = 0
+        self.batches = []
+
+    def get_orders(self):
+        return list(self.orders.values())
+
+    def get_balances(self):
+        return {Collateral: 100.0, Token.A: 0.0, Token.B: 0.0}
+
+    def place_order(self, order: Order) -> Order:
+        self.counter += 1
+        new_order = Order(
+            price=order.price,
+            size=order.size,
+            side=order.side,
+            token=order.token,
+            id=str(self.counter),
+        )
+        self.orders[new_order.id] = new_order
+        return new_order
+
+    def place_orders(self, orders: list[Order]) -> list[Order]:
+        self.batches.append(len(orders))
+        # orders priced at 0.99 are rejected
+        return [
+            self.place_order(order) if order.price != 0.99 else None for order in orders
+        ]
+
+    def cancel_order(self, order: Order) -> bool:
+        return self.orders.pop(order.id, None) is not None
+
+    def cancel_orders(self, orders: list[Order]) -> set[str]:
+        self.batches.append(len(orders))
+        # orders priced at 0.5 refuse to be cancelled
+        return set(
+            order.id
+            for order in orders
+            if order.price != 0.5 and self.cancel_order(order)
+        )
+
+    def cancel_all_orders(self, _) -> bool:
+        self.orders.clear()
+        return True
+
+
+class TestOrderBookManager(TestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.manager = OrderBookManager(60)
+        self.manager.get_orders_with(self.backend.get_orders)
+        self.manager.get_balances_with(self.backend.get_balances)
+        self.manager.place_orders_with(self.backend.place_order)
+        self.manager.cancel_orders_with(self.backend.cancel_order)
+        self.manager.cancel_all_orders_with(self.backend.cancel_all_orders)
+
+    @staticmethod
+    def new_order(price: float) -> Order:
+        return Order(price=price, size=10.0, side=Side.BUY, token=Token.A)
+
+    def test_waits_time_out(self):
+        self.assertFalse(self.manager.wait_for_order_book(timeout=0.01))
+        self.assertFalse(self.manager.wait_for_stable_order_book(timeout=0.01))
+
+        self.manager.start()
+        self.assertTrue(self.manager.wait_for_order_book(timeout=5))
+        self.assertTrue(self.manager.wait_for_stable_order_book(timeout=5))
+        self.assertTrue(self.manager.wait_for_order_cancellation(timeout=5))
+        # the next refresh is a minute away
+        self.assertFalse(self.manager.wait_for_order_book_refresh(timeout=0.01))
+
+    def test_metrics_per_market(self):
+        for market, refresh_frequency in (("0xa", 60), ("0xb", 30)):
+            manager = OrderBookManager(refresh_frequency, market=market)
+            manager.get_orders_with(self.backend.get_orders)
+            manager.get_balances_with(self.backend.get_balances)
+            manager.start()
+            self.assertTrue(manager.wait_for_order_book(timeout=5))
+
+        # the markets of a process do not overwrite each other's series
+        for market, refresh_frequency in (("0xa", 60), ("0xb", 30)):
+            self.assertEqual(
+                REGISTRY.get_sample_value(
+                    "market_maker_order_book_refresh_interval", {"market": market}
+                ),
+                refresh_frequency,
+            )
+            self.assertIsNotNone(
+                REGISTRY.get_sample_value(
+                    "market_maker_order_book_snapshot_age", {"market": market}
+                )
+            )
+
+    def test_snapshots(self):
+        self.manager.start()
+        order_book = self.manager.get_order_book()
+        self.assertEqual(order_book.orders, ())
+        self.assertEqual(self.manager.version, order_book.version)
+
+        self.manager.place_orders([self.new_order(0.4), self.new_order(0.5)])
+        placed = self.manager.get_order_book()
+        self.assertEqual(sorted(order.price for order in placed.orders), [0.4, 0.5])
+        self.assertGreater(placed.version, order_book.version)
+        # earlier snapshots are left untouched
+        self.assertEqual(order_book.orders, ())
+
+        self.manager.cancel_orders([placed.orders[0]])
+        cancelled = self.manager.get_order_book()
+        self.assertEqual(len(cancelled.orders), 1)
+        self.assertFalse(cancelled.orders_being_cancelled)
+        self.assertEqual(len(self.backend.orders), 1)
+
+    def test_place_orders_in_batches(self):
+        self.manager.place_orders_batch_with(self.backend.place_orders)
+        self.manager.start()
+
+        orders = [self.new_order(0.01 * i) for i in range(1, 21)] + [
+            self.new_order(0.99)
+        ]
+        self.manager.place_orders(orders)
+
+        self.assertEqual(sorted(self.backend.batches), [6, 15])
+        order_book = self.manager.get_order_book()
+        self.assertEqual(len(order_book.orders), 20)
+        self.assertFalse(order_book.orders_being_placed)
+        self.assertNotIn(0.99, [order.price for order in order_book.orders])
+
+    def test_cancel_orders_in_batches(self):
+        self.manager.cancel_orders_batch_with(self.backend.cancel_orders)
+        self.manager.start()
+
+        self.manager.place_orders([self.new_order(0.4), self.new_order(0.5)])
+        orders = list(self.manager.get_order_book().orders)
+        self.manager.cancel_orders(orders)
+
+        self.assertEqual(self.backend.batches, [2])
+        order_book = self.manager.get_order_book()
+        self.assertEqual([order.price for order in order_book.orders], [0.5])
+        self.assertFalse(order_book.orders_being_cancelled)
+
+    def test_stream_updates(self):
+        self.manager.start()
+        self.manager.place_orders([self.new_order(0.4), self.new_order(0.5)])
+        (first, second) = sorted(
+            self.manager.get_order_book().orders, key=lambda order: order.price
+        )
+
+        # 4 of the 10 bought at 0.4 are filled
+        partially_filled = Order(
+            price=0.4, size=6.0, side=Side.BUY, token=Token.A, id=first.id
+        )
+        self.manager.apply_order_update(partially_filled, size_matched=4.0)
+        # repeated updates are not applied twice
+        self.manager.apply_order_update(partially_filled, size_matched=4.0)
+        order_book = self.manager.get_order_book()
+        self.assertEqual(
+            sorted(order.size for order in order_book.orders), [6.0, 10.0]
+        )
+        self.assertEqual(order_book.balances[Token.A], 4.0)
+        self.assertAlmostEqual(order_book.balances[Collateral], 98.4)
+
+        self.manager.apply_order_cancellation(second.id)
+        order_book = self.manager.get_order_book()
+        self.assertEqual([order.id for order in order_book.orders], [first.id])
+
+        filled = Order(price=0.4, size=0.0, side=Side.BUY, token=Token.A, id=first.id)
+        self.manager.apply_order_update(filled, size_matched=10.0)
+        order_book = self.manager.get_order_book()
+        self.assertEqual(order_book.orders, ())
+        self.assertEqual(order_book.balances[Token.A], 10.0)
+        self.assertAlmostEqual(order_book.balances[Collateral], 96.0)
+
+
+class TestRefreshScheduler(TestCase):
+    def test_backoff_and_activity(self):
+        scheduler = RefreshScheduler(interval=5, min_interval=1, max_interval=20)
+        self.assertEqual(scheduler.interval, 5)
+
+        scheduler.refreshed(changed=False)
+        self.assertEqual(scheduler.interval, 10)
+        scheduler.refreshed(changed=False)
+        scheduler.refreshed(changed=False)
+        self.assertEqual(scheduler.interval, 20)
+
+        scheduler.activity()
+        self.assertEqual(scheduler.interval, 1)
+        scheduler.refreshed(changed=False)
+        self.assertEqual(scheduler.interval, 2)
+        scheduler.refreshed(changed=True)
+        self.assertEqual(scheduler.interval, 1)
+
+    def test_reconciliation(self):
+        scheduler = RefreshScheduler(interval=5, min_interval=1, max_interval=20)
+
+        scheduler.reconcile_every(60)
+        self.assertEqual(scheduler.interval, 60)
+        scheduler.activity()
+        scheduler.refreshed(changed=True)
+        self.assertEqual(scheduler.interval, 60)
+
+        scheduler.refresh_soon()
+        self.assertEqual(scheduler.interval, 1)
+        scheduler.refreshed(changed=False)
+        self.assertEqual(scheduler.interval, 60)
+
+        scheduler.reconcile_every(None)
+        self.assertEqual(scheduler.interval, 1)
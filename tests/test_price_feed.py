@@ -1,6 +1,15 @@
+import threading
+import time
 from unittest import TestCase
 
-from poly_market_maker.price_feed import PriceFeedClob
+from prometheus_client import REGISTRY
+
+from poly_market_maker.price_feed import (
+    CachedPriceFeed,
+    PriceFeed,
+    PriceFeedClob,
+    PriceFeedWebsocket,
+)
 from poly_market_maker.token import Token
 from poly_market_maker.market import Market
 from poly_market_maker.clob_api import ClobApi
@@ -20,3 +29,120 @@ class TestPriceFeed(TestCase):
         price_feed = PriceFeedClob(market, MockClobApi())
 
         self.assertEqual(price_feed.get_price(Token.A), 0.4)
+
+
+class TestPriceFeedWebsocket(TestCase):
+    def setUp(self):
+        self.market = Market("0x045A", "0x0456")
+        self.price_feed = PriceFeedWebsocket(self.market, MockClobApi(), max_age=5.0)
+        self.asset_a = str(self.market.token_id(Token.A))
+
+        # pretend the stream is connected and just received a message
+        self.price_feed.stream.connected = True
+        self.price_feed.stream.last_message_time = time.monotonic()
+
+    def book(self, bids: list[str], asks: list[str]) -> dict:
+        return {
+            "event_type": "book",
+            "asset_id": self.asset_a,
+            "bids": [{"price": price, "size": "100"} for price in bids],
+            "asks": [{"price": price, "size": "100"} for price in asks],
+        }
+
+    def test_metrics_per_market(self):
+        labels = {"stream": "market", "market": self.market.condition_id}
+        messages = REGISTRY.get_sample_value("market_maker_websocket_messages_total", labels)
+
+        # setUp marks the stream connected without going through the metrics
+        self.price_feed.stream._set_connected(False)
+        self.price_feed.stream._set_connected(True)
+        self.price_feed.stream._dispatch('{"event_type": "unknown"}')
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("market_maker_websocket_connected", labels), 1
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value("market_maker_websocket_messages_total", labels),
+            (messages or 0) + 1,
+        )
+
+    def test_price_from_the_stream(self):
+        self.assertEqual(self.price_feed.get_price(Token.A), 0.4)
+
+        self.price_feed.handle_message(self.book(["0.50", "0.52"], ["0.56", "0.58"]))
+        self.assertEqual(self.price_feed.get_top_of_book(Token.A), (0.52, 0.56))
+        self.assertAlmostEqual(self.price_feed.get_price(Token.A), 0.54)
+
+        self.price_feed.handle_message(
+            {
+                "event_type": "price_change",
+                "price_changes": [
+                    {
+                        "asset_id": self.asset_a,
+                        "price": "0.53",
+                        "size": "10",
+                        "side": "BUY",
+                        "best_bid": "0.53",
+                        "best_ask": "0.56",
+                    }
+                ],
+            }
+        )
+        self.assertAlmostEqual(self.price_feed.get_price(Token.A), 0.545)
+
+    def test_falls_back_when_stale(self):
+        self.price_feed.handle_message(self.book(["0.52"], ["0.56"]))
+        self.assertAlmostEqual(self.price_feed.get_price(Token.A), 0.54)
+
+        self.price_feed.stream.last_message_time = time.monotonic() - 10
+        self.assertEqual(self.price_feed.get_price(Token.A), 0.4)
+
+        self.price_feed.stream.last_message_time = time.monotonic()
+        # removing the best bid leaves the top of book incomplete until the next snapshot
+        self.price_feed.handle_message(
+            {
+                "event_type": "price_change",
+                "asset_id": self.asset_a,
+                "changes": [{"price": "0.52", "side": "BUY", "size": "0"}],
+            }
+        )
+        self.assertEqual(self.price_feed.get_price(Token.A), 0.4)
+
+
+class SlowPriceFeed(PriceFeed):
+    def __init__(self):
+        super().__init__()
+        self.prices = [0.4, None, 0.5]
+        self.calls = 0
+        self.release = threading.Event()
+
+    def get_price(self, token: Token):
+        self.calls += 1
+        if self.calls > 1:
+            self.release.wait(5)
+        return self.prices[self.calls - 1]
+
+
+class TestCachedPriceFeed(TestCase):
+    def test_stale_while_revalidate(self):
+        source = SlowPriceFeed()
+        price_feed = CachedPriceFeed(source, ttl=0.05)
+        self.assertIsNone(price_feed.get_price_age(Token.A))
+
+        # the first price is fetched synchronously
+        self.assertEqual(price_feed.get_price(Token.A), 0.4)
+        self.assertLess(price_feed.get_price_age(Token.A), 0.05)
+
+        time.sleep(0.06)
+        # the cached price is served while a single refresh is in flight
+        for _ in range(3):
+            self.assertEqual(price_feed.get_price(Token.A), 0.4)
+        source.release.set()
+        price_feed._executor.submit(lambda: None).result()
+        self.assertEqual(source.calls, 2)
+
+        # the refresh failed, the last good price keeps ageing
+        self.assertGreater(price_feed.get_price_age(Token.A), 0.05)
+        self.assertEqual(price_feed.get_price(Token.A), 0.4)
+        price_feed._executor.submit(lambda: None).result()
+        self.assertEqual(price_feed.get_price(Token.A), 0.5)
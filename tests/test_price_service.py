@@ -0,0 +1,55 @@
+import time
+from unittest import TestCase
+
+from poly_market_maker.market import Market
+from poly_market_maker.price_service import PriceFeedService, PriceService
+from poly_market_maker.token import Token
+
+
+class TestPriceService(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.price_service = PriceService(interval=60)
+        self.price_service.get_prices_with(self.get_prices)
+
+    def get_prices(self, token_ids: list[int]) -> dict[int, float]:
+        self.calls.append(sorted(token_ids))
+        # the service must cope with tokens missing from the response
+        return {token_id: 0.5 for token_id in token_ids if token_id != 0x0B}
+
+    def test_fans_out_one_request(self):
+        market_1 = Market("0x01", "0x0456")
+        market_1.token_ids = {Token.A: 0x0A, Token.B: 0x0B}
+        market_2 = Market("0x02", "0x0456")
+        market_2.token_ids = {Token.A: 0x0C, Token.B: 0x0D}
+
+        price_feed_1 = PriceFeedService(market_1, self.price_service)
+        price_feed_2 = PriceFeedService(market_2, self.price_service)
+        self.assertIsNone(price_feed_1.get_price(Token.A))
+        self.assertIsNone(price_feed_1.get_price_age(Token.A))
+
+        self.price_service.fetch_prices()
+        self.assertEqual(self.calls, [[0x0A, 0x0B, 0x0C, 0x0D]])
+
+        self.assertEqual(price_feed_1.get_price(Token.A), 0.5)
+        self.assertIsNone(price_feed_1.get_price(Token.B))
+        self.assertEqual(price_feed_2.get_price(Token.B), 0.5)
+        self.assertLess(price_feed_2.get_price_age(Token.B), 1)
+
+        price_feed_2.close()
+        self.price_service.fetch_prices()
+        self.assertEqual(self.calls[-1], [0x0A, 0x0B])
+        self.assertIsNone(price_feed_2.get_price(Token.A))
+
+    def test_new_subscription_fetches_immediately(self):
+        self.price_service.start()
+        self.price_service.start()
+
+        market = Market("0x01", "0x0456")
+        market.token_ids = {Token.A: 0x0A, Token.B: 0x0B}
+        price_feed = PriceFeedService(market, self.price_service)
+
+        deadline = time.monotonic() + 2
+        while price_feed.get_price(Token.A) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(price_feed.get_price(Token.A), 0.5)
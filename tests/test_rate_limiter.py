@@ -0,0 +1,46 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from poly_market_maker.rate_limiter import RateLimiter, TokenBucket
+
+
+class TestTokenBucket(TestCase):
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=100.0, capacity=5)
+
+        for _ in range(5):
+            self.assertEqual(bucket.try_acquire(), 0.0)
+
+        delay = bucket.try_acquire()
+        self.assertGreater(delay, 0.0)
+        self.assertLessEqual(delay, 0.01)
+
+        start_time = time.monotonic()
+        self.assertTrue(bucket.acquire())
+        self.assertGreater(time.monotonic() - start_time, 0.0)
+
+    def test_acquire_timeout(self):
+        bucket = TokenBucket(rate=1.0, capacity=1)
+
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0.01))
+
+
+class TestRateLimiter(TestCase):
+    def test_per_endpoint(self):
+        limiter = RateLimiter({"POST /order": (1.0, 1)})
+
+        self.assertTrue(limiter.acquire("POST /order", timeout=0))
+        self.assertFalse(limiter.acquire("POST /order", timeout=0))
+        # endpoints without a limit are never throttled
+        self.assertTrue(limiter.acquire("DELETE /order", timeout=0))
+
+    def test_acquire_async_timeout(self):
+        limiter = RateLimiter({"POST /order": (1.0, 1)})
+
+        async def acquire():
+            return await limiter.acquire_async("POST /order", timeout=0.01)
+
+        self.assertTrue(asyncio.run(acquire()))
+        self.assertFalse(asyncio.run(acquire()))
@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest import TestCase
+
+from py_clob_client.order_builder.constants import BUY
+
+from poly_market_maker.signing import OrderSigner
+
+PRIVATE_KEY = "0x" + "11" * 32
+TOKEN_ID = "1234"
+
+
+class FakeClient:
+    def get_tick_size(self, token_id):
+        return "0.01"
+
+    def get_neg_risk(self, token_id):
+        return False
+
+    def get_fee_rate_bps(self, token_id):
+        return 0
+
+
+def order(price: float, size: float = 10.0) -> dict:
+    return {"price": price, "size": size, "side": BUY, "token_id": TOKEN_ID}
+
+
+class TestOrderSigner(TestCase):
+    def test_sign_inline(self):
+        signer = OrderSigner(FakeClient(), PRIVATE_KEY, chain_id=137)
+        self.assertFalse(signer.can_presign)
+
+        signed_orders = signer.sign_orders([order(0.45), order(1.5), order(0.55)])
+
+        self.assertEqual(len(signed_orders), 3)
+        self.assertIsNotNone(signed_orders[0])
+        self.assertIsNone(signed_orders[1])
+        self.assertIsNotNone(signed_orders[2])
+        self.assertEqual(signed_orders[0].order["tokenId"], int(TOKEN_ID))
+
+    def test_presigned_orders_are_used_once(self):
+        signer = OrderSigner(FakeClient(), PRIVATE_KEY, chain_id=137, processes=1)
+        self.assertTrue(signer.can_presign)
+
+        signer.presign([order(0.45)])
+        (first,) = signer.sign_orders([order(0.45)])
+        (second,) = signer.sign_orders([order(0.45)])
+
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertNotEqual(first.order["salt"], second.order["salt"])
+        self.assertEqual(len(signer._presigned), 0)
+
+    def test_options_are_requested_through_call(self):
+        endpoints = []
+
+        def call(method, endpoint, func, *args):
+            endpoints.append(endpoint)
+            return func(*args)
+
+        signer = OrderSigner(FakeClient(), PRIVATE_KEY, chain_id=137, call=call)
+        (signed_order,) = signer.sign_orders([order(0.45)])
+
+        self.assertIsNotNone(signed_order)
+        self.assertEqual(
+            sorted(endpoints), ["GET /fee-rate", "GET /neg-risk", "GET /tick-size"]
+        )
+
+    def test_presign_does_not_wait_for_the_options(self):
+        cache_warm = threading.Event()
+
+        def call(method, endpoint, func, *args):
+            # a cold client cache, the options are being fetched
+            cache_warm.wait(timeout=5)
+            return func(*args)
+
+        signer = OrderSigner(
+            FakeClient(), PRIVATE_KEY, chain_id=137, processes=1, call=call
+        )
+        start_time = time.monotonic()
+        signer.presign([order(0.45)])
+
+        self.assertLess(time.monotonic() - start_time, 1)
+        self.assertEqual(len(signer._presigned), 1)
+
+        cache_warm.set()
+        (signed_order,) = signer.sign_orders([order(0.45)])
+        self.assertIsNotNone(signed_order)
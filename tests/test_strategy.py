@@ -1,6 +1,9 @@
+import json
+import tempfile
 from unittest import TestCase
 
-from poly_market_maker.strategy import Strategy
+from poly_market_maker.strategy import Strategy, StrategyManager
+from poly_market_maker.token import Token
 
 
 class TestStrategy(TestCase):
@@ -12,3 +15,42 @@ class TestStrategy(TestCase):
         self.assertEqual(strategy.value, "amm")
 
         self.assertRaises(ValueError, Strategy, "x")
+
+
+class PriceFeed:
+    def __init__(self, price, age):
+        self.price = price
+        self.age = age
+
+    def get_price(self, token: Token):
+        return self.price
+
+    def get_price_age(self, token: Token):
+        return self.age
+
+
+class TestStrategyManager(TestCase):
+    def setUp(self):
+        self.config = tempfile.NamedTemporaryFile("w", suffix=".json")
+        json.dump({"bands": []}, self.config)
+        self.config.flush()
+
+    def tearDown(self):
+        self.config.close()
+
+    def strategy_manager(self, price_feed) -> StrategyManager:
+        return StrategyManager(
+            "bands", self.config.name, price_feed, None, max_price_age=10.0
+        )
+
+    def test_token_prices(self):
+        strategy_manager = self.strategy_manager(PriceFeed(0.456, 1.0))
+
+        self.assertEqual(
+            strategy_manager.get_token_prices(), {Token.A: 0.46, Token.B: 0.54}
+        )
+
+    def test_no_quotes_on_stale_or_missing_prices(self):
+        self.assertIsNone(self.strategy_manager(PriceFeed(0.5, 11.0)).get_token_prices())
+        self.assertIsNone(self.strategy_manager(PriceFeed(0.5, None)).get_token_prices())
+        self.assertIsNone(self.strategy_manager(PriceFeed(None, 0.0)).get_token_prices())
@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from poly_market_maker.ticks import from_lots, from_ticks, to_lots, to_ticks
+
+
+class TestTicks(TestCase):
+    def test_round_trip(self):
+        for cents in range(0, 101):
+            price = round(cents / 100, 2)
+            self.assertEqual(to_ticks(price), cents)
+            self.assertEqual(from_ticks(to_ticks(price)), price)
+
+        self.assertEqual(to_lots(12.34), 1234)
+        self.assertEqual(from_lots(1234), 12.34)
+
+    def test_float_errors(self):
+        self.assertEqual(to_ticks(0.1 + 0.2), to_ticks(0.3))
+        self.assertEqual(to_lots(0.1 + 0.2), 30)
+        self.assertEqual(from_ticks(100 - to_ticks(0.41)), 0.59)
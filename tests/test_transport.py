@@ -0,0 +1,71 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+import requests
+
+from poly_market_maker.deadline import DeadlineExceeded, deadline_after
+from poly_market_maker.transport import Transport
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    headers_seen = []
+
+    def do_GET(self):
+        Handler.headers_seen.append(dict(self.headers))
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/limited":
+            self.send_response(429)
+            self.send_header("Retry-After", "0.2")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(TestCase):
+    def setUp(self):
+        Handler.headers_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.transport = Transport(host_limits={})
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_headers_and_connection_reuse(self):
+        for _ in range(3):
+            response = self.transport.get(f"{self.url}/", headers={"Accept": "*/*"})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(Handler.headers_seen[0]["Accept"], "*/*")
+        self.assertIn("Chrome", Handler.headers_seen[0]["User-Agent"])
+        self.assertEqual(len(self.transport._sessions), 1)
+        self.assertEqual(self.transport._connections_seen["127.0.0.1"], 1)
+
+    def test_retry_after_pauses_the_host(self):
+        self.assertEqual(self.transport.get(f"{self.url}/limited").status_code, 429)
+
+        start_time = time.monotonic()
+        self.transport.get(f"{self.url}/")
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.15)
+
+    def test_deadline_bounds_the_request(self):
+        with deadline_after(0.1):
+            start_time = time.monotonic()
+            with self.assertRaises(requests.Timeout):
+                self.transport.get(f"{self.url}/slow")
+            self.assertLess(time.monotonic() - start_time, 0.4)
+
+        with deadline_after(0):
+            with self.assertRaises(DeadlineExceeded):
+                self.transport.get(f"{self.url}/")
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from poly_market_maker.transport_registry import TransportCandidate, TransportRegistry
+
+
+class TestTransportRegistry(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.directory.name, "health.json")
+        self.calls = []
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def candidate(self, name: str, healthy: bool, configured: bool = True):
+        def probe():
+            self.calls.append(f"probe {name}")
+            return healthy
+
+        def install():
+            self.calls.append(f"install {name}")
+            return True
+
+        return TransportCandidate(
+            name, install=install, probe=probe, configured=lambda: configured
+        )
+
+    def registry(self) -> TransportRegistry:
+        return TransportRegistry(
+            [
+                self.candidate("unconfigured", True, configured=False),
+                self.candidate("failing", False),
+                self.candidate("proxy", True),
+                TransportCandidate("direct", install=lambda: True),
+            ],
+            cache_path=self.cache_path,
+        )
+
+    def test_lazy_and_cached(self):
+        registry = self.registry()
+        self.assertEqual(self.calls, [])
+        self.assertIsNone(registry.selected)
+
+        self.assertEqual(registry.install(), "proxy")
+        self.assertEqual(self.calls, ["probe failing", "probe proxy", "install proxy"])
+        self.assertEqual(registry.install(), "proxy")
+        self.assertEqual(len(self.calls), 3)
+
+        with open(self.cache_path) as fh:
+            health = json.load(fh)
+        self.assertFalse(health["failing"]["healthy"])
+        self.assertTrue(health["proxy"]["healthy"])
+        self.assertIn("latency", health["proxy"])
+
+        # a new process reuses the persisted health instead of probing
+        self.calls.clear()
+        self.assertEqual(self.registry().install(), "proxy")
+        self.assertEqual(self.calls, ["install proxy"])
+
+    def test_expired_health_is_probed_again(self):
+        with open(self.cache_path, "w") as fh:
+            json.dump(
+                {
+                    "failing": {"healthy": True, "checked_at": time.time() - 7200},
+                    "proxy": {"healthy": False, "checked_at": time.time()},
+                },
+                fh,
+            )
+
+        self.assertEqual(self.registry().install(), "direct")
+        self.assertEqual(self.calls, ["probe failing"])
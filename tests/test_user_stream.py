@@ -0,0 +1,98 @@
+from unittest import TestCase
+
+from prometheus_client import REGISTRY
+from py_clob_client.clob_types import ApiCreds
+
+from poly_market_maker.market import Market
+from poly_market_maker.order import Order, Side
+from poly_market_maker.orderbook import OrderBookManager
+from poly_market_maker.token import Token
+from poly_market_maker.user_stream import UserStream
+
+
+class FakeOrderBookManager(OrderBookManager):
+    def __init__(self):
+        super().__init__(60)
+        self.updates = []
+        self.cancellations = []
+        self.refreshes = 0
+
+    def apply_order_update(self, order: Order, size_matched: float = 0.0):
+        self.updates.append((order, size_matched))
+
+    def apply_order_cancellation(self, order_id: str):
+        self.cancellations.append(order_id)
+
+    def refresh_soon(self):
+        self.refreshes += 1
+
+
+class TestUserStream(TestCase):
+    usdc_address = "0x2E8DCfE708D44ae2e406a1c02DFE2Fa13012f961"
+    condition_id = "0xbd31dc8a20211944f6b70f31557f1001557b59905b7738480ca09bd4532f84af"
+    market = Market(condition_id, usdc_address)
+
+    def setUp(self):
+        self.api_creds = ApiCreds("key", "secret", "passphrase")
+        self.manager = FakeOrderBookManager()
+        self.stream = UserStream(
+            self.market, lambda: self.api_creds, self.manager
+        )
+
+    def test_subscription(self):
+        subscription = self.stream._subscription()
+        self.assertEqual(subscription["type"], "user")
+        self.assertEqual(subscription["markets"], [self.condition_id])
+        self.assertEqual(subscription["auth"]["apiKey"], "key")
+
+        # reconnections subscribe with the renewed credentials
+        self.api_creds = ApiCreds("renewed", "secret", "passphrase")
+        self.assertEqual(self.stream._subscription()["auth"]["apiKey"], "renewed")
+
+    def test_metrics_per_market(self):
+        labels = {"stream": "user", "market": self.condition_id}
+        messages = REGISTRY.get_sample_value("market_maker_websocket_messages_total", labels)
+
+        self.stream.stream._set_connected(True)
+        self.stream.stream._dispatch('{"event_type": "unknown"}')
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("market_maker_websocket_connected", labels), 1
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value("market_maker_websocket_messages_total", labels),
+            (messages or 0) + 1,
+        )
+
+    def test_order_messages(self):
+        self.stream.handle_message(
+            {
+                "event_type": "order",
+                "type": "UPDATE",
+                "id": "0x1",
+                "asset_id": str(self.market.token_id(Token.B)),
+                "side": "SELL",
+                "price": "0.45",
+                "original_size": "20",
+                "size_matched": "5.5",
+            }
+        )
+        self.stream.handle_message(
+            {"event_type": "order", "type": "CANCELLATION", "id": "0x2"}
+        )
+
+        ((order, size_matched),) = self.manager.updates
+        self.assertEqual(order.id, "0x1")
+        self.assertEqual(order.token, Token.B)
+        self.assertEqual(order.side, Side.SELL)
+        self.assertEqual(order.size, 14.5)
+        self.assertEqual(size_matched, 5.5)
+        self.assertEqual(self.manager.cancellations, ["0x2"])
+
+    def test_settled_trades_trigger_a_refresh(self):
+        for status in ["MATCHED", "MINED", "CONFIRMED"]:
+            self.stream.handle_message(
+                {"event_type": "trade", "id": "t1", "status": status}
+            )
+
+        self.assertEqual(self.manager.refreshes, 1)
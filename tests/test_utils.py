@@ -1,6 +1,13 @@
 from unittest import TestCase
 
-from poly_market_maker.utils import randomize_default_price
+import numpy as np
+
+from poly_market_maker.utils import (
+    math_round_down,
+    math_round_down_array,
+    math_round_up,
+    randomize_default_price,
+)
 
 
 class TestUtils(TestCase):
@@ -11,3 +18,20 @@ class TestUtils(TestCase):
         upper_price_limit = price + 0.1
         lower_price_limit = price - 0.1
         self.assertTrue(lower_price_limit <= randomized_price <= upper_price_limit)
+
+    def test_math_round_down_range(self):
+        # printed in scientific notation, the decimals of the mantissa are counted
+        self.assertEqual(math_round_down(1.2e-05, 5), 1.2e-05)
+        self.assertEqual(math_round_down(1.2e-05, 2), 0.0)
+        self.assertEqual(math_round_down(0.0001, 4), 0.0001)
+        # around 2**44 once scaled, the last printed decimals are kept
+        self.assertEqual(math_round_down(175921860444.15, 2), 175921860444.15)
+        self.assertEqual(math_round_down(37006508220453.87, 2), 37006508220453.87)
+        self.assertEqual(math_round_up(38799130571693.95, 2), 38799130571693.95)
+
+    def test_math_round_down_array(self):
+        values = [0.29, 0.5, 4.1, 12.345, 0.057, -1.234, 0.0, 1e-05, 1.2e-05, 99.99]
+        self.assertEqual(
+            math_round_down_array(np.array(values), 5).tolist(),
+            [math_round_down(value, 5) for value in values],
+        )